@@ -0,0 +1,30 @@
+"""add category name lower index
+
+Revision ID: 0b9e4d6c3a51
+Revises: f3c6d8a25e14
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0b9e4d6c3a51"
+down_revision: Union[str, Sequence[str], None] = "f3c6d8a25e14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_categories_name_lower",
+        "categories",
+        [sa.text("lower(name)")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_categories_name_lower", table_name="categories")
@@ -0,0 +1,66 @@
+"""add draft bills
+
+Revision ID: 2f7a9c4e1d58
+Revises: 8c3e6a9f2b14
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "2f7a9c4e1d58"
+down_revision: Union[str, Sequence[str], None] = "8c3e6a9f2b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bill_type = postgresql.ENUM("buy", "sell", name="billtype", create_type=False)
+    op.create_table(
+        "draft_bills",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bill_type", bill_type, nullable=False),
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("customer_id", sa.Integer(), nullable=True),
+        sa.Column("supplier_id", sa.Integer(), nullable=True),
+        sa.Column("subtotal_amount", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("discount_amount", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("tax_amount", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("line_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("expires_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"]),
+        sa.ForeignKeyConstraint(["customer_id"], ["customers.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["supplier_id"], ["suppliers.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_draft_bills_expires_at", "draft_bills", ["expires_at"], unique=False)
+    op.create_table(
+        "draft_bill_lines",
+        sa.Column("draft_id", sa.Integer(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("model_number", sa.String(length=50), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("unit_price", sa.Numeric(10, 2), nullable=False),
+        sa.Column("line_total", sa.Numeric(12, 2), nullable=False),
+        sa.ForeignKeyConstraint(["draft_id"], ["draft_bills.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["item_id"], ["items.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("draft_id", "item_id"),
+    )
+    op.create_index("ix_draft_bill_lines_item_id", "draft_bill_lines", ["item_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_draft_bill_lines_item_id", table_name="draft_bill_lines")
+    op.drop_table("draft_bill_lines")
+    op.drop_index("ix_draft_bills_expires_at", table_name="draft_bills")
+    op.drop_table("draft_bills")
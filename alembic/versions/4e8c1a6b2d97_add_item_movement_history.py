@@ -0,0 +1,59 @@
+"""add item movement history
+
+Revision ID: 4e8c1a6b2d97
+Revises: 9d4b2e7f1c63
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "4e8c1a6b2d97"
+down_revision: Union[str, Sequence[str], None] = "9d4b2e7f1c63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_inventory_transactions_item_created",
+        "inventory_transactions",
+        ["item_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_table(
+        "item_movement_daily",
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("movement_date", sa.Date(), nullable=False),
+        sa.Column("quantity_in", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("quantity_out", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("value_in", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("value_out", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("transactions", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["item_id"], ["items.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("item_id", "movement_date"),
+    )
+    op.execute(
+        """
+        INSERT INTO item_movement_daily
+            (item_id, movement_date, quantity_in, quantity_out, value_in, value_out, transactions)
+        SELECT
+            item_id,
+            created_at::date,
+            COALESCE(SUM(quantity) FILTER (WHERE transaction_type = 'buy'), 0),
+            COALESCE(SUM(quantity) FILTER (WHERE transaction_type = 'sell'), 0),
+            COALESCE(SUM(quantity * price) FILTER (WHERE transaction_type = 'buy'), 0),
+            COALESCE(SUM(quantity * price) FILTER (WHERE transaction_type = 'sell'), 0),
+            COUNT(*)
+        FROM inventory_transactions
+        GROUP BY item_id, created_at::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("item_movement_daily")
+    op.drop_index("ix_inventory_transactions_item_created", table_name="inventory_transactions")
@@ -0,0 +1,76 @@
+"""add stock locations
+
+Revision ID: 5b2f8d1e7a40
+Revises: 4e8c1a6b2d97
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "5b2f8d1e7a40"
+down_revision: Union[str, Sequence[str], None] = "4e8c1a6b2d97"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "locations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("is_default", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default="true"),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_index(
+        "uq_locations_default",
+        "locations",
+        ["is_default"],
+        unique=True,
+        postgresql_where=sa.text("is_default"),
+    )
+    op.execute("INSERT INTO locations (name, is_default) VALUES ('Main store', true)")
+
+    op.create_table(
+        "stock_levels",
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("location_id", sa.Integer(), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.CheckConstraint("quantity >= 0", name="ck_stock_levels_quantity_non_negative"),
+        sa.ForeignKeyConstraint(["item_id"], ["items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"]),
+        sa.PrimaryKeyConstraint("item_id", "location_id"),
+    )
+    op.create_index("ix_stock_levels_location_item", "stock_levels", ["location_id", "item_id"], unique=False)
+    # All existing stock starts at the default location
+    op.execute(
+        """
+        INSERT INTO stock_levels (item_id, location_id, quantity)
+        SELECT items.id, locations.id, GREATEST(items.quantity, 0)
+        FROM items CROSS JOIN locations
+        WHERE locations.is_default
+        """
+    )
+    op.execute("UPDATE items SET quantity = 0 WHERE quantity < 0")
+
+    op.add_column("bills", sa.Column("location_id", sa.Integer(), nullable=True))
+    op.create_foreign_key("bills_location_id_fkey", "bills", "locations", ["location_id"], ["id"])
+    op.create_index(op.f("ix_bills_location_id"), "bills", ["location_id"], unique=False)
+    op.execute("UPDATE bills SET location_id = (SELECT id FROM locations WHERE is_default)")
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_bills_location_id"), table_name="bills")
+    op.drop_constraint("bills_location_id_fkey", "bills", type_="foreignkey")
+    op.drop_column("bills", "location_id")
+    op.drop_index("ix_stock_levels_location_item", table_name="stock_levels")
+    op.drop_table("stock_levels")
+    op.drop_index("uq_locations_default", table_name="locations")
+    op.drop_table("locations")
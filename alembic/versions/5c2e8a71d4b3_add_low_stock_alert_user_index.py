@@ -0,0 +1,29 @@
+"""add low stock alert user index
+
+Revision ID: 5c2e8a71d4b3
+Revises: 1d1f54a5b0f0
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "5c2e8a71d4b3"
+down_revision: Union[str, Sequence[str], None] = "1d1f54a5b0f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_low_stock_alerts_user_resolved_created",
+        "low_stock_alerts",
+        ["user_id", "is_resolved", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_low_stock_alerts_user_resolved_created", table_name="low_stock_alerts")
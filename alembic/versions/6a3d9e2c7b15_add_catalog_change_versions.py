@@ -0,0 +1,47 @@
+"""add catalog change versions
+
+Revision ID: 6a3d9e2c7b15
+Revises: 2f7a9c4e1d58
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "6a3d9e2c7b15"
+down_revision: Union[str, Sequence[str], None] = "2f7a9c4e1d58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHANGE_VERSION = sa.text("pg_current_xact_id()::text::bigint")
+
+
+def upgrade() -> None:
+    # Existing rows all get this migration's transaction id
+    op.add_column("items", sa.Column("change_version", sa.BigInteger(), nullable=False, server_default=CHANGE_VERSION))
+    op.create_index("ix_items_change_version", "items", ["change_version"], unique=False)
+    op.add_column("categories", sa.Column("change_version", sa.BigInteger(), nullable=False, server_default=CHANGE_VERSION))
+    op.create_index("ix_categories_change_version", "categories", ["change_version"], unique=False)
+    op.create_table(
+        "catalog_tombstones",
+        sa.Column("entity", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("change_version", sa.BigInteger(), nullable=False, server_default=CHANGE_VERSION),
+        sa.Column("deleted_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("entity", "entity_id"),
+    )
+    op.create_index(
+        "ix_catalog_tombstones_entity_version", "catalog_tombstones", ["entity", "change_version"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_catalog_tombstones_entity_version", table_name="catalog_tombstones")
+    op.drop_table("catalog_tombstones")
+    op.drop_index("ix_categories_change_version", table_name="categories")
+    op.drop_column("categories", "change_version")
+    op.drop_index("ix_items_change_version", table_name="items")
+    op.drop_column("items", "change_version")
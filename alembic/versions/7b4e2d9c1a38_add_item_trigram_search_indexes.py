@@ -0,0 +1,41 @@
+"""add item trigram search indexes
+
+Revision ID: 7b4e2d9c1a38
+Revises: 6a3d9e2c7b15
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "7b4e2d9c1a38"
+down_revision: Union[str, Sequence[str], None] = "6a3d9e2c7b15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = [
+    ("ix_items_name_trgm", "items", "name"),
+    ("ix_items_model_number_trgm", "items", "model_number"),
+    ("ix_items_description_trgm", "items", "description"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
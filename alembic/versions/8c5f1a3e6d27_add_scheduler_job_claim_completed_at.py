@@ -0,0 +1,27 @@
+"""add completed_at to scheduler job claims
+
+Revision ID: 8c5f1a3e6d27
+Revises: 7b4e2d9c1a38
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "8c5f1a3e6d27"
+down_revision: Union[str, Sequence[str], None] = "7b4e2d9c1a38"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("scheduler_job_claims", sa.Column("completed_at", sa.TIMESTAMP(), nullable=True))
+    # Claims made before leases existed are for runs that already happened
+    op.execute("UPDATE scheduler_job_claims SET completed_at = claimed_at")
+
+
+def downgrade() -> None:
+    op.drop_column("scheduler_job_claims", "completed_at")
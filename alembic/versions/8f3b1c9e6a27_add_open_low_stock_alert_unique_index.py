@@ -0,0 +1,44 @@
+"""add open low stock alert unique index
+
+Revision ID: 8f3b1c9e6a27
+Revises: 5c2e8a71d4b3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "8f3b1c9e6a27"
+down_revision: Union[str, Sequence[str], None] = "5c2e8a71d4b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep only the newest open alert per (item_id, user_id) before enforcing uniqueness.
+    op.execute(
+        """
+        UPDATE low_stock_alerts AS a
+        SET is_resolved = true
+        FROM low_stock_alerts AS newer
+        WHERE a.is_resolved = false
+          AND newer.is_resolved = false
+          AND newer.item_id = a.item_id
+          AND newer.user_id = a.user_id
+          AND newer.id > a.id
+        """
+    )
+    op.create_index(
+        "uq_low_stock_alerts_open_item_user",
+        "low_stock_alerts",
+        ["item_id", "user_id"],
+        unique=True,
+        postgresql_where=sa.text("is_resolved = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_low_stock_alerts_open_item_user", table_name="low_stock_alerts")
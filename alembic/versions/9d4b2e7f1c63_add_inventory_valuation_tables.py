@@ -0,0 +1,68 @@
+"""add inventory valuation tables
+
+Revision ID: 9d4b2e7f1c63
+Revises: 7a1f5c3e9d28
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "9d4b2e7f1c63"
+down_revision: Union[str, Sequence[str], None] = "7a1f5c3e9d28"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category_stock_valuations",
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("item_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_quantity", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("value_at_cost", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("value_at_price", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("refreshed_at", sa.TIMESTAMP(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("category_id"),
+    )
+    op.create_table(
+        "inventory_valuation_snapshots",
+        sa.Column("snapshot_date", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("category_name", sa.String(), nullable=False),
+        sa.Column("item_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_quantity", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("value_at_cost", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("value_at_price", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("snapshot_date", "category_id"),
+    )
+    # Items are looked up by category on every valuation refresh
+    op.create_index("ix_items_category_id", "items", ["category_id"], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO category_stock_valuations
+            (category_id, item_count, total_quantity, value_at_cost, value_at_price, refreshed_at)
+        SELECT
+            categories.id,
+            COUNT(items.id),
+            COALESCE(SUM(items.quantity), 0),
+            COALESCE(SUM(items.quantity * items.buying_price), 0),
+            COALESCE(SUM(items.quantity * items.selling_price), 0),
+            now()
+        FROM categories
+        LEFT OUTER JOIN items ON items.category_id = categories.id
+        GROUP BY categories.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_items_category_id", table_name="items")
+    op.drop_table("inventory_valuation_snapshots")
+    op.drop_table("category_stock_valuations")
@@ -0,0 +1,35 @@
+"""add low stock alert daily counts
+
+Revision ID: a47d2e5f9c18
+Revises: 8f3b1c9e6a27
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a47d2e5f9c18"
+down_revision: Union[str, Sequence[str], None] = "8f3b1c9e6a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "low_stock_alert_daily_counts",
+        sa.Column("alert_date", sa.Date(), nullable=False),
+        sa.Column("item_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("alert_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("min_quantity", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["item_id"], ["items.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("alert_date", "item_id", "user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("low_stock_alert_daily_counts")
@@ -0,0 +1,33 @@
+"""add scheduler job claims
+
+Revision ID: c81f4b2a7d65
+Revises: a47d2e5f9c18
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c81f4b2a7d65"
+down_revision: Union[str, Sequence[str], None] = "a47d2e5f9c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduler_job_claims",
+        sa.Column("job_id", sa.String(length=100), nullable=False),
+        sa.Column("run_key", sa.String(length=50), nullable=False),
+        sa.Column("partition", sa.Integer(), nullable=False),
+        sa.Column("claimed_by", sa.String(length=255), nullable=False),
+        sa.Column("claimed_at", sa.TIMESTAMP(), nullable=False, server_default=sa.text("now()")),
+        sa.PrimaryKeyConstraint("job_id", "run_key", "partition"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduler_job_claims")
@@ -0,0 +1,43 @@
+"""add scheduled job runs
+
+Revision ID: d5a93e0b4f72
+Revises: c81f4b2a7d65
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d5a93e0b4f72"
+down_revision: Union[str, Sequence[str], None] = "c81f4b2a7d65"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_job_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("worker_id", sa.String(length=255), nullable=False),
+        sa.Column("manual", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("started_at", sa.TIMESTAMP(), nullable=False, server_default=sa.text("now()")),
+        sa.Column("finished_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("duration_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("items_scanned", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("rows_affected", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("emails_sent", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("emails_failed", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_scheduled_job_runs_job_started", "scheduled_job_runs", ["job_id", "started_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduled_job_runs_job_started", table_name="scheduled_job_runs")
+    op.drop_table("scheduled_job_runs")
@@ -0,0 +1,46 @@
+"""add party trigram search indexes
+
+Revision ID: e2b7c4f81a39
+Revises: d5a93e0b4f72
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "e2b7c4f81a39"
+down_revision: Union[str, Sequence[str], None] = "d5a93e0b4f72"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = [
+    ("ix_customers_full_name_trgm", "customers", "full_name"),
+    ("ix_customers_phone_number_trgm", "customers", "phone_number"),
+    ("ix_customers_email_trgm", "customers", "email"),
+    ("ix_suppliers_supplier_name_trgm", "suppliers", "supplier_name"),
+    ("ix_suppliers_company_name_trgm", "suppliers", "company_name"),
+    ("ix_suppliers_contact_person_trgm", "suppliers", "contact_person"),
+    ("ix_suppliers_phone_number_trgm", "suppliers", "phone_number"),
+    ("ix_suppliers_email_trgm", "suppliers", "email"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table_name, column_name in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column_name: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
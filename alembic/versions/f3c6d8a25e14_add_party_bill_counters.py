@@ -0,0 +1,72 @@
+"""add party bill counters
+
+Revision ID: f3c6d8a25e14
+Revises: e2b7c4f81a39
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f3c6d8a25e14"
+down_revision: Union[str, Sequence[str], None] = "e2b7c4f81a39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("customers", sa.Column("bills_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("customers", sa.Column("total_billed", sa.Numeric(12, 2), nullable=False, server_default="0"))
+    op.add_column("customers", sa.Column("total_paid", sa.Numeric(12, 2), nullable=False, server_default="0"))
+    op.add_column("suppliers", sa.Column("purchase_bills_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("suppliers", sa.Column("total_purchased", sa.Numeric(12, 2), nullable=False, server_default="0"))
+    op.add_column("suppliers", sa.Column("total_paid", sa.Numeric(12, 2), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        UPDATE customers AS c
+        SET bills_count = totals.bills_count,
+            total_billed = totals.total_billed,
+            total_paid = totals.total_paid
+        FROM (
+            SELECT customer_id,
+                   count(id) AS bills_count,
+                   coalesce(sum(total_amount), 0) AS total_billed,
+                   coalesce(sum(paid_amount), 0) AS total_paid
+            FROM bills
+            WHERE customer_id IS NOT NULL AND bill_type = 'sell'
+            GROUP BY customer_id
+        ) AS totals
+        WHERE c.id = totals.customer_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE suppliers AS s
+        SET purchase_bills_count = totals.bills_count,
+            total_purchased = totals.total_purchased,
+            total_paid = totals.total_paid
+        FROM (
+            SELECT supplier_id,
+                   count(id) AS bills_count,
+                   coalesce(sum(total_amount), 0) AS total_purchased,
+                   coalesce(sum(paid_amount), 0) AS total_paid
+            FROM bills
+            WHERE supplier_id IS NOT NULL AND bill_type = 'buy'
+            GROUP BY supplier_id
+        ) AS totals
+        WHERE s.id = totals.supplier_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("suppliers", "total_paid")
+    op.drop_column("suppliers", "total_purchased")
+    op.drop_column("suppliers", "purchase_bills_count")
+    op.drop_column("customers", "total_paid")
+    op.drop_column("customers", "total_billed")
+    op.drop_column("customers", "bills_count")
@@ -24,6 +24,42 @@ class Settings(BaseSettings):
     # Alerts
     alert_threshold: int
     daily_check_hour: int
+    alert_retention_days: int = 90
+    alert_archive_batch_size: int = 1000
+
+    # Scheduler
+    scheduler_partitions: int = 1
+    scheduler_leader_check_seconds: int = 30
+    # A claimed partition not marked done within the lease is retried by the next run
+    scheduler_claim_lease_minutes: int = 60
+    scheduler_claim_retention_days: int = 7
+    # Comma-separated emails of the users allowed to trigger jobs on demand (empty = nobody)
+    admin_emails: str = ""
+
+    # Responses
+    gzip_minimum_size: int = 1024
+
+    # Idempotency-Key replay window and in-memory front cache size
+    idempotency_key_ttl_hours: int = 24
+    idempotency_cache_size: int = 2048
+
+    # Draft bills (server-side carts) expire and release their reservations after this idle time
+    draft_bill_ttl_minutes: int = 30
+
+    # Events buffered per live WebSocket connection before it is told to resync
+    live_event_queue_size: int = 256
+
+    # GET /metrics is only mounted when enabled; with a token, scrapers must
+    # send it as "Authorization: Bearer <token>"
+    metrics_enabled: bool = False
+    metrics_token: str = ""
+
+    # Per-request query instrumentation: an identical statement run this many
+    # times in one request is logged as a likely N+1; query_budget (0 = off)
+    # logs requests running more queries, or fails them when strict (tests/CI)
+    query_repeat_warning: int = 5
+    query_budget: int = 0
+    query_budget_strict: bool = False
 
     model_config = SettingsConfigDict(
         env_file=".env",
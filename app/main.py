@@ -1,8 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from app.config import settings
 from app.models import user as models
-from app.database import engine
-from app.routers import alert, bill, bill_print, category, customer, dashboard, item, payment, supplier, user
+from app.database import SessionLocal, engine
+from app.responses import DefaultJSONResponse
+from app.routers import admin, alert, bill, bill_print, category, customer, dashboard, draft_bill, events, inventory, item, location, metrics, payment, supplier, sync, user
+from app.services.event_broker import event_broker
+from app.services.item_search_index import item_search_index
+from app.services.metrics import MetricsMiddleware
+from app.services.query_stats import QueryStatsMiddleware
+from app.services.reference_cache import reference_cache
 from app.services.scheduler import start_scheduler, stop_scheduler
 import logging
 
@@ -10,7 +18,7 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Inventory System")
+app = FastAPI(title="Inventory System", default_response_class=DefaultJSONResponse)
 
 # Add CORS middleware to handle cross-origin requests
 app.add_middleware(
@@ -33,6 +41,15 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Compress JSON responses above the size threshold for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
+# Latency, status and query counts per route for /metrics (runs inside QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+# Count queries per request: Server-Timing header, N+1 and query budget warnings
+app.add_middleware(QueryStatsMiddleware)
+
 # Start scheduler on app startup
 @app.on_event("startup")
 async def startup_event():
@@ -43,22 +60,38 @@ async def startup_event():
     except Exception as e:
         logger.error(f"❌ Error starting scheduler: {str(e)}")
 
+    # Searches use the database until the first build finishes
+    item_search_index.refresh_in_background()
+
+    reference_cache.start_listener()
+    event_broker.start_listener()
+
 # Stop scheduler on app shutdown
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("🛑 Shutting down application...")
     stop_scheduler()
+    reference_cache.stop_listener()
+    event_broker.stop_listener()
 
 app.include_router(user.router)
 app.include_router(category.router)
 app.include_router(item.router)
 app.include_router(bill.router)
 app.include_router(bill_print.router)
+app.include_router(draft_bill.router)
 app.include_router(alert.router)
 app.include_router(customer.router)
 app.include_router(supplier.router)
 app.include_router(payment.router)
 app.include_router(dashboard.router)
+app.include_router(inventory.router)
+app.include_router(location.router)
+app.include_router(sync.router)
+app.include_router(events.router)
+app.include_router(admin.router)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
 
     
 @app.get("/")
@@ -10,3 +10,15 @@ from app.models.payment import Payment
 from app.models.low_stock_alert import LowStockAlert
 from app.models.customer import Customer
 from app.models.supplier import Supplier
+from app.models.low_stock_alert_archive import LowStockAlertDailyCount
+from app.models.scheduler_job_claim import SchedulerJobClaim
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.models.table_version import TableVersion
+from app.models.category_stock_valuation import CategoryStockValuation
+from app.models.inventory_valuation_snapshot import InventoryValuationSnapshot
+from app.models.item_movement_daily import ItemMovementDaily
+from app.models.location import Location
+from app.models.stock_level import StockLevel
+from app.models.idempotency_key import IdempotencyKey
+from app.models.draft_bill import DraftBill, DraftBillLine
+from app.models.catalog_tombstone import CatalogTombstone
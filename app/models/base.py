@@ -1,4 +1,14 @@
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
 
+# Id of the writing transaction (64-bit, never wraps). Used as the change
+# version of catalogue rows for incremental sync; see ChangeFeedService.
+CHANGE_VERSION_SQL = "pg_current_xact_id()::text::bigint"
+
+
+def change_version():
+    return text(CHANGE_VERSION_SQL)
+
+
 class Base(DeclarativeBase):
     pass
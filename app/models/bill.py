@@ -26,6 +26,7 @@ class Bill(Base):
     bill_type = Column(Enum(BillType), nullable=False, index=True)
     customer_id = Column(Integer, ForeignKey("customers.id", ondelete="SET NULL"), nullable=True, index=True)
     supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="SET NULL"), nullable=True, index=True)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=True, index=True)
     subtotal_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
     discount_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
     tax_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
@@ -43,6 +44,7 @@ class Bill(Base):
     payments = relationship("Payment", back_populates="bill", cascade="all, delete-orphan", order_by="Payment.paid_at")
     customer = relationship("Customer", back_populates="bills")
     supplier = relationship("Supplier", back_populates="bills")
+    location = relationship("Location")
     creator = relationship("User")
 
     @property
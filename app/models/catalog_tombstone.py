@@ -0,0 +1,19 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Index, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.sql.expression import text
+from app.models.base import Base, change_version
+
+
+class CatalogTombstone(Base):
+    """A deleted item or category, kept so incremental sync can tell tills to drop it"""
+    __tablename__ = "catalog_tombstones"
+
+    # "item" or "category"
+    entity = Column(String(20), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    change_version = Column(BigInteger, nullable=False, server_default=change_version())
+    deleted_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+
+    __table_args__ = (
+        PrimaryKeyConstraint('entity', 'entity_id'),
+        Index('ix_catalog_tombstones_entity_version', 'entity', 'change_version'),
+    )
@@ -1,6 +1,6 @@
-from sqlalchemy import TIMESTAMP , Column, Integer, String  
+from sqlalchemy import TIMESTAMP , BigInteger, Column, Integer, String, Index, func
 from sqlalchemy.sql.expression import null , text
-from app.models.base import Base
+from app.models.base import Base, change_version
 from sqlalchemy.orm import relationship
 
 
@@ -11,5 +11,11 @@ class Category(Base):
     name = Column(String, unique=True,  nullable=False)
     description = Column(String, nullable=True)
     created_at = Column(TIMESTAMP, nullable=False, server_default=text('now()'))
+    change_version = Column(BigInteger, nullable=False, server_default=change_version(), onupdate=change_version(), index=True)
 
-    items = relationship("Item", back_populates = "category" , cascade = "all, delete")
\ No newline at end of file
+    items = relationship("Item", back_populates = "category" , cascade = "all, delete")
+
+    # Case-insensitive name lookups (duplicate checks on create/update)
+    __table_args__ = (
+        Index('ix_categories_name_lower', func.lower(name)),
+    )
@@ -0,0 +1,15 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, ForeignKey, Integer, Numeric
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class CategoryStockValuation(Base):
+    """Live stock totals per category (quantity x buying/selling price), refreshed on stock changes"""
+    __tablename__ = "category_stock_valuations"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    item_count = Column(Integer, nullable=False, server_default="0")
+    total_quantity = Column(BigInteger, nullable=False, server_default="0")
+    value_at_cost = Column(Numeric(14, 2), nullable=False, server_default="0")
+    value_at_price = Column(Numeric(14, 2), nullable=False, server_default="0")
+    refreshed_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
@@ -1,4 +1,4 @@
-from sqlalchemy import TIMESTAMP, Boolean, Column, Enum, Integer, Numeric, String, Text, func
+from sqlalchemy import TIMESTAMP, Boolean, Column, Enum, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import relationship
 import enum
 
@@ -24,9 +24,20 @@ class Customer(Base):
     notes = Column(Text, nullable=True)
     loyalty_points = Column(Integer, nullable=False, server_default="0")
     due_balance = Column(Numeric(12, 2), nullable=False, server_default="0")
+    # Maintained by FinancialService.recalculate_customer_due_balance on bill/payment writes
+    bills_count = Column(Integer, nullable=False, server_default="0")
+    total_billed = Column(Numeric(12, 2), nullable=False, server_default="0")
+    total_paid = Column(Numeric(12, 2), nullable=False, server_default="0")
     is_active = Column(Boolean, nullable=False, server_default="true")
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     updated_at = Column(TIMESTAMP, nullable=False, server_default=func.now(), onupdate=func.now())
 
     bills = relationship("Bill", back_populates="customer")
     payments = relationship("Payment", back_populates="customer")
+
+    # pg_trgm indexes for the customer search (ILIKE '%q%' and word_similarity)
+    __table_args__ = (
+        Index("ix_customers_full_name_trgm", "full_name", postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}),
+        Index("ix_customers_phone_number_trgm", "phone_number", postgresql_using="gin", postgresql_ops={"phone_number": "gin_trgm_ops"}),
+        Index("ix_customers_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
@@ -0,0 +1,62 @@
+from sqlalchemy import TIMESTAMP, Column, Enum, ForeignKey, Index, Integer, Numeric, PrimaryKeyConstraint, String, Text, func
+from sqlalchemy.orm import relationship
+
+from app.models.base import Base
+from app.models.bill import BillType
+
+
+class DraftBill(Base):
+    """
+    A cart being built on a till. Totals are maintained line by line; sell
+    drafts softly reserve their quantities at the location until expires_at.
+    """
+    __tablename__ = "draft_bills"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    bill_type = Column(Enum(BillType), nullable=False)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
+    customer_id = Column(Integer, ForeignKey("customers.id", ondelete="SET NULL"), nullable=True)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id", ondelete="SET NULL"), nullable=True)
+    subtotal_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
+    discount_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
+    tax_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
+    line_count = Column(Integer, nullable=False, server_default="0")
+    total_quantity = Column(Integer, nullable=False, server_default="0")
+    notes = Column(Text, nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    lines = relationship(
+        "DraftBillLine",
+        back_populates="draft",
+        cascade="all, delete-orphan",
+        order_by="DraftBillLine.position",
+    )
+
+    __table_args__ = (
+        # Expiry job
+        Index('ix_draft_bills_expires_at', 'expires_at'),
+    )
+
+
+class DraftBillLine(Base):
+    """One item of a draft; adding the same item again raises its quantity"""
+    __tablename__ = "draft_bill_lines"
+
+    draft_id = Column(Integer, ForeignKey("draft_bills.id", ondelete="CASCADE"), nullable=False)
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    model_number = Column(String(50), nullable=False)
+    # Order the line was first added in
+    position = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Numeric(10, 2), nullable=False)
+    line_total = Column(Numeric(12, 2), nullable=False)
+
+    draft = relationship("DraftBill", back_populates="lines")
+
+    __table_args__ = (
+        PrimaryKeyConstraint('draft_id', 'item_id'),
+        # Reserved quantity per item across open drafts
+        Index('ix_draft_bill_lines_item_id', 'item_id'),
+    )
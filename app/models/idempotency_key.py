@@ -0,0 +1,27 @@
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index, Integer, LargeBinary, PrimaryKeyConstraint, String
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key of a write request and the response it produced.
+    The row is inserted in the same transaction as the write it guards;
+    status_code/response_body stay NULL until the response has been stored.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    endpoint = Column(String(100), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('user_id', 'endpoint', 'key'),
+        # Expiry job
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
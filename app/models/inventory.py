@@ -1,4 +1,4 @@
-from sqlalchemy import TIMESTAMP , Column, Integer, String , Numeric
+from sqlalchemy import TIMESTAMP , Column, Integer, String , Numeric, Index
 from sqlalchemy.sql.expression import null , text
 from app.models.base import Base
 from app.models.category import Category
@@ -19,4 +19,9 @@ class InventoryTransaction(Base):
     created_at = Column(TIMESTAMP , nullable = False , server_default = text('now()')) 
     
     items = relationship("Item" , back_populates= "inventory_transaction")
-    bill = relationship("Bill" , back_populates = "inventory_transactions")
\ No newline at end of file
+    bill = relationship("Bill" , back_populates = "inventory_transactions")
+
+    # Per-item movement history, newest first
+    __table_args__ = (
+        Index('ix_inventory_transactions_item_created', 'item_id', 'created_at', 'id'),
+    )
@@ -0,0 +1,24 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Date, Integer, Numeric, PrimaryKeyConstraint, String
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class InventoryValuationSnapshot(Base):
+    """
+    Nightly point-in-time copy of category_stock_valuations.
+    Keeps the category name and no foreign key so history survives category deletes.
+    """
+    __tablename__ = "inventory_valuation_snapshots"
+
+    snapshot_date = Column(Date, nullable=False)
+    category_id = Column(Integer, nullable=False)
+    category_name = Column(String, nullable=False)
+    item_count = Column(Integer, nullable=False, server_default="0")
+    total_quantity = Column(BigInteger, nullable=False, server_default="0")
+    value_at_cost = Column(Numeric(14, 2), nullable=False, server_default="0")
+    value_at_price = Column(Numeric(14, 2), nullable=False, server_default="0")
+    created_at = Column(TIMESTAMP, nullable=False, server_default=text('now()'))
+
+    __table_args__ = (
+        PrimaryKeyConstraint('snapshot_date', 'category_id'),
+    )
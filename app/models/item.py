@@ -1,6 +1,6 @@
-from sqlalchemy import TIMESTAMP, Column, Integer, String, Numeric, Index
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Integer, String, Numeric, Index
 from sqlalchemy.sql.expression import text
-from app.models.base import Base
+from app.models.base import Base, change_version
 from sqlalchemy.orm import relationship
 from sqlalchemy import ForeignKey
 
@@ -16,14 +16,19 @@ class Item(Base):
     description = Column(String, nullable=True)
     model_number = Column(String(50), nullable=False, unique=True, index=True)
     qr_code_path = Column(String(255), nullable=True)
-    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(TIMESTAMP, nullable=False, server_default=text('now()'))
+    # Set by every insert/update; /sync/items returns rows changed since a version
+    change_version = Column(BigInteger, nullable=False, server_default=change_version(), onupdate=change_version(), index=True)
     
     category = relationship("Category", back_populates="items")
     inventory_transaction = relationship("InventoryTransaction", back_populates="items", cascade="all, delete")
     low_stock_alerts = relationship("LowStockAlert", back_populates="item", cascade="all, delete")
     
-    # Index for model_number lookups
+    # Index for model_number lookups; pg_trgm indexes for the database fallback of the item search
     __table_args__ = (
         Index('idx_model_number', 'model_number'),
+        Index("ix_items_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+        Index("ix_items_model_number_trgm", "model_number", postgresql_using="gin", postgresql_ops={"model_number": "gin_trgm_ops"}),
+        Index("ix_items_description_trgm", "description", postgresql_using="gin", postgresql_ops={"description": "gin_trgm_ops"}),
     )
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, PrimaryKeyConstraint
+from app.models.base import Base
+
+
+class ItemMovementDaily(Base):
+    """Per-item daily roll-up of inventory_transactions, maintained as bills are created"""
+    __tablename__ = "item_movement_daily"
+
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    movement_date = Column(Date, nullable=False)
+    quantity_in = Column(Integer, nullable=False, server_default="0")
+    quantity_out = Column(Integer, nullable=False, server_default="0")
+    value_in = Column(Numeric(14, 2), nullable=False, server_default="0")
+    value_out = Column(Numeric(14, 2), nullable=False, server_default="0")
+    transactions = Column(Integer, nullable=False, server_default="0")
+
+    __table_args__ = (
+        PrimaryKeyConstraint('item_id', 'movement_date'),
+    )
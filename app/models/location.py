@@ -0,0 +1,19 @@
+from sqlalchemy import TIMESTAMP, Boolean, Column, Index, Integer, String, func
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class Location(Base):
+    """A place stock is held (shop floor, back store, branch)"""
+    __tablename__ = "locations"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    name = Column(String(100), nullable=False, unique=True)
+    # Bills without a location and quantities set through /items apply here
+    is_default = Column(Boolean, nullable=False, server_default="false")
+    is_active = Column(Boolean, nullable=False, server_default="true")
+    created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('uq_locations_default', 'is_default', unique=True, postgresql_where=text('is_default')),
+    )
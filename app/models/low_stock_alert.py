@@ -1,4 +1,4 @@
-from sqlalchemy import TIMESTAMP , Column, Integer, String , ForeignKey , Boolean
+from sqlalchemy import TIMESTAMP , Column, Integer, String , ForeignKey , Boolean , Index
 from sqlalchemy.sql.expression import text
 from app.models.base import Base
 from sqlalchemy.orm import relationship
@@ -19,3 +19,17 @@ class LowStockAlert(Base):
     
     item = relationship("Item", back_populates="low_stock_alerts")
     user = relationship("User")
+
+    # Composite index backing the per-user alert listing and stats aggregate.
+    # The partial unique index allows at most one open alert per item and user,
+    # and is the conflict target for AlertService.upsert_low_stock_alert.
+    __table_args__ = (
+        Index('ix_low_stock_alerts_user_resolved_created', 'user_id', 'is_resolved', 'created_at'),
+        Index(
+            'uq_low_stock_alerts_open_item_user',
+            'item_id',
+            'user_id',
+            unique=True,
+            postgresql_where=text('is_resolved = false'),
+        ),
+    )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, PrimaryKeyConstraint
+from app.models.base import Base
+
+
+class LowStockAlertDailyCount(Base):
+    """Daily per-item roll-up of resolved low stock alerts moved out of low_stock_alerts"""
+    __tablename__ = "low_stock_alert_daily_counts"
+
+    alert_date = Column(Date, nullable=False)
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    alert_count = Column(Integer, nullable=False, server_default="0")
+    min_quantity = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('alert_date', 'item_id', 'user_id'),
+    )
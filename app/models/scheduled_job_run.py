@@ -0,0 +1,26 @@
+from sqlalchemy import TIMESTAMP, Boolean, Column, Index, Integer, String, Text
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class ScheduledJobRun(Base):
+    """History of scheduled job executions, one row per run on each worker"""
+    __tablename__ = "scheduled_job_runs"
+
+    id = Column(Integer, primary_key=True, nullable=False)
+    job_id = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)  # success, failed, skipped
+    worker_id = Column(String(255), nullable=False)
+    manual = Column(Boolean, nullable=False, server_default="false")
+    started_at = Column(TIMESTAMP, nullable=False, server_default=text('now()'))
+    finished_at = Column(TIMESTAMP, nullable=True)
+    duration_ms = Column(Integer, nullable=False, server_default="0")
+    items_scanned = Column(Integer, nullable=False, server_default="0")
+    rows_affected = Column(Integer, nullable=False, server_default="0")
+    emails_sent = Column(Integer, nullable=False, server_default="0")
+    emails_failed = Column(Integer, nullable=False, server_default="0")
+    error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('ix_scheduled_job_runs_job_started', 'job_id', 'started_at'),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import TIMESTAMP, Column, Integer, PrimaryKeyConstraint, String
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class SchedulerJobClaim(Base):
+    """
+    One row per (job, run, partition) claimed by a worker, so each partition
+    runs once. The claim is a lease: completed_at is set when the partition
+    is done, and a claim left unfinished past the lease can be taken over.
+    """
+    __tablename__ = "scheduler_job_claims"
+
+    job_id = Column(String(100), nullable=False)
+    run_key = Column(String(50), nullable=False)
+    partition = Column(Integer, nullable=False)
+    claimed_by = Column(String(255), nullable=False)
+    claimed_at = Column(TIMESTAMP, nullable=False, server_default=text('now()'))
+    completed_at = Column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('job_id', 'run_key', 'partition'),
+    )
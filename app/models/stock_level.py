@@ -0,0 +1,20 @@
+from sqlalchemy import TIMESTAMP, CheckConstraint, Column, ForeignKey, Index, Integer, PrimaryKeyConstraint
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class StockLevel(Base):
+    """On-hand quantity of an item at one location; items.quantity is maintained as their sum"""
+    __tablename__ = "stock_levels"
+
+    item_id = Column(Integer, ForeignKey("items.id", ondelete="CASCADE"), nullable=False)
+    location_id = Column(Integer, ForeignKey("locations.id"), nullable=False)
+    quantity = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
+
+    __table_args__ = (
+        PrimaryKeyConstraint('item_id', 'location_id'),
+        CheckConstraint('quantity >= 0', name='ck_stock_levels_quantity_non_negative'),
+        # Per-location stock listing
+        Index('ix_stock_levels_location_item', 'location_id', 'item_id'),
+    )
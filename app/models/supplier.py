@@ -1,4 +1,4 @@
-from sqlalchemy import TIMESTAMP, Boolean, Column, Integer, Numeric, String, Text, func
+from sqlalchemy import TIMESTAMP, Boolean, Column, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.orm import relationship
 
 from app.models.base import Base
@@ -16,9 +16,22 @@ class Supplier(Base):
     address = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
     payable_balance = Column(Numeric(12, 2), nullable=False, server_default="0")
+    # Maintained by FinancialService.recalculate_supplier_payable_balance on bill/payment writes
+    purchase_bills_count = Column(Integer, nullable=False, server_default="0")
+    total_purchased = Column(Numeric(12, 2), nullable=False, server_default="0")
+    total_paid = Column(Numeric(12, 2), nullable=False, server_default="0")
     is_active = Column(Boolean, nullable=False, server_default="true")
     created_at = Column(TIMESTAMP, nullable=False, server_default=func.now())
     updated_at = Column(TIMESTAMP, nullable=False, server_default=func.now(), onupdate=func.now())
 
     bills = relationship("Bill", back_populates="supplier")
     payments = relationship("Payment", back_populates="supplier")
+
+    # pg_trgm indexes for the supplier search (ILIKE '%q%' and word_similarity)
+    __table_args__ = (
+        Index("ix_suppliers_supplier_name_trgm", "supplier_name", postgresql_using="gin", postgresql_ops={"supplier_name": "gin_trgm_ops"}),
+        Index("ix_suppliers_company_name_trgm", "company_name", postgresql_using="gin", postgresql_ops={"company_name": "gin_trgm_ops"}),
+        Index("ix_suppliers_contact_person_trgm", "contact_person", postgresql_using="gin", postgresql_ops={"contact_person": "gin_trgm_ops"}),
+        Index("ix_suppliers_phone_number_trgm", "phone_number", postgresql_using="gin", postgresql_ops={"phone_number": "gin_trgm_ops"}),
+        Index("ix_suppliers_email_trgm", "email", postgresql_using="gin", postgresql_ops={"email": "gin_trgm_ops"}),
+    )
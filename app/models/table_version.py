@@ -0,0 +1,12 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, String
+from sqlalchemy.sql.expression import text
+from app.models.base import Base
+
+
+class TableVersion(Base):
+    """Change counter per table, bumped by every transaction that writes to it (used for ETags)"""
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(100), primary_key=True, nullable=False)
+    version = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=text('now()'))
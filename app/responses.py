@@ -0,0 +1,29 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    # Same conversions as fastapi.encoders.jsonable_encoder for the types
+    # orjson does not handle itself (datetime, date, UUID and enums it does)
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class DefaultJSONResponse(ORJSONResponse):
+    """
+    Default response class for every route.
+    Bodies are encoded with orjson; the output matches the stock JSONResponse
+    (compact separators, UTF-8, ISO 8601 datetimes, Decimals per response model).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,87 @@
+from typing import List
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import oauth2
+from app.config import settings
+from app.database import get_db
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.models.user import User
+from app.schemas.job import JobTriggerResponse, ScheduledJobOut, ScheduledJobRunOut, ScheduledJobsResponse
+from app.services import scheduler as job_scheduler
+from app.services.job_metrics import job_metrics
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def _recent_runs(db: Session, job_id: str, limit: int) -> list[ScheduledJobRun]:
+    return (
+        db.query(ScheduledJobRun)
+        .filter(ScheduledJobRun.job_id == job_id)
+        .order_by(ScheduledJobRun.started_at.desc(), ScheduledJobRun.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def _ensure_tracked_job(job_id: str) -> None:
+    if job_id not in job_scheduler.TRACKED_JOBS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job {job_id} not found")
+
+
+def get_current_admin(current_user: User = Depends(oauth2.get_current_user)) -> User:
+    """The current user, if listed in settings.admin_emails; otherwise 403"""
+    admin_emails = {email.strip().lower() for email in settings.admin_emails.split(",") if email.strip()}
+    if current_user.email.lower() not in admin_emails:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+@router.get("/jobs", response_model=ScheduledJobsResponse)
+def get_jobs(
+    runs_limit: int = Query(default=10, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    jobs = []
+    for job_id in job_scheduler.TRACKED_JOBS:
+        scheduled_job = job_scheduler.scheduler.get_job(job_id)
+        jobs.append(
+            ScheduledJobOut(
+                job_id=job_id,
+                name=scheduled_job.name if scheduled_job else job_id,
+                next_run_time=scheduled_job.next_run_time if scheduled_job else None,
+                metrics=job_metrics.snapshot(job_id),
+                recent_runs=_recent_runs(db, job_id, runs_limit),
+            )
+        )
+
+    return ScheduledJobsResponse(
+        worker_id=job_scheduler.WORKER_ID,
+        is_leader=job_scheduler.is_leader(),
+        jobs=jobs,
+    )
+
+
+@router.get("/jobs/{job_id}/runs", response_model=List[ScheduledJobRunOut])
+def get_job_runs(
+    job_id: str,
+    limit: int = Query(default=50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    _ensure_tracked_job(job_id)
+    return _recent_runs(db, job_id, limit)
+
+
+@router.post("/jobs/{job_id}/run", response_model=JobTriggerResponse, status_code=status.HTTP_202_ACCEPTED)
+def trigger_job(
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_admin),
+):
+    _ensure_tracked_job(job_id)
+    background_tasks.add_task(job_scheduler.run_job_now, job_id)
+    return JobTriggerResponse(job_id=job_id, message=f"Job {job_id} triggered")
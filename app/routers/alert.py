@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from app import oauth2
 from app.database import get_db
 from app.models.low_stock_alert import LowStockAlert
@@ -7,13 +7,13 @@ from app.models.user import User
 from app.models.item import Item
 from app.services.alert_service import AlertService
 from app.services.notification_service import NotificationService
+from app.services.scheduler import get_archive_metrics
 from app.schemas.low_stock_alert import (
     LowStockAlertOut,
     AlertStatsOut,
     UserPreferencesUpdate
 )
 from typing import List
-from sqlalchemy import func
 from datetime import datetime
 import logging
 
@@ -30,21 +30,25 @@ router = APIRouter(
 def get_user_alerts(
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
-    show_resolved: bool = False
+    show_resolved: bool = False,
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0)
 ):
     """
-    Get all low stock alerts for the current user
+    Get low stock alerts for the current user, newest first
     
     Query Parameters:
     - show_resolved: If True, show resolved alerts as well
+    - limit: Maximum number of alerts to return (default: 50, max: 200)
+    - offset: Number of alerts to skip
     """
-    query = db.query(LowStockAlert).filter(LowStockAlert.user_id == current_user.id)
-    
-    if not show_resolved:
-        query = query.filter(LowStockAlert.is_resolved == False)
-    
-    alerts = query.order_by(LowStockAlert.created_at.desc()).all()
-    return alerts
+    return AlertService.list_user_alerts(
+        db=db,
+        user_id=current_user.id,
+        show_resolved=show_resolved,
+        limit=limit,
+        offset=offset
+    )
 
 
 # Get alert statistics
@@ -56,31 +60,22 @@ def get_alert_stats(
     """
     Get statistics about low stock alerts for current user
     """
-    total_alerts = db.query(LowStockAlert).filter(
-        LowStockAlert.user_id == current_user.id
-    ).count()
-    
-    active_alerts = db.query(LowStockAlert).filter(
-        LowStockAlert.user_id == current_user.id,
-        LowStockAlert.is_resolved == False
-    ).count()
-    
-    resolved_alerts = db.query(LowStockAlert).filter(
-        LowStockAlert.user_id == current_user.id,
-        LowStockAlert.is_resolved == True
-    ).count()
-    
-    # Count items that are currently low stock
-    low_stock_items = db.query(func.count(Item.id)).filter(
-        Item.quantity < 5  # Default threshold
-    ).scalar()
-    
-    return {
-        "total_alerts": total_alerts,
-        "active_alerts": active_alerts,
-        "resolved_alerts": resolved_alerts,
-        "low_stock_items": low_stock_items
-    }
+    return AlertService.get_alert_stats(
+        db=db,
+        user_id=current_user.id,
+        alert_threshold=current_user.alert_threshold
+    )
+
+
+# Get alert archival metrics
+@router.get("/archive/metrics", response_model=dict)
+def get_alert_archive_metrics(
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """
+    Get counters for the resolved alert archival job (runs, rows moved, last run)
+    """
+    return get_archive_metrics()
 
 
 # Get specific alert by ID
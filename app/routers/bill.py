@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app import oauth2
@@ -12,16 +12,23 @@ from app.schemas.bill import (
     BillCreateResponse,
     BillDetailResponse,
     BillLineItemResponse,
+    BillQuoteResponse,
     BillResponse,
     PaymentSummary,
 )
 from app.schemas.payment import PaymentCreate, PaymentCreateResult, PaymentResponse
-from app.services.billing_service import BillingService
+from app.services.billing_service import BILL_PROJECTION, BillingService
+from app.services.idempotency import IDEMPOTENCY_KEY_HEADER, idempotency_store
 from app.services.payment_service import PaymentService
+from app.services.projection import FIELDS_QUERY_DESCRIPTION
+from app.services.table_versions import conditional_get
 
 
 router = APIRouter(prefix="/bills", tags=["Bills"])
 
+# Bill lists embed the customer and supplier
+BILL_LIST_TABLES = ("bills", "customers", "suppliers")
+
 
 def _serialize_bill_line_items(bill: Bill) -> list[BillLineItemResponse]:
     return [
@@ -48,6 +55,7 @@ def _serialize_bill_detail(bill: Bill) -> BillDetailResponse:
         bill_type=bill.bill_type.value,
         customer_id=bill.customer_id,
         supplier_id=bill.supplier_id,
+        location_id=bill.location_id,
         customer=bill.customer,
         supplier=bill.supplier,
         subtotal_amount=bill.subtotal_amount,
@@ -67,30 +75,48 @@ def _serialize_bill_detail(bill: Bill) -> BillDetailResponse:
     )
 
 
-@router.get("/", response_model=List[BillResponse])
-@router.get("", response_model=List[BillResponse], include_in_schema=False)
-@router.get("/legacy", response_model=List[BillResponse], include_in_schema=False)
+@router.get("/", response_model=List[BillResponse], dependencies=[conditional_get(*BILL_LIST_TABLES)])
+@router.get("", response_model=List[BillResponse], include_in_schema=False, dependencies=[conditional_get(*BILL_LIST_TABLES)])
+@router.get("/legacy", response_model=List[BillResponse], include_in_schema=False, dependencies=[conditional_get(*BILL_LIST_TABLES)])
 def get_bills(
+    response: Response,
+    fields: Optional[str] = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return BillingService.list_bills(db)
+    projection = BILL_PROJECTION.parse(fields)
+    bills = BillingService.list_bills(db, fields=projection)
+    if projection:
+        return BILL_PROJECTION.response(projection, bills, response)
+    return bills
 
 
-@router.get("/due", response_model=List[BillResponse])
+@router.get("/due", response_model=List[BillResponse], dependencies=[conditional_get(*BILL_LIST_TABLES)])
 def get_due_bills(
+    response: Response,
+    fields: Optional[str] = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return BillingService.list_due_bills(db)
+    projection = BILL_PROJECTION.parse(fields)
+    bills = BillingService.list_due_bills(db, fields=projection)
+    if projection:
+        return BILL_PROJECTION.response(projection, bills, response)
+    return bills
 
 
-@router.get("/payable", response_model=List[BillResponse])
+@router.get("/payable", response_model=List[BillResponse], dependencies=[conditional_get(*BILL_LIST_TABLES)])
 def get_payable_bills(
+    response: Response,
+    fields: Optional[str] = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return BillingService.list_payable_bills(db)
+    projection = BILL_PROJECTION.parse(fields)
+    bills = BillingService.list_payable_bills(db, fields=projection)
+    if projection:
+        return BILL_PROJECTION.response(projection, bills, response)
+    return bills
 
 
 @router.get("/{bill_id}", response_model=BillDetailResponse)
@@ -107,10 +133,24 @@ def get_bill(
 @router.post("", response_model=BillCreateResponse, status_code=status.HTTP_201_CREATED, include_in_schema=False)
 def create_bill(
     payload: BillCreate,
+    idempotency_key: Optional[str] = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
+    """
+    Create a bill. Send an Idempotency-Key header to make retries safe: a
+    repeated key returns the first response without creating another bill.
+    """
     try:
+        replay = idempotency_store.begin(
+            db,
+            user_id=current_user.id,
+            endpoint="POST /bills",
+            key=idempotency_key,
+            payload=payload,
+        )
+        if replay is not None:
+            return replay
         bill = BillingService.create_bill(
             db=db,
             user=current_user,
@@ -118,6 +158,7 @@ def create_bill(
             items=payload.items,
             customer_id=payload.customer_id,
             supplier_id=payload.supplier_id,
+            location_id=payload.location_id,
             discount_amount=payload.discount_amount,
             tax_amount=payload.tax_amount,
             initial_paid_amount=payload.initial_paid_amount,
@@ -136,7 +177,7 @@ def create_bill(
             detail=str(exc),
         )
 
-    return BillCreateResponse(
+    result = BillCreateResponse(
         bill_id=bill.bill_code,
         bill_type=bill.bill_type.value,
         message=f"{bill.bill_type.value.title()} bill created successfully",
@@ -149,6 +190,34 @@ def create_bill(
         due_amount=bill.due_amount,
         payment_status=bill.payment_status.value,
     )
+    idempotency_store.complete(
+        user_id=current_user.id,
+        endpoint="POST /bills",
+        key=idempotency_key,
+        status_code=status.HTTP_201_CREATED,
+        content=result,
+    )
+    return result
+
+
+@router.post("/quote", response_model=BillQuoteResponse)
+def quote_bill(
+    payload: BillCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    """
+    Price a cart without creating a bill: line prices, totals and stock at
+    the bill's location. Takes no locks and writes nothing.
+    """
+    return BillingService.quote_bill(
+        db=db,
+        bill_type=payload.bill_type,
+        items=payload.items,
+        location_id=payload.location_id,
+        discount_amount=payload.discount_amount,
+        tax_amount=payload.tax_amount,
+    )
 
 
 @router.get("/{bill_id}/payments", response_model=List[PaymentResponse])
@@ -1,8 +1,9 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from fastapi import APIRouter, Depends, HTTPException , status 
 from app import  oauth2
 from app.database import get_db
 from app.models.bill import Bill 
+from app.models.inventory import InventoryTransaction
 from app.models.user import User
 from fastapi.responses import StreamingResponse
 from reportlab.lib.pagesizes import A4
@@ -19,7 +20,16 @@ router = APIRouter(
 @router.get("/pdf/{bill_id}")
 def print_bill_pdf( bill_id: str , db: Session = Depends(get_db) , current_user: User = Depends(oauth2.get_current_user)):
     #filter database
-    bill = db.query(Bill).filter(Bill.bill_code == bill_id).first()
+    bill = (
+        db.query(Bill)
+        .options(
+            joinedload(Bill.customer),
+            joinedload(Bill.supplier),
+            selectinload(Bill.inventory_transactions).joinedload(InventoryTransaction.items),
+        )
+        .filter(Bill.bill_code == bill_id)
+        .first()
+    )
 
     
     if not bill:
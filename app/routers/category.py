@@ -1,11 +1,14 @@
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException , status
 from app.models import category as category_model
+from app.models.item import Item
 from app.models.user import User
 from app import  oauth2
 from app.database import get_db
 from app.schemas import category
-from sqlalchemy import func
+from app.services.change_feed import CATEGORY, ITEM, ChangeFeedService
+from app.services.item_search_index import item_search_index
+from app.services.reference_cache import CATEGORIES, ITEMS, reference_cache
 from typing import List
 
 router = APIRouter(
@@ -20,11 +23,9 @@ def create_category(category: category.CategoryCreate, db: Session = Depends(get
                     current_user: User = Depends(oauth2.get_current_user)):
     
     # check if category name already exists
-    existing_category = (db.query(
-        category_model.Category)
-            .filter(func.lower(category_model.Category.name) == category.name.lower()).first() )
+    existing_category_id = reference_cache.find_category_id_by_name(db, category.name)
 
-    if existing_category:
+    if existing_category_id is not None:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail=f"Category with name {category.name} already exists")
         
@@ -33,6 +34,7 @@ def create_category(category: category.CategoryCreate, db: Session = Depends(get
     db.add(new_category)
     db.commit()
     db.refresh(new_category)
+    reference_cache.invalidate(CATEGORIES)
     
     return new_category
 
@@ -43,9 +45,7 @@ def create_category(category: category.CategoryCreate, db: Session = Depends(get
 def get_categories(db: Session = Depends(get_db),
                    current_user: User = Depends(oauth2.get_current_user)):
     
-    categories = db.query(category_model.Category).all()
-    
-    return categories
+    return reference_cache.list_categories(db)
 
 
 
@@ -54,7 +54,7 @@ def get_categories(db: Session = Depends(get_db),
 def get_category(id: int, db: Session = Depends(get_db),
                  current_user: User = Depends(oauth2.get_current_user)):
     
-    category = db.query(category_model.Category).filter(category_model.Category.id == id).first()
+    category = reference_cache.get_category(db, id)
     
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
@@ -68,14 +68,23 @@ def delete_category(id: int, db: Session = Depends(get_db),
                     current_user: User = Depends(oauth2.get_current_user)):
     
     category_query = db.query(category_model.Category).filter(category_model.Category.id == id)
-    category = category_query.first()
+    # locked so no item can be added to it before the delete
+    category = category_query.with_for_update().first()
     
     if not category:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=f"Category with id {id} not found")
     
+    # the category's items are removed by the foreign key cascade
+    item_ids = [item_id for item_id, in db.query(Item.id).filter(Item.category_id == id)]
     category_query.delete(synchronize_session=False)
+    ChangeFeedService.record_deletes(db, CATEGORY, [id])
+    ChangeFeedService.record_deletes(db, ITEM, item_ids)
     db.commit()
+
+    reference_cache.invalidate(CATEGORIES)
+    reference_cache.invalidate(ITEMS)
+    item_search_index.invalidate()
     
     return None
 
@@ -93,16 +102,14 @@ def update_category(id: int, updated_category: category.CategoryCreate, db: Sess
                             detail=f"Category with id {id} not found")
     
     # check if updated name already exists
-    existing_category = (db.query(
-        category_model.Category)
-            .filter(func.lower(category_model.Category.name) == updated_category.name.lower(),
-                    category_model.Category.id != id).first() )
+    existing_category_id = reference_cache.find_category_id_by_name(db, updated_category.name)
 
-    if existing_category:
+    if existing_category_id is not None and existing_category_id != id:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT,
                             detail=f"Category with name {updated_category.name} already exists")
     
     category_query.update(updated_category.dict(), synchronize_session=False)
     db.commit()
+    reference_cache.invalidate(CATEGORIES)
     
     return category_query.first()
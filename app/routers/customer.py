@@ -8,8 +8,10 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.customer import CustomerCreate, CustomerDetailResponse, CustomerListItem, CustomerUpdate
 from app.schemas.payment import CustomerDueSummaryResponse, CustomerLedgerResponse
-from app.services.customer_service import CustomerService
+from app.services.customer_service import CUSTOMER_PROJECTION, CustomerService
 from app.services.payment_service import PaymentService
+from app.services.projection import FIELDS_QUERY_DESCRIPTION
+from app.services.table_versions import conditional_get
 
 
 router = APIRouter(
@@ -18,23 +20,43 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[CustomerListItem])
+@router.get("/", response_model=List[CustomerListItem], dependencies=[conditional_get("customers")])
 def get_customers(
+    response: Response,
     include_inactive: bool = False,
+    include_summary: bool = True,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return CustomerService.list_customers(db, include_inactive=include_inactive)
-
-
-@router.get("/search", response_model=List[CustomerListItem])
+    projection = CUSTOMER_PROJECTION.parse(fields)
+    customers = CustomerService.list_customers(
+        db,
+        include_inactive=include_inactive,
+        limit=limit,
+        cursor=cursor,
+        include_summary=include_summary,
+        fields=projection,
+    )
+    if limit is not None and len(customers) == limit:
+        response.headers["X-Next-Cursor"] = CustomerService.page_cursor(customers[-1])
+    if projection:
+        return CUSTOMER_PROJECTION.response(projection, customers, response)
+    return customers
+
+
+@router.get("/search", response_model=List[CustomerListItem], dependencies=[conditional_get("customers")])
 def search_customers(
     q: Optional[str] = Query(default=None, min_length=1),
     include_inactive: bool = False,
+    limit: int = Query(default=20, ge=1, le=100),
+    include_summary: bool = True,
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return CustomerService.list_customers(db, include_inactive=include_inactive, query=q)
+    return CustomerService.list_customers(db, include_inactive=include_inactive, query=q, limit=limit, include_summary=include_summary)
 
 
 @router.get("/{id}", response_model=CustomerDetailResponse)
@@ -46,7 +68,7 @@ def get_customer(
     return CustomerService.get_customer_detail(db, id)
 
 
-@router.get("/{id}/ledger", response_model=CustomerLedgerResponse)
+@router.get("/{id}/ledger", response_model=CustomerLedgerResponse, dependencies=[conditional_get("customers", "bills", "payments")])
 def get_customer_ledger(
     id: int,
     db: Session = Depends(get_db),
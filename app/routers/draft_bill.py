@@ -0,0 +1,115 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import oauth2
+from app.database import get_db
+from app.models.user import User
+from app.schemas.bill import BillCreateResponse
+from app.schemas.draft_bill import DraftBillCreate, DraftBillFinalize, DraftBillLineAdd, DraftBillOut
+from app.services.draft_bill_service import DraftBillService
+
+
+router = APIRouter(prefix="/drafts", tags=["Draft Bills"])
+
+
+@router.post("/", response_model=DraftBillOut, status_code=status.HTTP_201_CREATED)
+def create_draft(
+    payload: DraftBillCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    draft = DraftBillService.create_draft(db, payload, current_user)
+    return DraftBillService.serialize(draft)
+
+
+@router.get("/{draft_id}", response_model=DraftBillOut)
+def get_draft(
+    draft_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    return DraftBillService.serialize(DraftBillService.get_draft(db, draft_id, current_user))
+
+
+@router.post("/{draft_id}/lines", response_model=DraftBillOut)
+def add_draft_line(
+    draft_id: int,
+    payload: DraftBillLineAdd,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    """
+    Add units of an item to the draft (a new line, or more of an existing one).
+    Sell drafts soft-reserve the units: the add fails with 400 when the
+    location's stock minus other open drafts' reservations is short. The
+    stock figure comes from the price cache, so the bill itself stays the
+    final check.
+    """
+    draft = DraftBillService.add_line(db, draft_id, current_user, payload.model_number, payload.quantity)
+    return DraftBillService.serialize(draft)
+
+
+@router.delete("/{draft_id}/lines/{model_number}", response_model=DraftBillOut)
+def remove_draft_line(
+    draft_id: int,
+    model_number: str,
+    quantity: Optional[int] = Query(default=None, gt=0, description="Units to remove (default: the whole line)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    draft = DraftBillService.remove_line(db, draft_id, current_user, model_number.strip(), quantity)
+    return DraftBillService.serialize(draft)
+
+
+@router.post("/{draft_id}/finalize", response_model=BillCreateResponse, status_code=status.HTTP_201_CREATED)
+def finalize_draft(
+    draft_id: int,
+    payload: DraftBillFinalize,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    """Create the bill from the draft and delete the draft"""
+    try:
+        bill = DraftBillService.finalize(db, draft_id, payload, current_user)
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Draft bill {draft_id} references items or parties that no longer exist",
+        )
+    except Exception as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(exc),
+        )
+
+    return BillCreateResponse(
+        bill_id=bill.bill_code,
+        bill_type=bill.bill_type.value,
+        message=f"{bill.bill_type.value.title()} bill created successfully",
+        total_items=len(bill.inventory_transactions),
+        subtotal_amount=bill.subtotal_amount,
+        discount_amount=bill.discount_amount,
+        tax_amount=bill.tax_amount,
+        total_amount=bill.total_amount,
+        paid_amount=bill.paid_amount,
+        due_amount=bill.due_amount,
+        payment_status=bill.payment_status.value,
+    )
+
+
+@router.delete("/{draft_id}", status_code=status.HTTP_204_NO_CONTENT)
+def discard_draft(
+    draft_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    DraftBillService.discard(db, draft_id, current_user)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, status
+from starlette.concurrency import run_in_threadpool
+
+from app import oauth2
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.event_broker import event_broker
+
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"],
+)
+
+
+def _authenticate(token: str) -> Optional[int]:
+    """User id for a valid access token, else None (own short session; none is held while streaming)"""
+    db = SessionLocal()
+    try:
+        token_data = oauth2.verify_access_token(token, HTTPException(status_code=status.HTTP_401_UNAUTHORIZED))
+        return db.query(User.id).filter(User.id == token_data.id).scalar()
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+
+@router.websocket("/ws")
+async def live_events(
+    websocket: WebSocket,
+    token: str = Query(..., description="access token; browsers cannot set headers on WebSockets"),
+):
+    """
+    Push channel for stock, low_stock_alert, bill and payment events as they
+    commit. Each message is a JSON object with a "type". A "resync" message
+    means events were dropped (slow connection or reconnect): refetch.
+    """
+    user_id = await run_in_threadpool(_authenticate, token)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = event_broker.subscribe(user_id)
+
+    async def send_events():
+        while True:
+            await websocket.send_text(await subscription.queue.get())
+
+    async def wait_for_disconnect():
+        # Client messages are ignored; this only notices the close
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = {asyncio.create_task(send_events()), asyncio.create_task(wait_for_disconnect())}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        event_broker.unsubscribe(subscription)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,33 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app import oauth2
+from app.database import get_db
+from app.models.user import User
+from app.schemas.inventory import InventoryValuationResponse
+from app.services.inventory_valuation_service import InventoryValuationService
+
+
+router = APIRouter(prefix="/inventory", tags=["Inventory"])
+
+
+@router.get("/valuation", response_model=InventoryValuationResponse)
+def get_inventory_valuation(
+    snapshot_date: Optional[date] = Query(default=None, description="Return the nightly snapshot of this date instead of live totals"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    """Stock value at cost and at selling price, per category and overall"""
+    if snapshot_date is None:
+        return InventoryValuationService.get_valuation(db)
+
+    snapshot = InventoryValuationService.get_snapshot(db, snapshot_date)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No inventory valuation snapshot for {snapshot_date}",
+        )
+    return snapshot
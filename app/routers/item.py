@@ -1,16 +1,26 @@
 from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from starlette.responses import FileResponse
 from app.models import item as item_model
-from app.models import category as category_model
 from app.models.user import User
 from app import oauth2
 from app.database import get_db
 from app.schemas import item
+from app.schemas.location import ItemStockLevel
 from app.services.alert_service import AlertService
+from app.services.change_feed import ITEM, ChangeFeedService
+from app.services.event_broker import STOCK as STOCK_EVENT, event_broker
+from app.services.inventory_valuation_service import InventoryValuationService
+from app.services.item_movement_service import ItemMovementService
+from app.services.item_search_index import item_search_index
 from app.services.model_number_service import ModelNumberService
-from sqlalchemy import func
-from typing import List
+from app.services.projection import FIELDS_QUERY_DESCRIPTION, Projection
+from app.services.reference_cache import ITEMS, STOCK, reference_cache
+from app.services.scan_cache import scan_cache
+from app.services.stock_service import StockService
+from app.services.table_versions import conditional_get
+from datetime import date, timedelta
+from typing import List, Literal, Optional
 import logging
 import os
 
@@ -21,6 +31,19 @@ router = APIRouter(
     tags=['items']
 )
 
+# Sparse fieldsets for the item list; the nested category is only in the full response
+ITEM_PROJECTION = Projection(
+    item.ItemOut,
+    columns={
+        name: getattr(item_model.Item, name)
+        for name in item.ItemOut.model_fields
+        if name != "category"
+    },
+    profiles={
+        "pos": ("id", "name", "model_number", "quantity", "selling_price"),
+    },
+)
+
 
 # --Create Item with auto-generated model number and QR code --#
 @router.post("/", response_model=item.ItemOut)
@@ -34,11 +57,7 @@ def create_item(
     """
     try:
         # Validate category exists
-        existing_category = db.query(category_model.Category).filter(
-            category_model.Category.id == item_data.category_id
-        ).first()
-        
-        if not existing_category:
+        if not reference_cache.category_exists(db, item_data.category_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Category with id {item_data.category_id} does not exist"
@@ -60,10 +79,14 @@ def create_item(
         )
         
         db.add(new_item)
+        db.flush()
+        StockService.set_item_quantity(db, new_item.id, new_item.quantity)
         db.commit()
         db.refresh(new_item)
         
         logger.info(f"✅ Item created: {new_item.id} with model number {model_number}")
+        item_search_index.upsert(new_item)
+        InventoryValuationService.refresh_after_commit([new_item.category_id])
         
         # Check for low stock alert
         try:
@@ -78,7 +101,7 @@ def create_item(
         except Exception as e:
             logger.error(f"Error checking low stock alert for new item: {str(e)}")
         
-        return new_item
+        return reference_cache.item_out(db, new_item)
         
     except HTTPException:
         raise
@@ -91,17 +114,44 @@ def create_item(
 
 
 # --Get all items-- #
-@router.get("/", response_model=List[item.ItemOut])
+@router.get("/", response_model=List[item.ItemOut], dependencies=[conditional_get("items", "categories")])
 def get_items(
+    response: Response,
+    fields: Optional[str] = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user)
 ):
-    """Get all items"""
-    items = db.query(item_model.Item).order_by(item_model.Item.id).all()
-    return items
+    """Get all items, optionally only some fields (?fields=pos or ?fields=id,name,quantity)"""
+    item_query = db.query(item_model.Item).order_by(item_model.Item.id)
+    projection = ITEM_PROJECTION.parse(fields)
+    if projection:
+        return ITEM_PROJECTION.response(projection, ITEM_PROJECTION.select(item_query, projection), response)
+
+    items = item_query.all()
+    return [reference_cache.item_out(db, item_obj) for item_obj in items]
+
+
+# --Typeahead search-- #
+@router.get("/search", response_model=List[item.ItemSearchResult])
+def search_items(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """
+    Typeahead search on name, model number and description prefixes
+    Served from the in-memory item index, falling back to the database
+    """
+    if item_search_index.is_stale:
+        # Rebuilt on a background thread; the current index (or the database) serves meanwhile
+        item_search_index.refresh_in_background()
+    if not item_search_index.is_built:
+        return item_search_index.search_database(db, q, limit)
+
+    return item_search_index.search(q, limit)
 
 
-# --Get item by ID-- #
 # --Get item by model number-- #
 @router.get("/by-model/{model_number}", response_model=item.ItemOut)
 def get_item_by_model(
@@ -112,19 +162,18 @@ def get_item_by_model(
     """
     Get item by model number
     Example: /items/by-model/MDL-2026-00001
+    Served from the scan cache of pre-serialized items
     """
-    item_obj = db.query(item_model.Item).filter(
-        item_model.Item.model_number == model_number
-    ).first()
+    item_payload = scan_cache.get(db, model_number)
     
-    if not item_obj:
+    if item_payload is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item with model number {model_number} not found"
         )
     
-    logger.info(f"✅ Retrieved item: {item_obj.model_number}")
-    return item_obj
+    logger.info(f"✅ Retrieved item: {model_number}")
+    return Response(content=item_payload, media_type="application/json")
 
 
 @router.post("/resolve-qr", response_model=item.QRResolveResponse)
@@ -145,11 +194,9 @@ def resolve_item_qr(
             detail=str(exc)
         ) from exc
 
-    item_obj = db.query(item_model.Item).filter(
-        item_model.Item.model_number == model_number
-    ).first()
+    item_payload = scan_cache.get(db, model_number)
 
-    if not item_obj:
+    if item_payload is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Item with model number {model_number} not found"
@@ -158,13 +205,45 @@ def resolve_item_qr(
     logger.info(
         "✅ Resolved scanned code for user %s to item %s",
         current_user.id,
-        item_obj.model_number,
+        model_number,
+    )
+    return Response(
+        content=scan_cache.resolve_response(payload.scanned_value, model_number, qr_format, item_payload),
+        media_type="application/json",
     )
-    return item.QRResolveResponse(
-        scanned_value=payload.scanned_value.strip(),
-        resolved_model_number=model_number,
-        qr_format=qr_format,
-        item=item_obj,
+
+
+@router.post("/resolve-qr/batch", response_model=item.QRResolveBatchResponse)
+def resolve_item_qr_batch(
+    payload: item.QRResolveBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """
+    Resolve up to 200 scanned codes in one call, in request order.
+    Unparseable or unknown codes get an error entry instead of failing the batch.
+    """
+    return Response(
+        content=scan_cache.resolve_batch(db, payload.scanned_values),
+        media_type="application/json",
+    )
+
+
+# --Batch item lookup-- #
+@router.post("/batch", response_model=item.ItemBatchResponse)
+def get_items_batch(
+    payload: item.ItemBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """
+    Look up to 500 items by model number and/or id in one call, e.g. to
+    pre-warm a POS cart. Items keep the request order; unknown keys are
+    listed in missing_model_numbers / missing_ids.
+    """
+    return Response(
+        content=scan_cache.get_batch(db, payload.model_numbers, payload.ids),
+        media_type="application/json",
     )
 
 
@@ -184,7 +263,80 @@ def get_item(
             detail=f"Item with id {id} not found"
         )
     
-    return item_obj
+    return reference_cache.item_out(db, item_obj)
+
+
+def _require_item(db: Session, id: int) -> None:
+    if not db.query(item_model.Item.id).filter(item_model.Item.id == id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Item with id {id} not found"
+        )
+
+
+# --Item stock per location-- #
+@router.get("/{id}/stock", response_model=List[ItemStockLevel], dependencies=[conditional_get("stock_levels", "locations")])
+def get_item_stock(
+    id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """Stock of an item at each location"""
+    _require_item(db, id)
+    return StockService.item_stock(db, id)
+
+
+# --Item movement history-- #
+@router.get(
+    "/{id}/movements",
+    response_model=List[item.ItemMovement],
+    dependencies=[conditional_get("inventory_transactions", "bills")],
+)
+def get_item_movements(
+    id: int,
+    response: Response,
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """
+    Stock movements of an item, newest first.
+    Pass the X-Next-Cursor header of a full page as `cursor` to get the next one.
+    """
+    _require_item(db, id)
+    movements = ItemMovementService.list_movements(db, id, limit=limit, cursor=cursor)
+    if len(movements) == limit:
+        response.headers["X-Next-Cursor"] = ItemMovementService.page_cursor(movements[-1])
+    return movements
+
+
+@router.get(
+    "/{id}/movements/buckets",
+    response_model=List[item.ItemMovementBucket],
+    dependencies=[conditional_get("inventory_transactions")],
+)
+def get_item_movement_buckets(
+    id: int,
+    bucket: Literal["day", "week", "month"] = "day",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user)
+):
+    """
+    Stock in/out, net change and average buy/sell price of an item per
+    day, week or month. Defaults to the last 365 days.
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=365)
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must not be after date_to"
+        )
+    _require_item(db, id)
+    return ItemMovementService.bucketed(db, id, bucket=bucket, date_from=date_from, date_to=date_to)
 
 
 # --Update item-- #
@@ -207,22 +359,36 @@ def update_item(
     
     # Validate category if provided
     if updated_item.category_id:
-        existing_category = db.query(category_model.Category).filter(
-            category_model.Category.id == updated_item.category_id
-        ).first()
-        
-        if not existing_category:
+        if not reference_cache.category_exists(db, updated_item.category_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Category with id {updated_item.category_id} does not exist"
             )
     
     # Update only provided fields
+    previous_category_id = item_obj.category_id
     update_data = updated_item.dict(exclude_unset=True)
+    location_stock = None
+    if update_data.get("quantity") is not None:
+        location_stock = StockService.set_item_quantity(db, id, update_data["quantity"])
     item_query.update(update_data, synchronize_session=False)
     db.commit()
     
     updated_item_obj = item_query.first()
+    item_search_index.upsert(updated_item_obj)
+    InventoryValuationService.refresh_after_commit({previous_category_id, updated_item_obj.category_id})
+    reference_cache.invalidate(STOCK, [updated_item_obj.model_number])
+    if location_stock is not None:
+        location_id, location_quantity = location_stock
+        event_broker.publish(STOCK_EVENT, {
+            "location_id": location_id,
+            "items": [{
+                "item_id": id,
+                "model_number": updated_item_obj.model_number,
+                "location_quantity": location_quantity,
+                "quantity": updated_item_obj.quantity,
+            }],
+        })
     
     # Check for low stock alert
     try:
@@ -238,7 +404,7 @@ def update_item(
         logger.error(f"Error checking low stock alert: {str(e)}")
     
     logger.info(f"✅ Item updated: {id}")
-    return updated_item_obj
+    return reference_cache.item_out(db, updated_item_obj)
 
 
 # --Delete item-- #
@@ -265,8 +431,14 @@ def delete_item(
         except Exception as e:
             logger.error(f"Error deleting QR code: {str(e)}")
     
+    model_number = item_obj.model_number
+    category_id = item_obj.category_id
     item_query.delete(synchronize_session=False)
+    ChangeFeedService.record_deletes(db, ITEM, [id])
     db.commit()
+    item_search_index.remove(id)
+    InventoryValuationService.refresh_after_commit([category_id])
+    reference_cache.invalidate(ITEMS, [model_number])
     
     logger.info(f"✅ Item deleted: {id}")
     return None
@@ -328,9 +500,7 @@ def get_qr_by_model(
     Example: /items/qr/MDL-2026-00001
     """
     try:
-        item_obj = db.query(item_model.Item).filter(
-            item_model.Item.model_number == model_number
-        ).first()
+        item_obj = reference_cache.get_item_by_model_number(db, model_number)
         
         if not item_obj:
             raise HTTPException(
@@ -0,0 +1,63 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app import oauth2
+from app.database import get_db
+from app.models.user import User
+from app.schemas.location import LocationCreate, LocationOut, LocationStockLevel, LocationUpdate
+from app.services.stock_service import StockService
+from app.services.table_versions import conditional_get
+
+
+router = APIRouter(
+    prefix="/locations",
+    tags=["Locations"],
+)
+
+
+@router.get("/", response_model=List[LocationOut], dependencies=[conditional_get("locations")])
+def get_locations(
+    include_inactive: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    return StockService.list_locations(db, include_inactive=include_inactive)
+
+
+@router.post("/", response_model=LocationOut, status_code=status.HTTP_201_CREATED)
+def create_location(
+    payload: LocationCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    return StockService.create_location(db, payload)
+
+
+@router.put("/{id}", response_model=LocationOut)
+def update_location(
+    id: int,
+    payload: LocationUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    return StockService.update_location(db, id, payload)
+
+
+@router.get("/{id}/stock", response_model=List[LocationStockLevel], dependencies=[conditional_get("stock_levels", "items")])
+def get_location_stock(
+    id: int,
+    low_stock_only: bool = False,
+    threshold: Optional[int] = Query(default=None, ge=0, description="Low-stock threshold (default: your alert threshold)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    """Stock held at one location; low_stock_only lists just the items below the threshold there"""
+    StockService.get_location(db, id)
+    return StockService.list_location_stock(
+        db,
+        id,
+        low_stock_threshold=threshold if threshold is not None else current_user.alert_threshold,
+        low_stock_only=low_stock_only,
+    )
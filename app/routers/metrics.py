@@ -0,0 +1,25 @@
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
+from app.config import settings
+from app.services.metrics import CONTENT_TYPE, registry
+
+
+router = APIRouter(
+    tags=["Metrics"],
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics(authorization: str | None = Header(default=None)):
+    """Prometheus text exposition of this worker's metrics (scrape every worker)"""
+    if settings.metrics_token and not hmac.compare_digest(
+        (authorization or "").encode(), f"Bearer {settings.metrics_token}".encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
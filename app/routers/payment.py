@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app import oauth2
@@ -16,6 +16,7 @@ from app.schemas.payment import (
     SupplierPayablePaymentCreate,
     SupplierPayableSummaryResponse,
 )
+from app.services.idempotency import IDEMPOTENCY_KEY_HEADER, idempotency_store
 from app.services.payment_service import PaymentService
 
 
@@ -25,11 +26,22 @@ router = APIRouter(prefix="/payments", tags=["Payments"])
 @router.post("/customer", response_model=PaymentCreateResult, status_code=status.HTTP_201_CREATED)
 def record_customer_payment(
     payload: CustomerDuePaymentCreate,
+    idempotency_key: Optional[str] = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
+    """Record a customer payment; a repeated Idempotency-Key returns the first response"""
     try:
-        return PaymentService.record_customer_payment(db, payload, current_user)
+        replay = idempotency_store.begin(
+            db,
+            user_id=current_user.id,
+            endpoint="POST /payments/customer",
+            key=idempotency_key,
+            payload=payload,
+        )
+        if replay is not None:
+            return replay
+        result = PaymentService.record_customer_payment(db, payload, current_user)
     except HTTPException:
         db.rollback()
         raise
@@ -37,6 +49,15 @@ def record_customer_payment(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
 
+    idempotency_store.complete(
+        user_id=current_user.id,
+        endpoint="POST /payments/customer",
+        key=idempotency_key,
+        status_code=status.HTTP_201_CREATED,
+        content=result,
+    )
+    return result
+
 
 @router.get("/customer/{customer_id}", response_model=List[PaymentResponse])
 def get_customer_payments(
@@ -50,11 +71,22 @@ def get_customer_payments(
 @router.post("/supplier", response_model=PaymentCreateResult, status_code=status.HTTP_201_CREATED)
 def record_supplier_payment(
     payload: SupplierPayablePaymentCreate,
+    idempotency_key: Optional[str] = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, min_length=1, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
+    """Record a supplier payment; a repeated Idempotency-Key returns the first response"""
     try:
-        return PaymentService.record_supplier_payment(db, payload, current_user)
+        replay = idempotency_store.begin(
+            db,
+            user_id=current_user.id,
+            endpoint="POST /payments/supplier",
+            key=idempotency_key,
+            payload=payload,
+        )
+        if replay is not None:
+            return replay
+        result = PaymentService.record_supplier_payment(db, payload, current_user)
     except HTTPException:
         db.rollback()
         raise
@@ -62,6 +94,15 @@ def record_supplier_payment(
         db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc))
 
+    idempotency_store.complete(
+        user_id=current_user.id,
+        endpoint="POST /payments/supplier",
+        key=idempotency_key,
+        status_code=status.HTTP_201_CREATED,
+        content=result,
+    )
+    return result
+
 
 @router.get("/supplier/{supplier_id}", response_model=List[PaymentResponse])
 def get_supplier_payments(
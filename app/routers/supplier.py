@@ -8,8 +8,10 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.supplier import SupplierCreate, SupplierDetailResponse, SupplierListItem, SupplierUpdate
 from app.schemas.payment import SupplierLedgerResponse, SupplierPayableSummaryResponse
-from app.services.supplier_service import SupplierService
+from app.services.supplier_service import SUPPLIER_PROJECTION, SupplierService
 from app.services.payment_service import PaymentService
+from app.services.projection import FIELDS_QUERY_DESCRIPTION
+from app.services.table_versions import conditional_get
 
 
 router = APIRouter(
@@ -18,23 +20,43 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[SupplierListItem])
+@router.get("/", response_model=List[SupplierListItem], dependencies=[conditional_get("suppliers")])
 def get_suppliers(
+    response: Response,
     include_inactive: bool = False,
+    include_summary: bool = True,
+    limit: Optional[int] = Query(default=None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description=FIELDS_QUERY_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return SupplierService.list_suppliers(db, include_inactive=include_inactive)
-
-
-@router.get("/search", response_model=List[SupplierListItem])
+    projection = SUPPLIER_PROJECTION.parse(fields)
+    suppliers = SupplierService.list_suppliers(
+        db,
+        include_inactive=include_inactive,
+        limit=limit,
+        cursor=cursor,
+        include_summary=include_summary,
+        fields=projection,
+    )
+    if limit is not None and len(suppliers) == limit:
+        response.headers["X-Next-Cursor"] = SupplierService.page_cursor(suppliers[-1])
+    if projection:
+        return SUPPLIER_PROJECTION.response(projection, suppliers, response)
+    return suppliers
+
+
+@router.get("/search", response_model=List[SupplierListItem], dependencies=[conditional_get("suppliers")])
 def search_suppliers(
     q: Optional[str] = Query(default=None, min_length=1),
     include_inactive: bool = False,
+    limit: int = Query(default=20, ge=1, le=100),
+    include_summary: bool = True,
     db: Session = Depends(get_db),
     current_user: User = Depends(oauth2.get_current_user),
 ):
-    return SupplierService.list_suppliers(db, include_inactive=include_inactive, query=q)
+    return SupplierService.list_suppliers(db, include_inactive=include_inactive, query=q, limit=limit, include_summary=include_summary)
 
 
 @router.get("/{id}", response_model=SupplierDetailResponse)
@@ -46,7 +68,7 @@ def get_supplier(
     return SupplierService.get_supplier_detail(db, id)
 
 
-@router.get("/{id}/ledger", response_model=SupplierLedgerResponse)
+@router.get("/{id}/ledger", response_model=SupplierLedgerResponse, dependencies=[conditional_get("suppliers", "bills", "payments")])
 def get_supplier_ledger(
     id: int,
     db: Session = Depends(get_db),
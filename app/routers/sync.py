@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app import oauth2
+from app.database import get_db
+from app.models.user import User
+from app.schemas.sync import CatalogChanges
+from app.services.change_feed import ChangeFeedService
+
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"],
+)
+
+
+@router.get("/items", response_model=CatalogChanges)
+def sync_items(
+    since: int = Query(default=0, ge=0, description="version returned by the previous sync; 0 for everything"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(oauth2.get_current_user),
+):
+    """Items and categories changed or deleted since the given version"""
+    return ChangeFeedService.changes_since(db, since)
@@ -29,6 +29,7 @@ class BillCreate(BaseModel):
     items: List[BillCreateItem] = Field(min_length=1)
     customer_id: Optional[int] = Field(default=None, gt=0)
     supplier_id: Optional[int] = Field(default=None, gt=0)
+    location_id: Optional[int] = Field(default=None, gt=0)
     discount_amount: Money = Field(default=Decimal("0"), ge=Decimal("0"))
     tax_amount: Money = Field(default=Decimal("0"), ge=Decimal("0"))
     initial_paid_amount: Money = Field(default=Decimal("0"), ge=Decimal("0"))
@@ -93,6 +94,7 @@ class BillResponse(BaseModel):
     bill_type: Literal["buy", "sell"]
     customer_id: Optional[int] = None
     supplier_id: Optional[int] = None
+    location_id: Optional[int] = None
     customer: Optional[CustomerBasic] = None
     supplier: Optional[SupplierBasic] = None
     subtotal_amount: Money
@@ -132,3 +134,26 @@ class BillCreateResponse(StartBillResponse):
     paid_amount: Money
     due_amount: Money
     payment_status: str
+
+
+class BillQuoteLine(BaseModel):
+    model_number: str
+    name: Optional[str] = None
+    quantity: int
+    unit_price: Optional[Money] = None
+    line_total: Optional[Money] = None
+    # Stock at the bill's location, before this cart
+    available_quantity: Optional[int] = None
+    in_stock: bool
+    error: Optional[str] = None
+
+
+class BillQuoteResponse(BaseModel):
+    bill_type: Literal["buy", "sell"]
+    location_id: int
+    lines: List[BillQuoteLine]
+    subtotal_amount: Money
+    discount_amount: Money
+    tax_amount: Money
+    total_amount: Money
+    all_in_stock: bool
@@ -135,7 +135,7 @@ class CustomerListItem(BaseModel):
     due_balance: Decimal
     is_active: bool
     created_at: datetime
-    summary: CustomerSummary
+    summary: Optional[CustomerSummary] = None
 
 
 class CustomerDetailResponse(CustomerListItem):
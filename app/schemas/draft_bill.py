@@ -0,0 +1,76 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.schemas.bill import BillCreateItem, Money
+
+
+class DraftBillCreate(BaseModel):
+    bill_type: Literal["buy", "sell"]
+    location_id: Optional[int] = Field(default=None, gt=0)
+    customer_id: Optional[int] = Field(default=None, gt=0)
+    supplier_id: Optional[int] = Field(default=None, gt=0)
+    discount_amount: Money = Field(default=Decimal("0"), ge=Decimal("0"))
+    tax_amount: Money = Field(default=Decimal("0"), ge=Decimal("0"))
+    notes: Optional[str] = None
+
+    @model_validator(mode="after")
+    def validate_parties(self):
+        if self.bill_type == "sell" and self.supplier_id is not None:
+            raise ValueError("supplier_id can only be used with buy bills")
+        if self.bill_type == "buy" and self.customer_id is not None:
+            raise ValueError("customer_id can only be used with sell bills")
+        return self
+
+
+class DraftBillLineAdd(BillCreateItem):
+    pass
+
+
+class DraftBillFinalize(BaseModel):
+    discount_amount: Optional[Money] = Field(default=None, ge=Decimal("0"))
+    tax_amount: Optional[Money] = Field(default=None, ge=Decimal("0"))
+    initial_paid_amount: Money = Field(default=Decimal("0"), ge=Decimal("0"))
+    payment_method: Optional[str] = None
+    payment_mode_summary: Optional[str] = None
+    notes: Optional[str] = None
+    finalized_at: Optional[datetime] = None
+
+    @field_validator("payment_mode_summary", "notes")
+    @classmethod
+    def normalize_optional_text(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        normalized = value.strip()
+        return normalized or None
+
+
+class DraftBillLineOut(BaseModel):
+    item_id: int
+    model_number: str
+    quantity: int
+    unit_price: Money
+    line_total: Money
+
+    class Config:
+        from_attributes = True
+
+
+class DraftBillOut(BaseModel):
+    id: int
+    bill_type: Literal["buy", "sell"]
+    location_id: int
+    customer_id: Optional[int] = None
+    supplier_id: Optional[int] = None
+    lines: List[DraftBillLineOut]
+    line_count: int
+    total_quantity: int
+    subtotal_amount: Money
+    discount_amount: Money
+    tax_amount: Money
+    total_amount: Money
+    notes: Optional[str] = None
+    created_at: datetime
+    expires_at: datetime
@@ -1,5 +1,5 @@
 from pydantic import BaseModel , Field
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Literal , Annotated , Optional
 
@@ -24,4 +24,27 @@ class InventoryTransactionOut(InventoryTransaction):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CategoryValuation(BaseModel):
+    category_id: int
+    category_name: str
+    item_count: int
+    total_quantity: int
+    value_at_cost: Decimal
+    value_at_price: Decimal
+
+
+class ValuationTotals(BaseModel):
+    item_count: int
+    total_quantity: int
+    value_at_cost: Decimal
+    value_at_price: Decimal
+
+
+class InventoryValuationResponse(BaseModel):
+    """Live valuation (snapshot_date is None) or a nightly snapshot"""
+    snapshot_date: Optional[date] = None
+    as_of: Optional[datetime] = None
+    categories: list[CategoryValuation]
+    totals: ValuationTotals
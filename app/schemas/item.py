@@ -1,8 +1,8 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from app.schemas.category import CategoryOut
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
 
 class ItemBase(BaseModel):
@@ -41,6 +41,15 @@ class ItemOut(ItemBase):
         from_attributes = True
 
 
+class ItemSearchResult(BaseModel):
+    """Lightweight typeahead match"""
+    id: int
+    name: str
+    model_number: str
+    selling_price: Decimal
+    category_id: int
+
+
 class QRResolveRequest(BaseModel):
     scanned_value: str = Field(..., min_length=1)
 
@@ -50,3 +59,62 @@ class QRResolveResponse(BaseModel):
     resolved_model_number: str
     qr_format: str
     item: ItemOut
+
+
+class QRResolveBatchRequest(BaseModel):
+    scanned_values: List[str] = Field(..., min_length=1, max_length=200)
+
+
+class QRResolveBatchResult(BaseModel):
+    """One scanned code; error is set instead of item when it could not be resolved"""
+    scanned_value: str
+    resolved_model_number: Optional[str] = None
+    qr_format: Optional[str] = None
+    item: Optional[ItemOut] = None
+    error: Optional[str] = None
+
+
+class QRResolveBatchResponse(BaseModel):
+    results: List[QRResolveBatchResult]
+
+
+class ItemBatchRequest(BaseModel):
+    """Items to look up by model number and/or id, 500 keys at most"""
+    model_numbers: List[str] = Field(default_factory=list, max_length=500)
+    ids: List[int] = Field(default_factory=list, max_length=500)
+
+    @model_validator(mode="after")
+    def validate_keys(self):
+        if not self.model_numbers and not self.ids:
+            raise ValueError("Provide model_numbers or ids")
+        if len(self.model_numbers) + len(self.ids) > 500:
+            raise ValueError("At most 500 model_numbers and ids in total")
+        return self
+
+
+class ItemBatchResponse(BaseModel):
+    """Found items in request order (model numbers first, then ids) and the keys that matched nothing"""
+    items: List[ItemOut]
+    missing_model_numbers: List[str]
+    missing_ids: List[int]
+
+
+class ItemMovement(BaseModel):
+    """One inventory transaction of an item (buy = stock in, sell = stock out)"""
+    id: int
+    bill_id: int
+    bill_code: str
+    transaction_type: str
+    quantity: int
+    price: Decimal
+    created_at: datetime
+
+
+class ItemMovementBucket(BaseModel):
+    bucket_start: date
+    quantity_in: int
+    quantity_out: int
+    net_quantity: int
+    average_buy_price: Optional[Decimal] = None
+    average_sell_price: Optional[Decimal] = None
+    transactions: int
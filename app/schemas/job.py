@@ -0,0 +1,42 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ScheduledJobRunOut(BaseModel):
+    id: int
+    job_id: str
+    status: str
+    worker_id: str
+    manual: bool
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: int
+    items_scanned: int
+    rows_affected: int
+    emails_sent: int
+    emails_failed: int
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ScheduledJobOut(BaseModel):
+    job_id: str
+    name: str
+    next_run_time: Optional[datetime] = None
+    metrics: dict
+    recent_runs: List[ScheduledJobRunOut]
+
+
+class ScheduledJobsResponse(BaseModel):
+    worker_id: str
+    is_leader: bool
+    jobs: List[ScheduledJobOut]
+
+
+class JobTriggerResponse(BaseModel):
+    job_id: str
+    message: str
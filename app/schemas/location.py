@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class LocationBase(BaseModel):
+    name: str = Field(min_length=1, max_length=100)
+    is_default: bool = False
+    is_active: bool = True
+
+    @field_validator("name")
+    @classmethod
+    def normalize_name(cls, value: str) -> str:
+        normalized = value.strip()
+        if not normalized:
+            raise ValueError("name cannot be empty")
+        return normalized
+
+
+class LocationCreate(LocationBase):
+    pass
+
+
+class LocationUpdate(BaseModel):
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    is_default: Optional[bool] = None
+    is_active: Optional[bool] = None
+
+
+class LocationOut(LocationBase):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LocationStockLevel(BaseModel):
+    """An item's stock at one location"""
+    item_id: int
+    model_number: str
+    name: str
+    quantity: int
+    is_low_stock: bool
+
+
+class ItemStockLevel(BaseModel):
+    """One location's share of an item's stock"""
+    location_id: int
+    location_name: str
+    quantity: int
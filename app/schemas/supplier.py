@@ -114,7 +114,7 @@ class SupplierListItem(BaseModel):
     payable_balance: Decimal
     is_active: bool
     created_at: datetime
-    summary: SupplierSummary
+    summary: Optional[SupplierSummary] = None
 
 
 class SupplierDetailResponse(SupplierListItem):
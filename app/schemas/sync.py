@@ -0,0 +1,16 @@
+from typing import List
+
+from pydantic import BaseModel
+
+from app.schemas.category import CategoryOut
+from app.schemas.item import ItemOut
+
+
+class CatalogChanges(BaseModel):
+    """Catalogue rows changed since the requested version"""
+    # Pass as ?since= on the next sync
+    version: int
+    items: List[ItemOut]
+    deleted_item_ids: List[int]
+    categories: List[CategoryOut]
+    deleted_category_ids: List[int]
@@ -1,11 +1,17 @@
 """
 Service for managing low stock alerts
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import cast, delete, Date, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
+from typing import Iterable
+from app.database import SessionLocal
 from app.models.low_stock_alert import LowStockAlert
+from app.models.low_stock_alert_archive import LowStockAlertDailyCount
 from app.models.item import Item
 from app.models.user import User
+from app.services.event_broker import LOW_STOCK_ALERT, event_broker
 from app.services.notification_service import NotificationService
 import logging
 
@@ -90,31 +96,38 @@ class AlertService:
         user_id: int,
         current_quantity: int,
     ) -> LowStockAlert:
-        existing_alert = db.query(LowStockAlert).filter(
-            LowStockAlert.item_id == item_id,
-            LowStockAlert.user_id == user_id,
-            LowStockAlert.is_resolved == False
-        ).first()
-
-        if existing_alert:
-            existing_alert.quantity_at_alert = current_quantity
-            existing_alert.last_sent_at = datetime.utcnow()
-            existing_alert.next_alert_at = datetime.utcnow() + timedelta(hours=24)
-            db.flush()
-            return existing_alert
-
-        alert = LowStockAlert(
-            item_id=item_id,
-            user_id=user_id,
-            quantity_at_alert=current_quantity,
-            alert_type="BOTH",
-            last_sent_at=datetime.utcnow(),
-            next_alert_at=datetime.utcnow() + timedelta(hours=24),
-            is_resolved=False
+        """
+        Create or refresh the open alert for an item and user atomically
+        
+        Uses INSERT ... ON CONFLICT DO UPDATE against the partial unique
+        index on open alerts, so concurrent sells of the same item can
+        never create duplicate open alerts.
+        """
+        now = datetime.utcnow()
+        next_alert_at = now + timedelta(hours=24)
+        stmt = (
+            insert(LowStockAlert)
+            .values(
+                item_id=item_id,
+                user_id=user_id,
+                quantity_at_alert=current_quantity,
+                alert_type="BOTH",
+                last_sent_at=now,
+                next_alert_at=next_alert_at,
+                is_resolved=False,
+            )
+            .on_conflict_do_update(
+                index_elements=[LowStockAlert.item_id, LowStockAlert.user_id],
+                index_where=LowStockAlert.is_resolved == False,
+                set_={
+                    "quantity_at_alert": current_quantity,
+                    "last_sent_at": now,
+                    "next_alert_at": next_alert_at,
+                },
+            )
+            .returning(LowStockAlert)
         )
-        db.add(alert)
-        db.flush()
-        return alert
+        return db.scalars(stmt, execution_options={"populate_existing": True}).one()
     
     @staticmethod
     def send_alert_notifications(
@@ -205,25 +218,112 @@ class AlertService:
         Returns:
             bool: True if alert was resolved
         """
-        try:
-            alert = db.query(LowStockAlert).filter(
-                LowStockAlert.item_id == item_id,
-                LowStockAlert.user_id == user_id,
-                LowStockAlert.is_resolved == False
-            ).first()
-            
-            if alert:
-                alert.is_resolved = True
-                db.flush()
-                logger.info(f"Alert resolved for item {item_id}")
-                return True
-            
-            return False
+        return AlertService.resolve_alerts(db=db, item_ids=[item_id], user_id=user_id) > 0
+
+    @staticmethod
+    def resolve_alerts(db: Session, item_ids: Iterable[int], user_id: int) -> int:
+        """
+        Resolve the open alerts for many items in a single UPDATE
+        
+        Args:
+            db: Database session
+            item_ids: IDs of the restocked items
+            user_id: ID of the user
             
+        Returns:
+            int: Number of alerts resolved
+        """
+        item_ids = list(set(item_ids))
+        if not item_ids:
+            return 0
+
+        try:
+            result = db.execute(
+                update(LowStockAlert)
+                .where(
+                    LowStockAlert.item_id.in_(item_ids),
+                    LowStockAlert.user_id == user_id,
+                    LowStockAlert.is_resolved == False
+                )
+                .values(is_resolved=True)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                logger.info(f"Resolved {result.rowcount} alert(s) for user {user_id}")
+            return result.rowcount
+
         except Exception as e:
-            logger.error(f"Error resolving alert: {str(e)}")
-            return False
-    
+            logger.error(f"Error resolving alerts: {str(e)}")
+            return 0
+
+    @staticmethod
+    def sync_stock_alerts(
+        db: Session,
+        user_id: int,
+        alert_threshold: int,
+        quantities: dict[int, int],
+    ) -> list[LowStockAlert]:
+        """
+        Open or refresh alerts for items below the threshold and resolve
+        the alerts of the others
+
+        Args:
+            db: Database session
+            user_id: ID of the user
+            alert_threshold: Threshold for low stock
+            quantities: New quantity per item ID
+
+        Returns:
+            list: The opened or refreshed alerts
+        """
+        alerts = []
+        restocked_item_ids = set()
+        for item_id, current_quantity in sorted(quantities.items()):
+            if current_quantity < alert_threshold:
+                alerts.append(AlertService.upsert_low_stock_alert(
+                    db=db,
+                    item_id=item_id,
+                    user_id=user_id,
+                    current_quantity=current_quantity,
+                ))
+            else:
+                restocked_item_ids.add(item_id)
+        AlertService.resolve_alerts(db=db, item_ids=restocked_item_ids, user_id=user_id)
+        return alerts
+
+    @staticmethod
+    def sync_stock_alerts_after_commit(
+        user_id: int,
+        alert_threshold: int,
+        quantities: dict[int, int],
+    ) -> None:
+        """
+        Run sync_stock_alerts in a short transaction of its own, after a bill
+        has committed its stock changes, so alert rows are never locked
+        together with item rows. Failures are logged; the scheduler's
+        low-stock scan picks up anything missed.
+        Opened alerts are pushed to the user's live connections.
+        """
+        if not quantities:
+            return
+        db = SessionLocal()
+        try:
+            alerts = AlertService.sync_stock_alerts(db, user_id, alert_threshold, quantities)
+            opened = [
+                {"alert_id": alert.id, "item_id": alert.item_id, "quantity": alert.quantity_at_alert}
+                for alert in alerts
+            ]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error syncing low stock alerts for items {sorted(quantities)}: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        if opened:
+            event_broker.publish(LOW_STOCK_ALERT, {"alerts": opened}, user_id=user_id)
+
     @staticmethod
     def get_all_low_stock_items(db: Session, user_id: int = None) -> list:
         """
@@ -248,3 +348,143 @@ class AlertService:
         except Exception as e:
             logger.error(f"Error getting low stock items: {str(e)}")
             return []
+
+    @staticmethod
+    def list_user_alerts(
+        db: Session,
+        user_id: int,
+        show_resolved: bool = False,
+        limit: int = 50,
+        offset: int = 0
+    ) -> list:
+        """
+        Get one page of alerts for a user, newest first
+        
+        Args:
+            db: Database session
+            user_id: ID of the user
+            show_resolved: Include resolved alerts as well
+            limit: Maximum number of alerts to return
+            offset: Number of alerts to skip
+            
+        Returns:
+            list: Low stock alert records with item and category loaded
+        """
+        query = (
+            db.query(LowStockAlert)
+            .options(joinedload(LowStockAlert.item).joinedload(Item.category))
+            .filter(LowStockAlert.user_id == user_id)
+        )
+
+        if not show_resolved:
+            query = query.filter(LowStockAlert.is_resolved == False)
+
+        return (
+            query.order_by(LowStockAlert.created_at.desc(), LowStockAlert.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_alert_stats(db: Session, user_id: int, alert_threshold: int) -> dict:
+        """
+        Compute alert statistics for a user in a single aggregate query
+        
+        Args:
+            db: Database session
+            user_id: ID of the user
+            alert_threshold: The user's low stock threshold
+            
+        Returns:
+            dict: total, active and resolved alert counts plus low stock item count
+        """
+        low_stock_items = (
+            select(func.count(Item.id))
+            .where(Item.quantity < alert_threshold)
+            .scalar_subquery()
+        )
+
+        row = db.execute(
+            select(
+                func.count(LowStockAlert.id).label("total_alerts"),
+                func.count(LowStockAlert.id).filter(LowStockAlert.is_resolved == False).label("active_alerts"),
+                func.count(LowStockAlert.id).filter(LowStockAlert.is_resolved == True).label("resolved_alerts"),
+                low_stock_items.label("low_stock_items"),
+            ).where(LowStockAlert.user_id == user_id)
+        ).one()
+
+        return {
+            "total_alerts": row.total_alerts,
+            "active_alerts": row.active_alerts,
+            "resolved_alerts": row.resolved_alerts,
+            "low_stock_items": row.low_stock_items
+        }
+
+    @staticmethod
+    def archive_resolved_alerts(db: Session, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move one batch of old resolved alerts into the daily roll-up table
+        
+        The batch is deleted from low_stock_alerts and folded into
+        low_stock_alert_daily_counts in a single statement. Rows locked by
+        another transaction are skipped, so the caller can commit after each
+        batch and never hold long locks.
+        
+        Args:
+            db: Database session
+            cutoff: Only alerts created before this time are archived
+            batch_size: Maximum number of alerts to move
+            
+        Returns:
+            int: Number of alerts moved
+        """
+        batch_ids = (
+            select(LowStockAlert.id)
+            .where(LowStockAlert.is_resolved == True, LowStockAlert.created_at < cutoff)
+            .order_by(LowStockAlert.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(LowStockAlert)
+            .where(LowStockAlert.id.in_(batch_ids))
+            .returning(
+                LowStockAlert.item_id,
+                LowStockAlert.user_id,
+                LowStockAlert.quantity_at_alert,
+                LowStockAlert.created_at,
+            )
+            .cte("moved")
+        )
+        alert_date = cast(moved.c.created_at, Date)
+        rollup = (
+            select(
+                alert_date,
+                moved.c.item_id,
+                moved.c.user_id,
+                func.count(),
+                func.min(moved.c.quantity_at_alert),
+            )
+            .group_by(alert_date, moved.c.item_id, moved.c.user_id)
+        )
+        stmt = insert(LowStockAlertDailyCount).from_select(
+            ["alert_date", "item_id", "user_id", "alert_count", "min_quantity"],
+            rollup,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                LowStockAlertDailyCount.alert_date,
+                LowStockAlertDailyCount.item_id,
+                LowStockAlertDailyCount.user_id,
+            ],
+            set_={
+                "alert_count": LowStockAlertDailyCount.alert_count + stmt.excluded.alert_count,
+                "min_quantity": func.least(LowStockAlertDailyCount.min_quantity, stmt.excluded.min_quantity),
+            },
+        )
+        rolled_up = stmt.cte("rolled_up")
+
+        return db.execute(
+            select(func.count()).select_from(moved).add_cte(rolled_up)
+        ).scalar()
@@ -1,8 +1,11 @@
+from collections import defaultdict
 from datetime import datetime
 from decimal import Decimal
-from typing import Iterable
+import time
+from typing import Iterable, NamedTuple, Optional, Sequence
 
 from fastapi import HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
 from app.function.automatic_bill_id_generation import generate_bill_id
@@ -12,23 +15,73 @@ from app.models.inventory import InventoryTransaction
 from app.models.item import Item
 from app.models.supplier import Supplier
 from app.models.user import User
+from app.schemas.bill import BillQuoteLine, BillQuoteResponse, BillResponse
 from app.services.alert_service import AlertService
 from app.services.customer_service import CustomerService
+from app.services.event_broker import BILL as BILL_EVENT, STOCK as STOCK_EVENT, event_broker
 from app.services.financial_service import FinancialService, ZERO
+from app.services.inventory_valuation_service import InventoryValuationService
+from app.services.item_movement_service import ItemMovementService
+from app.services.metrics import bill_create_duration, bills_created
 from app.services.payment_service import PaymentService
+from app.services.price_cache import price_cache
+from app.services.projection import Projection
+from app.services.reference_cache import STOCK, reference_cache
+from app.services.stock_service import StockService
 from app.services.supplier_service import SupplierService
 
 
+# Sparse fieldsets for the bill lists; nested customer/supplier are only in the full response
+BILL_PROJECTION = Projection(
+    BillResponse,
+    columns={
+        "id": Bill.id,
+        "bill_id": Bill.bill_code,
+        "bill_code": Bill.bill_code,
+        "bill_type": Bill.bill_type,
+        "customer_id": Bill.customer_id,
+        "supplier_id": Bill.supplier_id,
+        "location_id": Bill.location_id,
+        "subtotal_amount": Bill.subtotal_amount,
+        "discount_amount": Bill.discount_amount,
+        "tax_amount": Bill.tax_amount,
+        "total_amount": Bill.total_amount,
+        "paid_amount": Bill.paid_amount,
+        "due_amount": Bill.due_amount,
+        "payment_status": Bill.payment_status,
+        "payment_mode_summary": Bill.payment_mode_summary,
+        "notes": Bill.notes,
+        "finalized_at": Bill.finalized_at,
+        "created_by": Bill.created_by,
+        "created_at": Bill.created_at,
+    },
+    profiles={
+        "pos": ("id", "bill_code", "bill_type", "total_amount", "paid_amount", "due_amount", "payment_status", "finalized_at"),
+    },
+)
+
+
+class ResolvedBillLine(NamedTuple):
+    """A bill line whose item and unit price are already known (e.g. from a draft bill)"""
+    item_id: int
+    model_number: str
+    unit_price: Decimal
+    quantity: int
+
+
 class BillingService:
     @staticmethod
-    def _get_item_for_update(db: Session, model_number: str) -> Item:
-        item = db.query(Item).filter(Item.model_number == model_number).with_for_update().first()
-        if not item:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Item with model number {model_number} not found",
-            )
-        return item
+    def _get_items(db: Session, model_numbers: list[str]) -> dict[str, Item]:
+        """Load the bill's items by model number in one query, without locking them"""
+        items = db.query(Item).filter(Item.model_number.in_(set(model_numbers))).all()
+        items_by_model_number = {item.model_number: item for item in items}
+        for model_number in model_numbers:
+            if model_number not in items_by_model_number:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Item with model number {model_number} not found",
+                )
+        return items_by_model_number
 
     @staticmethod
     def _resolve_parties(
@@ -64,9 +117,11 @@ class BillingService:
         db: Session,
         user: User,
         bill_type: str,
-        items: Iterable,
+        items: Iterable = (),
+        resolved_lines: Optional[Sequence[ResolvedBillLine]] = None,
         customer_id: int | None = None,
         supplier_id: int | None = None,
+        location_id: int | None = None,
         discount_amount: Decimal = ZERO,
         tax_amount: Decimal = ZERO,
         initial_paid_amount: Decimal = ZERO,
@@ -75,13 +130,19 @@ class BillingService:
         notes: str | None = None,
         finalized_at: datetime | None = None,
     ) -> Bill:
+        """
+        Create and commit a bill. Lines come either as `items` (model number
+        and quantity; resolved and priced here) or as `resolved_lines`, which
+        are used as given, so no item lookup or pricing happens at all.
+        """
+        started = time.perf_counter()
         if bill_type not in {BillType.buy.value, BillType.sell.value}:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="bill_type must be either 'buy' or 'sell'",
             )
 
-        items = list(items)
+        items = list(items) if resolved_lines is None else list(resolved_lines)
         if not items:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -94,12 +155,32 @@ class BillingService:
             customer_id=customer_id,
             supplier_id=supplier_id,
         )
+        location = StockService.resolve_location(db, location_id)
+
+        for line in items:
+            if line.quantity <= 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Quantity must be greater than 0 for {line.model_number}",
+                )
+        stock_changed_category_ids = None
+        if resolved_lines is None:
+            # Resolve and price every line without row locks; stock is only touched at the end
+            items_by_model_number = BillingService._get_items(db, [line.model_number for line in items])
+            stock_changed_category_ids = {item.category_id for item in items_by_model_number.values()}
+            priced_lines = []
+            for line in items:
+                item = items_by_model_number[line.model_number]
+                price = item.selling_price if bill_type == BillType.sell.value else item.buying_price
+                priced_lines.append(ResolvedBillLine(item.id, item.model_number, price, line.quantity))
+            items = priced_lines
 
         bill = Bill(
             bill_code=generate_bill_id(bill_type),
             bill_type=BillType(bill_type),
             customer_id=customer.id if customer else None,
             supplier_id=supplier.id if supplier else None,
+            location_id=location.id,
             discount_amount=FinancialService.money(discount_amount),
             tax_amount=FinancialService.money(tax_amount),
             paid_amount=ZERO,
@@ -113,49 +194,26 @@ class BillingService:
         db.flush()
 
         subtotal_amount = ZERO
+        quantity_by_item_id: dict[int, int] = defaultdict(int)
+        transactions: list[InventoryTransaction] = []
+        model_numbers_by_item_id: dict[int, str] = {}
         for line in items:
-            item = BillingService._get_item_for_update(db, line.model_number)
-
-            if line.quantity <= 0:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Quantity must be greater than 0 for {line.model_number}",
-                )
-
-            if bill.bill_type == BillType.sell:
-                if item.quantity < line.quantity:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Not enough stock for {item.model_number}",
-                    )
-                item.quantity -= line.quantity
-                price = FinancialService.money(item.selling_price)
-            else:
-                item.quantity += line.quantity
-                price = FinancialService.money(item.buying_price)
+            price = FinancialService.money(line.unit_price)
+            quantity_by_item_id[line.item_id] += line.quantity
+            model_numbers_by_item_id[line.item_id] = line.model_number
 
             line_total = FinancialService.money(price * line.quantity)
             subtotal_amount = FinancialService.money(subtotal_amount + line_total)
 
-            db.add(
-                InventoryTransaction(
-                    bill_id=bill.id,
-                    item_id=item.id,
-                    quantity=line.quantity,
-                    price=price,
-                    transaction_type=bill.bill_type.value,
-                )
+            transaction = InventoryTransaction(
+                bill_id=bill.id,
+                item_id=line.item_id,
+                quantity=line.quantity,
+                price=price,
+                transaction_type=bill.bill_type.value,
             )
-
-            if item.quantity < user.alert_threshold:
-                AlertService.upsert_low_stock_alert(
-                    db=db,
-                    item_id=item.id,
-                    user_id=user.id,
-                    current_quantity=item.quantity,
-                )
-            else:
-                AlertService.resolve_alert(db=db, item_id=item.id, user_id=user.id)
+            db.add(transaction)
+            transactions.append(transaction)
 
         bill.subtotal_amount = FinancialService.money(subtotal_amount)
         bill.total_amount = FinancialService.calculate_total(
@@ -183,7 +241,47 @@ class BillingService:
         if bill.supplier_id:
             FinancialService.recalculate_supplier_payable_balance(db, bill.supplier_id)
 
+        # Stock and daily roll-up rows stay locked only from here to the commit,
+        # both taken in item id order
+        db.flush()
+        location_quantities = StockService.apply_bill(
+            db,
+            bill_type=bill.bill_type,
+            location=location,
+            quantity_by_item_id=quantity_by_item_id,
+            model_numbers_by_item_id=model_numbers_by_item_id,
+        )
+        ItemMovementService.record_daily(db, transactions)
+        user_id, alert_threshold = user.id, user.alert_threshold
+        location_id = location.id
         db.commit()
+
+        item_totals = StockService.refresh_totals_after_commit(quantity_by_item_id)
+        reference_cache.invalidate(STOCK, model_numbers_by_item_id.values())
+        event_broker.publish(STOCK_EVENT, {
+            "location_id": location_id,
+            "items": [
+                {
+                    "item_id": item_id,
+                    "model_number": model_numbers_by_item_id[item_id],
+                    "location_quantity": location_quantity,
+                    # None when the totals refresh failed; reconciled nightly
+                    "quantity": item_totals.get(item_id),
+                }
+                for item_id, location_quantity in location_quantities.items()
+            ],
+        })
+        if stock_changed_category_ids is None:
+            # Resolved lines carry no category; look them up now the stock locks are released
+            stock_changed_category_ids = db.execute(
+                select(Item.category_id).where(Item.id.in_(quantity_by_item_id)).distinct()
+            ).scalars().all()
+        InventoryValuationService.refresh_after_commit(stock_changed_category_ids)
+        AlertService.sync_stock_alerts_after_commit(
+            user_id=user_id,
+            alert_threshold=alert_threshold,
+            quantities=item_totals,
+        )
         bill = (
             db.query(Bill)
             .options(
@@ -195,8 +293,93 @@ class BillingService:
             .filter(Bill.id == bill.id)
             .first()
         )
+        event_broker.publish(BILL_EVENT, {
+            "bill_id": bill.id,
+            "bill_code": bill.bill_code,
+            "bill_type": bill.bill_type.value,
+            "location_id": bill.location_id,
+            "customer_id": bill.customer_id,
+            "supplier_id": bill.supplier_id,
+            "total_amount": bill.total_amount,
+            "paid_amount": bill.paid_amount,
+            "due_amount": bill.due_amount,
+            "payment_status": bill.payment_status.value,
+        })
+        bills_created.inc(bill_type)
+        bill_create_duration.observe(time.perf_counter() - started, bill_type)
         return bill
 
+    @staticmethod
+    def quote_bill(
+        *,
+        db: Session,
+        bill_type: str,
+        items: Iterable,
+        location_id: int | None = None,
+        discount_amount: Decimal = ZERO,
+        tax_amount: Decimal = ZERO,
+    ) -> BillQuoteResponse:
+        """
+        Price a cart the way create_bill would, without locks or writes.
+        Prices and stock come from the price cache; unknown model numbers
+        and short stock are reported per line instead of failing the quote.
+        """
+        items = list(items)
+        location = StockService.resolve_location(db, location_id)
+        entries = price_cache.get_many(db, (line.model_number for line in items))
+
+        requested: dict[str, int] = defaultdict(int)
+        for line in items:
+            requested[line.model_number] += line.quantity
+
+        subtotal_amount = ZERO
+        lines = []
+        for line in items:
+            entry = entries.get(line.model_number)
+            if entry is None:
+                lines.append(BillQuoteLine(
+                    model_number=line.model_number,
+                    quantity=line.quantity,
+                    in_stock=False,
+                    error=f"Item with model number {line.model_number} not found",
+                ))
+                continue
+
+            if bill_type == BillType.sell.value:
+                price = FinancialService.money(entry.selling_price)
+            else:
+                price = FinancialService.money(entry.buying_price)
+            line_total = FinancialService.money(price * line.quantity)
+            subtotal_amount = FinancialService.money(subtotal_amount + line_total)
+
+            available_quantity = entry.stock.get(location.id, 0)
+            in_stock = bill_type != BillType.sell.value or available_quantity >= requested[line.model_number]
+            lines.append(BillQuoteLine(
+                model_number=line.model_number,
+                name=entry.name,
+                quantity=line.quantity,
+                unit_price=price,
+                line_total=line_total,
+                available_quantity=available_quantity,
+                in_stock=in_stock,
+                error=None if in_stock else f"Not enough stock for {line.model_number} at {location.name}",
+            ))
+
+        return BillQuoteResponse(
+            bill_type=bill_type,
+            location_id=location.id,
+            lines=lines,
+            subtotal_amount=subtotal_amount,
+            discount_amount=FinancialService.money(discount_amount),
+            tax_amount=FinancialService.money(tax_amount),
+            total_amount=FinancialService.calculate_total(
+                subtotal_amount=subtotal_amount,
+                discount_amount=discount_amount,
+                tax_amount=tax_amount,
+            ),
+            all_in_stock=all(line.in_stock for line in lines),
+        )
+
     @staticmethod
     def get_bill(db: Session, bill_id: int) -> Bill:
         bill = (
@@ -215,38 +398,38 @@ class BillingService:
         return bill
 
     @staticmethod
-    def list_bills(db: Session) -> list[Bill]:
-        return (
-            db.query(Bill)
-            .options(joinedload(Bill.customer), joinedload(Bill.supplier))
-            .order_by(Bill.created_at.desc(), Bill.id.desc())
-            .all()
-        )
+    def list_bills(db: Session, fields: Optional[tuple[str, ...]] = None) -> list:
+        bill_query = db.query(Bill).order_by(Bill.created_at.desc(), Bill.id.desc())
+        if fields:
+            return BILL_PROJECTION.select(bill_query, fields)
+        return bill_query.options(joinedload(Bill.customer), joinedload(Bill.supplier)).all()
 
     @staticmethod
-    def list_due_bills(db: Session) -> list[Bill]:
-        return (
+    def list_due_bills(db: Session, fields: Optional[tuple[str, ...]] = None) -> list:
+        bill_query = (
             db.query(Bill)
-            .options(joinedload(Bill.customer))
             .filter(
                 Bill.bill_type == BillType.sell,
                 Bill.finalized_at.isnot(None),
                 Bill.payment_status != PaymentStatus.paid,
             )
             .order_by(Bill.created_at.desc(), Bill.id.desc())
-            .all()
         )
+        if fields:
+            return BILL_PROJECTION.select(bill_query, fields)
+        return bill_query.options(joinedload(Bill.customer)).all()
 
     @staticmethod
-    def list_payable_bills(db: Session) -> list[Bill]:
-        return (
+    def list_payable_bills(db: Session, fields: Optional[tuple[str, ...]] = None) -> list:
+        bill_query = (
             db.query(Bill)
-            .options(joinedload(Bill.supplier))
             .filter(
                 Bill.bill_type == BillType.buy,
                 Bill.finalized_at.isnot(None),
                 Bill.payment_status != PaymentStatus.paid,
             )
             .order_by(Bill.created_at.desc(), Bill.id.desc())
-            .all()
         )
+        if fields:
+            return BILL_PROJECTION.select(bill_query, fields)
+        return bill_query.options(joinedload(Bill.supplier)).all()
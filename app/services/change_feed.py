@@ -0,0 +1,104 @@
+"""
+Change feed of the item catalogue for incremental till sync
+"""
+from typing import Iterable
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.base import change_version
+from app.models.catalog_tombstone import CatalogTombstone
+from app.models.category import Category
+from app.models.item import Item
+from app.schemas.category import CategoryOut
+from app.schemas.sync import CatalogChanges
+from app.services.reference_cache import reference_cache
+
+ITEM = "item"
+CATEGORY = "category"
+
+
+class ChangeFeedService:
+    """
+    Items and categories carry the id of the last transaction that wrote
+    them (change_version, set by the column defaults on every insert and
+    update); deletes leave a tombstone with the same kind of version.
+
+    Transaction ids are handed out when a transaction starts writing, not
+    when it commits, so a slow writer can commit a version lower than one
+    a client has already seen. A sync therefore only returns versions below
+    the xmin of the current snapshot (the oldest transaction still running):
+    everything below it has finished, and the xmin is the next `since`.
+    Rows committed with a higher version are picked up by the next sync.
+    """
+
+    @staticmethod
+    def record_deletes(db: Session, entity: str, ids: Iterable[int]) -> None:
+        """Add tombstones for rows deleted in the caller's transaction"""
+        ids = sorted(set(ids))
+        if not ids:
+            return
+        stmt = insert(CatalogTombstone).values([{"entity": entity, "entity_id": entity_id} for entity_id in ids])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CatalogTombstone.entity, CatalogTombstone.entity_id],
+            set_={"change_version": change_version(), "deleted_at": func.now()},
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def current_version(db: Session) -> int:
+        return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar_one()
+
+    @staticmethod
+    def _deleted_ids(db: Session, entity: str, since: int, version: int) -> list[int]:
+        return db.execute(
+            select(CatalogTombstone.entity_id)
+            .where(
+                CatalogTombstone.entity == entity,
+                CatalogTombstone.change_version >= since,
+                CatalogTombstone.change_version < version,
+            )
+            .order_by(CatalogTombstone.entity_id)
+        ).scalars().all()
+
+    @staticmethod
+    def changes_since(db: Session, since: int) -> CatalogChanges:
+        """
+        Items and categories written in [since, version) plus the ids deleted
+        in that range. since=0 returns the whole catalogue and no deletions.
+        Items of a changed category are included, as they embed it.
+        """
+        # Read before the rows: every version below it has committed by then
+        version = ChangeFeedService.current_version(db)
+        if since > version:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="since is ahead of the server; sync again from 0",
+            )
+
+        categories = (
+            db.query(Category)
+            .filter(Category.change_version >= since, Category.change_version < version)
+            .order_by(Category.id)
+            .all()
+        )
+        item_filter = and_(Item.change_version >= since, Item.change_version < version)
+        if categories and since > 0:
+            item_filter = or_(item_filter, Item.category_id.in_([category.id for category in categories]))
+        items = db.query(Item).filter(item_filter).order_by(Item.id).all()
+
+        if since == 0:
+            deleted_item_ids, deleted_category_ids = [], []
+        else:
+            deleted_item_ids = ChangeFeedService._deleted_ids(db, ITEM, since, version)
+            deleted_category_ids = ChangeFeedService._deleted_ids(db, CATEGORY, since, version)
+
+        return CatalogChanges(
+            version=version,
+            items=[reference_cache.item_out(db, item_obj) for item_obj in items],
+            deleted_item_ids=deleted_item_ids,
+            categories=[CategoryOut.model_validate(category) for category in categories],
+            deleted_category_ids=deleted_category_ids,
+        )
@@ -1,15 +1,38 @@
-from decimal import Decimal
-from typing import Iterable, List, Optional
+from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
-from app.models.bill import Bill, BillType
 from app.models.customer import Customer
 from app.models.payment import Payment
 from app.schemas.customer import CustomerCreate, CustomerDetailResponse, CustomerListItem, CustomerSummary, CustomerUpdate
 from app.services.financial_service import FinancialService
+from app.services.pagination import Pagination
+from app.services.projection import Projection
+from app.services.search_service import SearchService
+
+
+# Sparse fieldsets for the customer lists; the nested summary is only in the full response
+CUSTOMER_PROJECTION = Projection(
+    CustomerListItem,
+    columns={
+        "id": Customer.id,
+        "full_name": Customer.full_name,
+        "phone_number": Customer.phone_number,
+        "email": Customer.email,
+        "customer_type": Customer.customer_type,
+        "loyalty_points": Customer.loyalty_points,
+        "due_balance": Customer.due_balance,
+        "is_active": Customer.is_active,
+        "created_at": Customer.created_at,
+    },
+    profiles={
+        "pos": ("id", "full_name", "phone_number", "customer_type", "loyalty_points", "due_balance"),
+    },
+    # keyset cursor columns
+    required=("id", "full_name"),
+)
 
 
 class CustomerService:
@@ -33,38 +56,21 @@ class CustomerService:
         return customer
 
     @staticmethod
-    def _build_summary_map(db: Session, customer_ids: Iterable[int]) -> dict[int, CustomerSummary]:
-        customer_ids = list(customer_ids)
-        if not customer_ids:
-            return {}
-
-        rows = (
-            db.query(
-                Customer.id.label("customer_id"),
-                func.count(func.distinct(Bill.id)).label("number_of_bills"),
-                func.coalesce(func.sum(Bill.total_amount), 0).label("total_purchases"),
-                func.coalesce(func.sum(Bill.paid_amount), 0).label("total_paid"),
-                Customer.due_balance.label("due_balance"),
-            )
-            .outerjoin(Bill, Bill.customer_id == Customer.id)
-            .filter(Customer.id.in_(customer_ids))
-            .filter(or_(Bill.id.is_(None), Bill.bill_type == BillType.sell))
-            .group_by(Customer.id)
-            .all()
+    def _summary(customer: Customer) -> CustomerSummary:
+        return CustomerSummary(
+            number_of_bills=customer.bills_count,
+            total_purchases=customer.total_billed,
+            due_balance=customer.due_balance,
+            total_paid=customer.total_paid,
         )
 
-        summary_map: dict[int, CustomerSummary] = {}
-        for row in rows:
-            summary_map[row.customer_id] = CustomerSummary(
-                number_of_bills=int(row.number_of_bills or 0),
-                total_purchases=Decimal(row.total_purchases or 0),
-                due_balance=Decimal(row.due_balance or 0),
-                total_paid=Decimal(row.total_paid or 0),
-            )
-        return summary_map
+    @staticmethod
+    def page_cursor(item) -> str:
+        """Keyset cursor pointing just after the given list row."""
+        return Pagination.encode_cursor(item.full_name, item.id)
 
     @staticmethod
-    def _to_list_item(customer: Customer, summary: CustomerSummary) -> CustomerListItem:
+    def _to_list_item(customer: Customer, summary: Optional[CustomerSummary]) -> CustomerListItem:
         return CustomerListItem(
             id=customer.id,
             full_name=customer.full_name,
@@ -84,44 +90,52 @@ class CustomerService:
         *,
         include_inactive: bool = False,
         query: Optional[str] = None,
-    ) -> List[CustomerListItem]:
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_summary: bool = True,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> list:
         customer_query = db.query(Customer)
         if not include_inactive:
             customer_query = customer_query.filter(Customer.is_active.is_(True))
 
-        if query:
-            q = f"%{query.strip()}%"
-            customer_query = customer_query.filter(
-                or_(
-                    Customer.full_name.ilike(q),
-                    Customer.phone_number.ilike(q),
-                    Customer.email.ilike(q),
-                )
+        if query and query.strip():
+            text_query, digits = SearchService.normalize_query(query)
+            search_columns = dict(
+                text_columns=[
+                    Customer.full_name,
+                    Customer.email,
+                ],
+                phone_column=Customer.phone_number,
+                text_query=text_query,
+                digits=digits,
+            )
+            customer_query = customer_query.filter(SearchService.match_filter(**search_columns)).order_by(
+                SearchService.rank(**search_columns).desc(),
+                Customer.full_name.asc(),
             )
+        else:
+            if cursor:
+                after_name, after_id = Pagination.decode_cursor(cursor, (str, int))
+                customer_query = customer_query.filter(tuple_(Customer.full_name, Customer.id) > tuple_(after_name, after_id))
+            customer_query = customer_query.order_by(Customer.full_name.asc(), Customer.id.asc())
 
-        customers = customer_query.order_by(Customer.full_name.asc()).all()
-        summary_map = CustomerService._build_summary_map(db, [customer.id for customer in customers])
+        if limit is not None:
+            customer_query = customer_query.limit(limit)
 
+        if fields:
+            return CUSTOMER_PROJECTION.select(customer_query, fields)
+
+        customers = customer_query.all()
         return [
-            CustomerService._to_list_item(
-                customer,
-                summary_map.get(
-                    customer.id,
-                    CustomerSummary(number_of_bills=0, total_purchases=Decimal("0"), due_balance=customer.due_balance),
-                ),
-            )
+            CustomerService._to_list_item(customer, CustomerService._summary(customer) if include_summary else None)
             for customer in customers
         ]
 
     @staticmethod
     def get_customer_detail(db: Session, customer_id: int) -> CustomerDetailResponse:
         customer = CustomerService.get_customer(db, customer_id)
-        summary = CustomerService._build_summary_map(db, [customer.id]).get(
-            customer.id,
-            CustomerSummary(number_of_bills=0, total_purchases=Decimal("0"), due_balance=customer.due_balance),
-        )
-
-        list_item = CustomerService._to_list_item(customer, summary)
+        list_item = CustomerService._to_list_item(customer, CustomerService._summary(customer))
         return CustomerDetailResponse(
             **list_item.model_dump(),
             address=customer.address,
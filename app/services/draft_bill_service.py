@@ -0,0 +1,275 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.bill import Bill, BillType
+from app.models.draft_bill import DraftBill, DraftBillLine
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.draft_bill import DraftBillCreate, DraftBillFinalize, DraftBillLineOut, DraftBillOut
+from app.services.billing_service import BillingService, ResolvedBillLine
+from app.services.financial_service import FinancialService
+from app.services.price_cache import price_cache
+from app.services.stock_service import StockService
+
+
+class DraftBillService:
+    """
+    Server-side carts. Every line operation re-prices only the touched line
+    and adjusts the draft's totals by the difference. Sell drafts softly
+    reserve their quantities at the location: while a draft is open, other
+    drafts cannot add more than the stock left over. Reservations lapse
+    when the draft expires; create_bill stays the final authority on stock.
+    Drafts are private to the user who created them.
+    """
+
+    @staticmethod
+    def _expiry() -> datetime:
+        return datetime.now(timezone.utc) + timedelta(minutes=settings.draft_bill_ttl_minutes)
+
+    @staticmethod
+    def _get_open_draft(db: Session, draft_id: int, user: User, *, for_update: bool = False) -> DraftBill:
+        # Other users' drafts are reported as not found
+        draft_query = db.query(DraftBill).filter(
+            DraftBill.id == draft_id,
+            DraftBill.created_by == user.id,
+            DraftBill.expires_at > func.now(),
+        )
+        if for_update:
+            draft_query = draft_query.with_for_update()
+        draft = draft_query.first()
+        if not draft:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Draft bill with id {draft_id} not found or expired")
+        return draft
+
+    @staticmethod
+    def serialize(draft: DraftBill) -> DraftBillOut:
+        return DraftBillOut(
+            id=draft.id,
+            bill_type=draft.bill_type.value,
+            location_id=draft.location_id,
+            customer_id=draft.customer_id,
+            supplier_id=draft.supplier_id,
+            lines=[DraftBillLineOut.model_validate(line) for line in draft.lines],
+            line_count=draft.line_count,
+            total_quantity=draft.total_quantity,
+            subtotal_amount=draft.subtotal_amount,
+            discount_amount=draft.discount_amount,
+            tax_amount=draft.tax_amount,
+            # Not validated until finalize: the discount may exceed a half-built cart
+            total_amount=FinancialService.money(draft.subtotal_amount - draft.discount_amount + draft.tax_amount),
+            notes=draft.notes,
+            created_at=draft.created_at,
+            expires_at=draft.expires_at,
+        )
+
+    @staticmethod
+    def get_draft(db: Session, draft_id: int, user: User) -> DraftBill:
+        return DraftBillService._get_open_draft(db, draft_id, user)
+
+    @staticmethod
+    def create_draft(db: Session, payload: DraftBillCreate, user: User) -> DraftBill:
+        customer, supplier = BillingService._resolve_parties(
+            db=db,
+            bill_type=payload.bill_type,
+            customer_id=payload.customer_id,
+            supplier_id=payload.supplier_id,
+        )
+        location = StockService.resolve_location(db, payload.location_id)
+        draft = DraftBill(
+            bill_type=BillType(payload.bill_type),
+            location_id=location.id,
+            customer_id=customer.id if customer else None,
+            supplier_id=supplier.id if supplier else None,
+            discount_amount=FinancialService.money(payload.discount_amount),
+            tax_amount=FinancialService.money(payload.tax_amount),
+            notes=payload.notes,
+            created_by=user.id,
+            expires_at=DraftBillService._expiry(),
+        )
+        db.add(draft)
+        db.commit()
+        db.refresh(draft)
+        return draft
+
+    @staticmethod
+    def _reserved_elsewhere(db: Session, draft: DraftBill, item_id: int) -> int:
+        """Quantity of an item held by the other open sell drafts at the same location"""
+        return db.execute(
+            select(func.coalesce(func.sum(DraftBillLine.quantity), 0))
+            .join(DraftBill, DraftBill.id == DraftBillLine.draft_id)
+            .where(
+                DraftBillLine.item_id == item_id,
+                DraftBill.id != draft.id,
+                DraftBill.location_id == draft.location_id,
+                DraftBill.bill_type == BillType.sell,
+                DraftBill.expires_at > func.now(),
+            )
+        ).scalar_one()
+
+    @staticmethod
+    def _set_line_quantity(db: Session, draft: DraftBill, model_number: str, quantity: int) -> None:
+        """Set one line's quantity (0 removes it) and move the draft totals by the difference"""
+        entry = price_cache.get_many(db, (model_number,)).get(model_number)
+        if entry is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Item with model number {model_number} not found",
+            )
+
+        line = next((line for line in draft.lines if line.item_id == entry.item_id), None)
+        old_quantity = line.quantity if line else 0
+        old_total = line.line_total if line else FinancialService.money(0)
+
+        if draft.bill_type == BillType.sell and quantity > old_quantity:
+            # Drafts raising the same item take turns, so two of them cannot both count
+            # the same leftover stock; the lock lasts until this line operation commits
+            locked = db.execute(
+                select(Item.id).where(Item.id == entry.item_id).with_for_update(key_share=True)
+            ).scalar()
+            if locked is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Item with model number {model_number} not found",
+                )
+            available = entry.stock.get(draft.location_id, 0) - DraftBillService._reserved_elsewhere(db, draft, entry.item_id)
+            if quantity > available:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Not enough stock for {model_number}: {max(available, 0)} available",
+                )
+
+        price = FinancialService.money(entry.selling_price if draft.bill_type == BillType.sell else entry.buying_price)
+        new_total = FinancialService.money(price * quantity)
+
+        if quantity == 0:
+            if line is not None:
+                draft.lines.remove(line)
+                draft.line_count -= 1
+        elif line is None:
+            draft.lines.append(DraftBillLine(
+                item_id=entry.item_id,
+                model_number=entry.model_number,
+                position=max((line.position for line in draft.lines), default=0) + 1,
+                quantity=quantity,
+                unit_price=price,
+                line_total=new_total,
+            ))
+            draft.line_count += 1
+        else:
+            line.quantity = quantity
+            line.unit_price = price
+            line.line_total = new_total
+
+        draft.total_quantity += quantity - old_quantity
+        draft.subtotal_amount = FinancialService.money(draft.subtotal_amount + new_total - old_total)
+        draft.expires_at = DraftBillService._expiry()
+
+    @staticmethod
+    def add_line(db: Session, draft_id: int, user: User, model_number: str, quantity: int) -> DraftBill:
+        draft = DraftBillService._get_open_draft(db, draft_id, user, for_update=True)
+        line = next((line for line in draft.lines if line.model_number == model_number), None)
+        DraftBillService._set_line_quantity(db, draft, model_number, (line.quantity if line else 0) + quantity)
+        db.commit()
+        db.refresh(draft)
+        return draft
+
+    @staticmethod
+    def remove_line(db: Session, draft_id: int, user: User, model_number: str, quantity: Optional[int] = None) -> DraftBill:
+        """Remove `quantity` units of a line, or the whole line when quantity is None"""
+        draft = DraftBillService._get_open_draft(db, draft_id, user, for_update=True)
+        line = next((line for line in draft.lines if line.model_number == model_number), None)
+        if line is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Item {model_number} is not in draft bill {draft_id}",
+            )
+        new_quantity = 0 if quantity is None else max(line.quantity - quantity, 0)
+        DraftBillService._set_line_quantity(db, draft, model_number, new_quantity)
+        db.commit()
+        db.refresh(draft)
+        return draft
+
+    @staticmethod
+    def discard(db: Session, draft_id: int, user: User) -> None:
+        draft = DraftBillService._get_open_draft(db, draft_id, user, for_update=True)
+        db.delete(draft)
+        db.commit()
+
+    @staticmethod
+    def finalize(db: Session, draft_id: int, payload: DraftBillFinalize, user: User) -> Bill:
+        """
+        Turn the draft into a bill through BillingService.create_bill. The
+        lines go in already resolved, at the prices the draft was built
+        with, so the bill totals match what the cashier was shown and no
+        item is looked up or priced again. The draft is deleted in the same
+        transaction, so finalizing twice cannot create two bills.
+        Items deleted since they were added (their lines are gone with them)
+        answer 409, and the remaining items are key-share locked so none can
+        be deleted before the bill's lines reference them.
+        """
+        draft = DraftBillService._get_open_draft(db, draft_id, user, for_update=True)
+        if not draft.lines:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one bill item is required")
+
+        item_ids = sorted(line.item_id for line in draft.lines)
+        existing_ids = db.execute(
+            select(Item.id)
+            .where(Item.id.in_(item_ids))
+            .order_by(Item.id)
+            .with_for_update(read=True, key_share=True)
+        ).scalars().all()
+        if len(existing_ids) != len(item_ids) or draft.line_count != len(item_ids):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Items in draft bill {draft_id} were deleted; discard it and start a new one",
+            )
+
+        resolved_lines = [
+            ResolvedBillLine(
+                item_id=line.item_id,
+                model_number=line.model_number,
+                unit_price=line.unit_price,
+                quantity=line.quantity,
+            )
+            for line in sorted(draft.lines, key=lambda line: line.position)
+        ]
+        bill_kwargs = dict(
+            bill_type=draft.bill_type.value,
+            resolved_lines=resolved_lines,
+            customer_id=draft.customer_id,
+            supplier_id=draft.supplier_id,
+            location_id=draft.location_id,
+            discount_amount=draft.discount_amount if payload.discount_amount is None else payload.discount_amount,
+            tax_amount=draft.tax_amount if payload.tax_amount is None else payload.tax_amount,
+            notes=payload.notes or draft.notes,
+        )
+        db.delete(draft)
+        return BillingService.create_bill(
+            db=db,
+            user=user,
+            initial_paid_amount=payload.initial_paid_amount,
+            payment_method=payload.payment_method,
+            payment_mode_summary=payload.payment_mode_summary,
+            finalized_at=payload.finalized_at,
+            **bill_kwargs,
+        )
+
+    @staticmethod
+    def delete_expired(db: Session, batch_size: int = 1000) -> int:
+        """Delete up to batch_size expired drafts; returns how many were deleted"""
+        expired = (
+            select(DraftBill.id)
+            .where(DraftBill.expires_at <= func.now())
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(DraftBill)
+            .where(DraftBill.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
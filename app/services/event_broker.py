@@ -0,0 +1,260 @@
+"""
+In-process fan-out of committed changes to live WebSocket clients
+"""
+import asyncio
+import logging
+import queue
+import select
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+from app.responses import DefaultJSONResponse
+from app.services.reference_cache import LISTEN_RETRY_SECONDS, MAX_NOTIFY_PAYLOAD, WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL channel used to hand events to the other workers' brokers
+NOTIFY_CHANNEL = "live_events"
+
+# Event types
+STOCK = "stock"
+LOW_STOCK_ALERT = "low_stock_alert"
+BILL = "bill"
+PAYMENT = "payment"
+# Events were dropped for this connection; refetch instead of applying deltas
+RESYNC_MESSAGE = '{"type":"resync"}'
+# Events waiting for the sender thread; beyond this they are dropped for a resync
+MAX_PENDING_NOTIFIES = 1024
+
+
+class Subscription:
+    """One connection's bounded queue of encoded events"""
+
+    def __init__(self, user_id: int, max_queue: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_queue)
+
+
+class EventBroker:
+    """
+    One broker per worker. publish() is called from request threads after
+    a commit; the event is encoded once and handed to the event loop, which
+    puts it on the queue of every matching connection. Publishers never
+    wait on clients: when a connection's queue is full, its queued events
+    are dropped and replaced by a single resync event telling the client
+    to refetch. Events from other workers arrive through PostgreSQL NOTIFY.
+
+    The NOTIFY for other workers is not sent on the request thread: events
+    are queued for a sender thread with its own connection, which packs
+    whatever has queued up (e.g. a bill's stock, alert and bill events)
+    into as few NOTIFY payloads as fit, sent in one statement. Without the
+    threads started (scripts, tests) there is nobody to notify and the
+    events stay local.
+    """
+
+    def __init__(self, max_queue: int = 256):
+        self.max_queue = max_queue
+        # Only touched on the event loop
+        self._subscriptions: set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: threading.Thread | None = None
+        self._sender: threading.Thread | None = None
+        self._outbox: queue.Queue[tuple[str, str]] = queue.Queue(maxsize=MAX_PENDING_NOTIFIES)
+        # Set when events were dropped from a full outbox; the sender then sends a resync
+        self._outbox_overflowed = False
+        self._stop = threading.Event()
+
+    # --- connections (event loop) ---
+
+    def subscribe(self, user_id: int) -> Subscription:
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(user_id, self.max_queue)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def _deliver(self, message: str, user_id: Optional[int]) -> None:
+        for subscription in tuple(self._subscriptions):
+            if user_id is not None and subscription.user_id != user_id:
+                continue
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(RESYNC_MESSAGE)
+                logger.warning(f"⚠️ Live event queue full for user {subscription.user_id}; sent resync")
+
+    def _dispatch(self, message: str, user_id: Optional[int]) -> None:
+        """Hand a message to the event loop from any thread"""
+        loop = self._loop
+        if loop is None or not self._subscriptions:
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, message, user_id)
+        except RuntimeError:
+            # Event loop already closed (shutdown)
+            pass
+
+    # --- publishing (any thread) ---
+
+    def publish(self, event_type: str, data: dict, *, user_id: Optional[int] = None) -> None:
+        """
+        Send an event to the connections here and on every other worker;
+        with user_id, only to that user's connections.
+        Call it after db.commit() so clients never see uncommitted changes.
+        """
+        message = DefaultJSONResponse({"type": event_type, **data}).body.decode()
+        self._dispatch(message, user_id)
+
+        if self._sender is None:
+            return
+        target = "" if user_id is None else str(user_id)
+        if len(target) + len(message) + len(WORKER_ID) + 2 > MAX_NOTIFY_PAYLOAD:
+            # Too large for NOTIFY: clients on the other workers refetch instead
+            message = RESYNC_MESSAGE
+        try:
+            self._outbox.put_nowait((target, message))
+        except queue.Full:
+            if not self._outbox_overflowed:
+                logger.warning(f"⚠️ Live event outbox full; dropping {event_type} events for a resync")
+            self._outbox_overflowed = True
+
+    # --- cross-worker sender ---
+
+    def _next_batch(self) -> list[tuple[str, str]]:
+        """Wait up to a second for an event, then take everything queued behind it"""
+        try:
+            events = [self._outbox.get(timeout=1.0)]
+        except queue.Empty:
+            events = []
+        while True:
+            try:
+                events.append(self._outbox.get_nowait())
+            except queue.Empty:
+                break
+        if self._outbox_overflowed:
+            self._outbox_overflowed = False
+            # The dropped events may have been for anyone: everyone refetches
+            events = [("", RESYNC_MESSAGE)]
+        return events
+
+    @staticmethod
+    def _payloads(events: list[tuple[str, str]]) -> list[str]:
+        """
+        Pack events into NOTIFY payloads of at most MAX_NOTIFY_PAYLOAD
+        characters: the sender's WORKER_ID, then one "target|message" line
+        per event (encoded JSON never contains a raw newline).
+        """
+        payloads, lines, size = [], [], len(WORKER_ID)
+        for target, message in events:
+            line = f"{target}|{message}"
+            if lines and size + 1 + len(line) > MAX_NOTIFY_PAYLOAD:
+                payloads.append("\n".join((WORKER_ID, *lines)))
+                lines, size = [], len(WORKER_ID)
+            lines.append(line)
+            size += 1 + len(line)
+        if lines:
+            payloads.append("\n".join((WORKER_ID, *lines)))
+        return payloads
+
+    def _send(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = engine.raw_connection()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                cursor = driver_connection.cursor()
+                logger.info("📣 Sending live events")
+
+                while not self._stop.is_set():
+                    events = self._next_batch()
+                    if not events:
+                        continue
+                    try:
+                        cursor.execute(
+                            "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                            (NOTIFY_CHANNEL, self._payloads(events))
+                        )
+                    except Exception:
+                        # Lost with the connection: the other workers' clients refetch
+                        self._outbox_overflowed = True
+                        raise
+            except Exception as e:
+                logger.warning(f"⚠️ Live event sender error: {str(e)}")
+                self._stop.wait(LISTEN_RETRY_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.invalidate()
+                    except Exception:
+                        pass
+
+    # --- cross-worker listener ---
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = engine.raw_connection()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                cursor = driver_connection.cursor()
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Events may have been missed while we were not listening
+                self._dispatch(RESYNC_MESSAGE, None)
+                logger.info("👂 Listening for live events")
+
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([driver_connection], [], [], 1.0)
+                    if not readable:
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        notification = driver_connection.notifies.pop(0)
+                        sender, *lines = notification.payload.split("\n")
+                        if sender == WORKER_ID:
+                            continue
+                        for line in lines:
+                            target, _, message = line.partition("|")
+                            if message:
+                                self._dispatch(message, int(target) if target else None)
+            except Exception as e:
+                logger.warning(f"⚠️ Live event listener error: {str(e)}")
+                self._dispatch(RESYNC_MESSAGE, None)
+                self._stop.wait(LISTEN_RETRY_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.invalidate()
+                    except Exception:
+                        pass
+
+    def start_listener(self) -> None:
+        """Start the background LISTEN and NOTIFY threads (once per worker)"""
+        if self._listener is not None and self._listener.is_alive():
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name="live-event-listener", daemon=True)
+        self._listener.start()
+        self._sender = threading.Thread(target=self._send, name="live-event-sender", daemon=True)
+        self._sender.start()
+
+    def stop_listener(self) -> None:
+        self._stop.set()
+        for thread in (self._listener, self._sender):
+            if thread is not None:
+                thread.join(timeout=LISTEN_RETRY_SECONDS)
+        self._listener = None
+        self._sender = None
+
+
+# Global broker shared by the publishers and the /events WebSocket
+event_broker = EventBroker(max_queue=settings.live_event_queue_size)
@@ -91,28 +91,48 @@ class FinancialService:
 
     @staticmethod
     def recalculate_customer_due_balance(db: Session, customer_id: int) -> Decimal:
-        due_balance = (
-            db.query(func.coalesce(func.sum(Bill.due_amount), 0))
-            .filter(Bill.customer_id == customer_id, Bill.bill_type == BillType.sell, Bill.finalized_at.isnot(None))
-            .scalar()
+        """Refresh the customer's due balance and maintained bill counters, returning the due balance."""
+        db.flush()
+        row = (
+            db.query(
+                func.count(Bill.id).label("bills_count"),
+                func.coalesce(func.sum(Bill.total_amount), 0).label("total_billed"),
+                func.coalesce(func.sum(Bill.paid_amount), 0).label("total_paid"),
+                func.coalesce(func.sum(Bill.due_amount).filter(Bill.finalized_at.isnot(None)), 0).label("due_balance"),
+            )
+            .filter(Bill.customer_id == customer_id, Bill.bill_type == BillType.sell)
+            .one()
         )
-        value = FinancialService.money(due_balance)
+        value = FinancialService.money(row.due_balance)
         customer = db.query(Customer).filter(Customer.id == customer_id).first()
         if customer:
             customer.due_balance = value
+            customer.bills_count = int(row.bills_count or 0)
+            customer.total_billed = FinancialService.money(row.total_billed)
+            customer.total_paid = FinancialService.money(row.total_paid)
         return value
 
     @staticmethod
     def recalculate_supplier_payable_balance(db: Session, supplier_id: int) -> Decimal:
-        payable_balance = (
-            db.query(func.coalesce(func.sum(Bill.due_amount), 0))
-            .filter(Bill.supplier_id == supplier_id, Bill.bill_type == BillType.buy, Bill.finalized_at.isnot(None))
-            .scalar()
+        """Refresh the supplier's payable balance and maintained bill counters, returning the payable balance."""
+        db.flush()
+        row = (
+            db.query(
+                func.count(Bill.id).label("bills_count"),
+                func.coalesce(func.sum(Bill.total_amount), 0).label("total_purchased"),
+                func.coalesce(func.sum(Bill.paid_amount), 0).label("total_paid"),
+                func.coalesce(func.sum(Bill.due_amount).filter(Bill.finalized_at.isnot(None)), 0).label("payable_balance"),
+            )
+            .filter(Bill.supplier_id == supplier_id, Bill.bill_type == BillType.buy)
+            .one()
         )
-        value = FinancialService.money(payable_balance)
+        value = FinancialService.money(row.payable_balance)
         supplier = db.query(Supplier).filter(Supplier.id == supplier_id).first()
         if supplier:
             supplier.payable_balance = value
+            supplier.purchase_bills_count = int(row.bills_count or 0)
+            supplier.total_purchased = FinancialService.money(row.total_purchased)
+            supplier.total_paid = FinancialService.money(row.total_paid)
         return value
 
     @staticmethod
@@ -0,0 +1,227 @@
+"""
+Idempotency-Key handling for write endpoints that tills retry
+"""
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import hashlib
+import logging
+import threading
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+from app.responses import DefaultJSONResponse
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    status_code: Optional[int]
+    body: Optional[bytes]
+    expires_at: datetime
+
+
+class IdempotencyStore:
+    """
+    Stores the response of a keyed write so a retry gets it back verbatim.
+
+    `begin` runs before the write. It replays a stored response when there is
+    one. Otherwise it inserts the key row into the caller's session, so the row
+    commits or rolls back together with the write. A concurrent duplicate
+    blocks on the row's primary key until the first request finishes.
+    `complete` stores the response after the commit. Completed responses are
+    also kept in a per-process LRU, so most retries cost no query.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[int, str, str], StoredResponse] = OrderedDict()
+
+    @staticmethod
+    def request_hash(payload: BaseModel) -> str:
+        return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+    def _get(self, cache_key: tuple[int, str, str]) -> Optional[StoredResponse]:
+        with self._lock:
+            stored = self._entries.get(cache_key)
+            if stored is None:
+                return None
+            if stored.expires_at <= datetime.now(timezone.utc):
+                del self._entries[cache_key]
+                return None
+            self._entries.move_to_end(cache_key)
+            return stored
+
+    def _store(self, cache_key: tuple[int, str, str], stored: StoredResponse) -> None:
+        with self._lock:
+            self._entries[cache_key] = stored
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _replay(stored: StoredResponse, request_hash: str) -> Response:
+        if stored.request_hash != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request",
+            )
+        if stored.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A request with this {IDEMPOTENCY_KEY_HEADER} is still being processed",
+                headers={"Retry-After": "1"},
+            )
+        return Response(
+            content=stored.body,
+            status_code=stored.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    @staticmethod
+    def _load(db: Session, user_id: int, endpoint: str, key: str) -> Optional[StoredResponse]:
+        row = db.execute(
+            select(
+                IdempotencyKey.request_hash,
+                IdempotencyKey.status_code,
+                IdempotencyKey.response_body,
+                IdempotencyKey.expires_at,
+            ).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.endpoint == endpoint,
+                IdempotencyKey.key == key,
+            )
+        ).first()
+        return StoredResponse(*row) if row else None
+
+    def begin(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        endpoint: str,
+        key: Optional[str],
+        payload: BaseModel,
+    ) -> Optional[Response]:
+        """
+        Return the stored response for a repeated key, or claim the key in
+        `db` and return None so the caller performs the write.
+        Raises 409 while the first request is still running, and 422 when
+        the key was used with a different payload.
+        """
+        if key is None:
+            return None
+
+        request_hash = self.request_hash(payload)
+        cache_key = (user_id, endpoint, key)
+        stored = self._get(cache_key)
+        if stored is not None:
+            return self._replay(stored, request_hash)
+
+        now = datetime.now(timezone.utc)
+        stored = self._load(db, user_id, endpoint, key)
+        if stored is not None and stored.expires_at > now:
+            if stored.status_code is not None:
+                self._store(cache_key, stored)
+            return self._replay(stored, request_hash)
+        if stored is not None:
+            # Expired but not yet removed by the expiry job: reuse the key
+            db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.endpoint == endpoint,
+                    IdempotencyKey.key == key,
+                )
+            )
+
+        db.add(
+            IdempotencyKey(
+                user_id=user_id,
+                endpoint=endpoint,
+                key=key,
+                request_hash=request_hash,
+                expires_at=now + timedelta(hours=settings.idempotency_key_ttl_hours),
+            )
+        )
+        try:
+            db.flush()
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            db.rollback()
+            stored = self._load(db, user_id, endpoint, key)
+            if stored is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A request with this {IDEMPOTENCY_KEY_HEADER} is still being processed",
+                    headers={"Retry-After": "1"},
+                )
+            return self._replay(stored, request_hash)
+        return None
+
+    def complete(
+        self,
+        *,
+        user_id: int,
+        endpoint: str,
+        key: Optional[str],
+        status_code: int,
+        content: BaseModel,
+    ) -> None:
+        """Store the response of a committed keyed request (own short transaction)"""
+        if key is None:
+            return
+
+        body = DefaultJSONResponse(content.model_dump(mode="json", by_alias=True)).body
+        db = SessionLocal()
+        try:
+            row = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.endpoint == endpoint,
+                    IdempotencyKey.key == key,
+                )
+                .values(status_code=status_code, response_body=body)
+                .returning(IdempotencyKey.request_hash, IdempotencyKey.expires_at)
+            ).first()
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error storing response for {IDEMPOTENCY_KEY_HEADER} {key!r} on {endpoint}: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        if row is not None:
+            self._store((user_id, endpoint, key), StoredResponse(row.request_hash, status_code, body, row.expires_at))
+
+    @staticmethod
+    def delete_expired(db: Session, batch_size: int = 1000) -> int:
+        """Delete up to batch_size expired keys; returns how many were deleted"""
+        expired = (
+            select(IdempotencyKey.user_id, IdempotencyKey.endpoint, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+            .limit(batch_size)
+        )
+        result = db.execute(
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.endpoint, IdempotencyKey.key).in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+idempotency_store = IdempotencyStore(max_entries=settings.idempotency_cache_size)
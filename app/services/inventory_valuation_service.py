@@ -0,0 +1,182 @@
+from datetime import date
+import logging
+from typing import Iterable, Optional
+
+from sqlalchemy import Date, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.category import Category
+from app.models.category_stock_valuation import CategoryStockValuation
+from app.models.inventory_valuation_snapshot import InventoryValuationSnapshot
+from app.models.item import Item
+from app.schemas.inventory import CategoryValuation, InventoryValuationResponse, ValuationTotals
+from app.services.financial_service import FinancialService, ZERO
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryValuationService:
+    @staticmethod
+    def refresh_categories(db: Session, category_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Recompute category_stock_valuations for the given categories (all when None)
+        straight from items: quantity x buying_price / selling_price.
+
+        Rows carry the statement timestamp; an upsert never replaces a row
+        computed by a later statement, so concurrent refreshes cannot leave
+        an older total behind.
+        """
+        aggregate = (
+            select(
+                Category.id,
+                func.count(Item.id),
+                func.coalesce(func.sum(Item.quantity), 0),
+                func.coalesce(func.sum(Item.quantity * Item.buying_price), 0),
+                func.coalesce(func.sum(Item.quantity * Item.selling_price), 0),
+                func.statement_timestamp(),
+            )
+            .select_from(Category)
+            .outerjoin(Item, Item.category_id == Category.id)
+            .group_by(Category.id)
+        )
+        if category_ids is not None:
+            category_ids = set(category_ids)
+            if not category_ids:
+                return
+            aggregate = aggregate.where(Category.id.in_(category_ids))
+
+        stmt = insert(CategoryStockValuation).from_select(
+            ["category_id", "item_count", "total_quantity", "value_at_cost", "value_at_price", "refreshed_at"],
+            aggregate,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CategoryStockValuation.category_id],
+            set_={
+                "item_count": stmt.excluded.item_count,
+                "total_quantity": stmt.excluded.total_quantity,
+                "value_at_cost": stmt.excluded.value_at_cost,
+                "value_at_price": stmt.excluded.value_at_price,
+                "refreshed_at": stmt.excluded.refreshed_at,
+            },
+            where=CategoryStockValuation.refreshed_at <= stmt.excluded.refreshed_at,
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def refresh_after_commit(category_ids: Iterable[int]) -> None:
+        """
+        Refresh the given categories in a short transaction of their own.
+        Called by the write paths after their commit so the stock locks they
+        hold are not extended; failures are logged and fixed by the nightly run.
+        """
+        category_ids = set(category_ids)
+        if not category_ids:
+            return
+        db = SessionLocal()
+        try:
+            InventoryValuationService.refresh_categories(db, category_ids)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error refreshing stock valuation for categories {sorted(category_ids)}: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _response(rows, snapshot_date: Optional[date] = None, as_of=None) -> InventoryValuationResponse:
+        categories = [
+            CategoryValuation(
+                category_id=row.category_id,
+                category_name=row.category_name,
+                item_count=row.item_count,
+                total_quantity=row.total_quantity,
+                value_at_cost=FinancialService.money(row.value_at_cost),
+                value_at_price=FinancialService.money(row.value_at_price),
+            )
+            for row in rows
+        ]
+        totals = ValuationTotals(
+            item_count=sum(category.item_count for category in categories),
+            total_quantity=sum(category.total_quantity for category in categories),
+            value_at_cost=FinancialService.money(sum((category.value_at_cost for category in categories), ZERO)),
+            value_at_price=FinancialService.money(sum((category.value_at_price for category in categories), ZERO)),
+        )
+        return InventoryValuationResponse(
+            snapshot_date=snapshot_date,
+            as_of=as_of,
+            categories=categories,
+            totals=totals,
+        )
+
+    @staticmethod
+    def get_valuation(db: Session) -> InventoryValuationResponse:
+        """Current per-category and overall stock value, read from the maintained table"""
+        rows = db.execute(
+            select(
+                CategoryStockValuation.category_id,
+                Category.name.label("category_name"),
+                CategoryStockValuation.item_count,
+                CategoryStockValuation.total_quantity,
+                CategoryStockValuation.value_at_cost,
+                CategoryStockValuation.value_at_price,
+                CategoryStockValuation.refreshed_at,
+            )
+            .join(Category, Category.id == CategoryStockValuation.category_id)
+            .order_by(Category.name.asc())
+        ).all()
+        as_of = max((row.refreshed_at for row in rows), default=None)
+        return InventoryValuationService._response(rows, as_of=as_of)
+
+    @staticmethod
+    def get_snapshot(db: Session, snapshot_date: date) -> Optional[InventoryValuationResponse]:
+        """Valuation as written by the nightly snapshot for one date, or None"""
+        rows = db.execute(
+            select(InventoryValuationSnapshot)
+            .where(InventoryValuationSnapshot.snapshot_date == snapshot_date)
+            .order_by(InventoryValuationSnapshot.category_name.asc())
+        ).scalars().all()
+        if not rows:
+            return None
+        as_of = max(row.created_at for row in rows)
+        return InventoryValuationService._response(rows, snapshot_date=snapshot_date, as_of=as_of)
+
+    @staticmethod
+    def write_snapshot(db: Session, snapshot_date: date) -> int:
+        """
+        Fully refresh the live table, then copy it into the snapshot table
+        for snapshot_date (replacing an earlier snapshot of the same day).
+        Returns the number of category rows written.
+        """
+        InventoryValuationService.refresh_categories(db)
+
+        source = (
+            select(
+                literal(snapshot_date, Date).label("snapshot_date"),
+                CategoryStockValuation.category_id,
+                Category.name,
+                CategoryStockValuation.item_count,
+                CategoryStockValuation.total_quantity,
+                CategoryStockValuation.value_at_cost,
+                CategoryStockValuation.value_at_price,
+            )
+            .join(Category, Category.id == CategoryStockValuation.category_id)
+        )
+        stmt = insert(InventoryValuationSnapshot).from_select(
+            ["snapshot_date", "category_id", "category_name", "item_count", "total_quantity", "value_at_cost", "value_at_price"],
+            source,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InventoryValuationSnapshot.snapshot_date, InventoryValuationSnapshot.category_id],
+            set_={
+                "category_name": stmt.excluded.category_name,
+                "item_count": stmt.excluded.item_count,
+                "total_quantity": stmt.excluded.total_quantity,
+                "value_at_cost": stmt.excluded.value_at_cost,
+                "value_at_price": stmt.excluded.value_at_price,
+                "created_at": func.now(),
+            },
+        )
+        result = db.execute(stmt)
+        return result.rowcount
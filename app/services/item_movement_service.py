@@ -0,0 +1,156 @@
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, cast, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.bill import Bill
+from app.models.inventory import InventoryTransaction
+from app.models.item_movement_daily import ItemMovementDaily
+from app.schemas.item import ItemMovement, ItemMovementBucket
+from app.services.financial_service import FinancialService, ZERO
+from app.services.pagination import Pagination
+
+
+class ItemMovementService:
+    @staticmethod
+    def record_daily(db: Session, transactions: Iterable[InventoryTransaction]) -> None:
+        """
+        Fold new inventory transactions into item_movement_daily, one upsert
+        per bill. Runs in the caller's transaction so the roll-up always
+        matches the committed transactions. The (item, day) rows are shared
+        by every bill of that day, so call it last, right before the commit,
+        after the stock rows are locked; rows are upserted in item id order
+        like the stock rows, so two bills cannot deadlock on them.
+        """
+        totals: dict[int, dict] = defaultdict(
+            lambda: {"quantity_in": 0, "quantity_out": 0, "value_in": ZERO, "value_out": ZERO, "transactions": 0}
+        )
+        for transaction in transactions:
+            row = totals[transaction.item_id]
+            direction = "in" if transaction.transaction_type == "buy" else "out"
+            row[f"quantity_{direction}"] += transaction.quantity
+            row[f"value_{direction}"] += FinancialService.money(transaction.price * transaction.quantity)
+            row["transactions"] += 1
+
+        if not totals:
+            return
+
+        stmt = insert(ItemMovementDaily).values([
+            # current_date matches created_at::date of the transactions written in this transaction
+            {"item_id": item_id, "movement_date": func.current_date(), **row}
+            for item_id, row in sorted(totals.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ItemMovementDaily.item_id, ItemMovementDaily.movement_date],
+            set_={
+                "quantity_in": ItemMovementDaily.quantity_in + stmt.excluded.quantity_in,
+                "quantity_out": ItemMovementDaily.quantity_out + stmt.excluded.quantity_out,
+                "value_in": ItemMovementDaily.value_in + stmt.excluded.value_in,
+                "value_out": ItemMovementDaily.value_out + stmt.excluded.value_out,
+                "transactions": ItemMovementDaily.transactions + stmt.excluded.transactions,
+            },
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def page_cursor(movement: ItemMovement) -> str:
+        """Keyset cursor pointing just after the given movement."""
+        return Pagination.encode_cursor(movement.created_at.isoformat(), movement.id)
+
+    @staticmethod
+    def list_movements(
+        db: Session,
+        item_id: int,
+        *,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> list[ItemMovement]:
+        """Movements of one item, newest first, keyset-paginated on (created_at, id)"""
+        movement_query = (
+            db.query(
+                InventoryTransaction.id,
+                InventoryTransaction.bill_id,
+                Bill.bill_code,
+                InventoryTransaction.transaction_type,
+                InventoryTransaction.quantity,
+                InventoryTransaction.price,
+                InventoryTransaction.created_at,
+            )
+            .join(Bill, Bill.id == InventoryTransaction.bill_id)
+            .filter(InventoryTransaction.item_id == item_id)
+        )
+        if cursor:
+            before_created_at, before_id = Pagination.decode_cursor(cursor, (str, int))
+            try:
+                before_created_at = datetime.fromisoformat(before_created_at)
+            except ValueError as exc:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+            movement_query = movement_query.filter(
+                tuple_(InventoryTransaction.created_at, InventoryTransaction.id) < tuple_(before_created_at, before_id)
+            )
+
+        rows = (
+            movement_query
+            .order_by(InventoryTransaction.created_at.desc(), InventoryTransaction.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [ItemMovement.model_validate(row._asdict()) for row in rows]
+
+    @staticmethod
+    def _average(value: Decimal, quantity: int) -> Optional[Decimal]:
+        return FinancialService.money(value / quantity) if quantity else None
+
+    @staticmethod
+    def bucketed(
+        db: Session,
+        item_id: int,
+        *,
+        bucket: str,
+        date_from: date,
+        date_to: date,
+    ) -> list[ItemMovementBucket]:
+        """
+        Net in/out and average prices per day, week (Monday start) or month,
+        aggregated from the daily roll-up with date_trunc + GROUP BY.
+        """
+        if bucket == "day":
+            bucket_start = ItemMovementDaily.movement_date
+        else:
+            bucket_start = cast(func.date_trunc(literal(bucket), ItemMovementDaily.movement_date), Date)
+
+        rows = db.execute(
+            select(
+                bucket_start.label("bucket_start"),
+                func.sum(ItemMovementDaily.quantity_in).label("quantity_in"),
+                func.sum(ItemMovementDaily.quantity_out).label("quantity_out"),
+                func.sum(ItemMovementDaily.value_in).label("value_in"),
+                func.sum(ItemMovementDaily.value_out).label("value_out"),
+                func.sum(ItemMovementDaily.transactions).label("transactions"),
+            )
+            .where(
+                ItemMovementDaily.item_id == item_id,
+                ItemMovementDaily.movement_date >= date_from,
+                ItemMovementDaily.movement_date <= date_to,
+            )
+            .group_by(bucket_start)
+            .order_by(bucket_start.asc())
+        ).all()
+
+        return [
+            ItemMovementBucket(
+                bucket_start=row.bucket_start,
+                quantity_in=row.quantity_in,
+                quantity_out=row.quantity_out,
+                net_quantity=row.quantity_in - row.quantity_out,
+                average_buy_price=ItemMovementService._average(row.value_in, row.quantity_in),
+                average_sell_price=ItemMovementService._average(row.value_out, row.quantity_out),
+                transactions=row.transactions,
+            )
+            for row in rows
+        ]
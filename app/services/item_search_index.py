@@ -0,0 +1,248 @@
+"""
+In-memory prefix index for item typeahead search
+"""
+from bisect import bisect_left, insort
+from decimal import Decimal
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.item import Item
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[\w\-]+")
+
+# Match kinds, best first
+RANK_NAME = 0
+RANK_MODEL_NUMBER = 1
+RANK_NAME_WORD = 2
+RANK_DESCRIPTION = 3
+RANKS = (RANK_NAME, RANK_MODEL_NUMBER, RANK_NAME_WORD, RANK_DESCRIPTION)
+
+# (prefix key, lowercased name, item id): sorted, entries sharing a key are in name order
+Entry = tuple[str, str, int]
+
+
+class ItemSearchIndex:
+    """
+    One sorted array of (prefix key, name, item id) entries per match kind,
+    searched with bisect from the best kind down; the scan stops as soon as
+    the limit is filled, so short prefixes cost no more than long ones.
+    Built once at startup and kept fresh by the item write endpoints.
+    Each worker holds its own copy; once it is older than max_age_seconds it
+    is rebuilt from the database so changes made on other workers show up.
+    That rebuild runs on one background thread at a time while searches keep
+    using the current index; writes made during it are replayed onto the result.
+    """
+
+    def __init__(self, max_age_seconds: int = 300):
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._entries: list[list[Entry]] = [[] for _ in RANKS]
+        self._items: dict[int, dict] = {}
+        self._item_keys: dict[int, list[tuple[int, Entry]]] = {}
+        self._built_at: float | None = None
+        self._rebuilding = False
+        # Item id -> (summary, keys), or None when removed, for writes made while a rebuild runs
+        self._pending: dict[int, tuple[dict, list[tuple[int, Entry]]] | None] | None = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    @property
+    def is_stale(self) -> bool:
+        return self._built_at is None or time.monotonic() - self._built_at >= self.max_age_seconds
+
+    @staticmethod
+    def _summary(item: Item) -> dict:
+        return {
+            "id": item.id,
+            "name": item.name,
+            "model_number": item.model_number,
+            "selling_price": Decimal(item.selling_price),
+            "category_id": item.category_id,
+        }
+
+    @staticmethod
+    def _keys(item: Item) -> list[tuple[int, Entry]]:
+        name = item.name.lower()
+        keys = {(RANK_NAME, name), (RANK_MODEL_NUMBER, item.model_number.lower())}
+        for token in TOKEN_PATTERN.findall(name):
+            keys.add((RANK_NAME_WORD, token))
+        for token in TOKEN_PATTERN.findall((item.description or "").lower()):
+            keys.add((RANK_DESCRIPTION, token))
+        return sorted((rank, (key, name, item.id)) for rank, key in keys)
+
+    def rebuild(self, db: Session) -> None:
+        """Load every item from the database and rebuild the index"""
+        started = time.perf_counter()
+        with self._lock:
+            self._pending = {}
+        try:
+            items = db.query(Item).all()
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        entries: list[list[Entry]] = [[] for _ in RANKS]
+        summaries: dict[int, dict] = {}
+        item_keys: dict[int, list[tuple[int, Entry]]] = {}
+        for item in items:
+            keys = self._keys(item)
+            for rank, entry in keys:
+                entries[rank].append(entry)
+            summaries[item.id] = self._summary(item)
+            item_keys[item.id] = keys
+        for rank_entries in entries:
+            rank_entries.sort()
+
+        with self._lock:
+            self._entries = entries
+            self._items = summaries
+            self._item_keys = item_keys
+            pending, self._pending = self._pending or {}, None
+            for item_id, change in pending.items():
+                self._remove_locked(item_id)
+                if change is not None:
+                    self._add_locked(item_id, *change)
+            self._built_at = time.monotonic()
+
+        logger.info(f"🔎 Item search index built: {len(summaries)} items in {time.perf_counter() - started:.3f}s")
+
+    def _remove_locked(self, item_id: int) -> None:
+        for rank, entry in self._item_keys.pop(item_id, []):
+            rank_entries = self._entries[rank]
+            position = bisect_left(rank_entries, entry)
+            if position < len(rank_entries) and rank_entries[position] == entry:
+                del rank_entries[position]
+        self._items.pop(item_id, None)
+
+    def _add_locked(self, item_id: int, summary: dict, keys: list[tuple[int, Entry]]) -> None:
+        for rank, entry in keys:
+            insort(self._entries[rank], entry)
+        self._items[item_id] = summary
+        self._item_keys[item_id] = keys
+
+    def upsert(self, item: Item) -> None:
+        """Add or refresh one item after it was created or updated"""
+        summary, keys = self._summary(item), self._keys(item)
+        with self._lock:
+            if self._pending is not None:
+                self._pending[item.id] = (summary, keys)
+            if self._built_at is None:
+                return
+            self._remove_locked(item.id)
+            self._add_locked(item.id, summary, keys)
+
+    def remove(self, item_id: int) -> None:
+        """Drop one item after it was deleted"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending[item_id] = None
+            if self._built_at is None:
+                return
+            self._remove_locked(item_id)
+
+    def invalidate(self) -> None:
+        """Stop serving the index; searches use the database until it is rebuilt"""
+        with self._lock:
+            self._built_at = None
+
+    def _rebuild_in_background(self) -> None:
+        db = SessionLocal()
+        try:
+            self.rebuild(db)
+        except Exception as e:
+            logger.error(f"❌ Error rebuilding item search index: {str(e)}")
+        finally:
+            db.close()
+            with self._lock:
+                self._rebuilding = False
+
+    def refresh_in_background(self) -> None:
+        """Start a rebuild on a background thread unless one is already running"""
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name="item-search-index-rebuild", daemon=True).start()
+
+    def search(self, query: str, limit: int) -> list[dict]:
+        """
+        Return up to `limit` items whose name, model number or description words
+        start with query: name matches first, then model number, name word and
+        description matches, each group by matched key and then name
+        """
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+
+        found: list[dict] = []
+        seen: set[int] = set()
+        with self._lock:
+            for rank in RANKS:
+                rank_entries = self._entries[rank]
+                position = bisect_left(rank_entries, (prefix,))
+                while len(found) < limit and position < len(rank_entries):
+                    key, _, item_id = rank_entries[position]
+                    if not key.startswith(prefix):
+                        break
+                    if item_id not in seen:
+                        seen.add(item_id)
+                        found.append(self._items[item_id])
+                    position += 1
+                if len(found) >= limit:
+                    break
+        return found
+
+    @staticmethod
+    def search_database(db: Session, query: str, limit: int) -> list[dict]:
+        """
+        Fallback search straight against the items table, ranked like the index.
+        The '%q%' conditions are served by the gin_trgm_ops indexes on name,
+        model number and description and narrow the rows the prefix checks run on.
+        """
+        prefix = query.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        if not prefix:
+            return []
+
+        contains = f"%{prefix}%"
+        rank = case(
+            (Item.name.ilike(f"{prefix}%", escape="\\"), RANK_NAME),
+            (Item.model_number.ilike(f"{prefix}%", escape="\\"), RANK_MODEL_NUMBER),
+            (Item.name.ilike(f"% {prefix}%", escape="\\"), RANK_NAME_WORD),
+            else_=RANK_DESCRIPTION,
+        )
+        items = (
+            db.query(Item)
+            .filter(
+                or_(
+                    Item.name.ilike(contains, escape="\\"),
+                    Item.model_number.ilike(contains, escape="\\"),
+                    Item.description.ilike(contains, escape="\\"),
+                ),
+                or_(
+                    Item.name.ilike(f"{prefix}%", escape="\\"),
+                    Item.name.ilike(f"% {prefix}%", escape="\\"),
+                    Item.model_number.ilike(f"{prefix}%", escape="\\"),
+                    Item.description.ilike(f"{prefix}%", escape="\\"),
+                    Item.description.ilike(f"% {prefix}%", escape="\\"),
+                ),
+            )
+            .order_by(rank, func.lower(Item.name))
+            .limit(limit)
+            .all()
+        )
+        return [ItemSearchIndex._summary(item) for item in items]
+
+
+# Global index shared by the item router
+item_search_index = ItemSearchIndex()
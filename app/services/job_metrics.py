@@ -0,0 +1,106 @@
+"""
+In-process metrics for scheduled jobs
+"""
+from datetime import datetime
+import threading
+
+
+# Upper bounds (seconds) of the job duration histogram buckets
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 15, 60, 300, 900)
+
+# Per-run counters a job may report; totals are kept for each of them
+RUN_COUNTERS = ("items_scanned", "rows_affected", "emails_sent", "emails_failed")
+
+
+class JobMetrics:
+    """Thread-safe run counters, duration histograms and queue lag per job"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: dict[str, dict] = {}
+
+    def _job(self, job_id: str) -> dict:
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = {
+                "runs": {"success": 0, "failed": 0, "skipped": 0},
+                "missed": 0,
+                "duration_buckets": [0] * (len(DURATION_BUCKETS) + 1),
+                "duration_sum_seconds": 0.0,
+                "totals": {counter: 0 for counter in RUN_COUNTERS},
+                "last_queue_lag_seconds": None,
+                "max_queue_lag_seconds": 0.0,
+                "last_run": None,
+            }
+            self._jobs[job_id] = job
+        return job
+
+    def record_run(
+        self,
+        job_id: str,
+        status: str,
+        started_at: datetime,
+        duration_seconds: float,
+        stats: dict | None = None
+    ) -> None:
+        """Record a finished run (status: success, failed or skipped)"""
+        stats = stats or {}
+        with self._lock:
+            job = self._job(job_id)
+            job["runs"][status] += 1
+            job["duration_sum_seconds"] += duration_seconds
+
+            bucket = len(DURATION_BUCKETS)
+            for index, upper_bound in enumerate(DURATION_BUCKETS):
+                if duration_seconds <= upper_bound:
+                    bucket = index
+                    break
+            job["duration_buckets"][bucket] += 1
+
+            for counter in RUN_COUNTERS:
+                job["totals"][counter] += int(stats.get(counter, 0) or 0)
+
+            job["last_run"] = {
+                "status": status,
+                "started_at": started_at,
+                "duration_seconds": duration_seconds,
+                "stats": dict(stats),
+            }
+
+    def record_queue_lag(self, job_id: str, lag_seconds: float) -> None:
+        """Record the delay between a run's scheduled time and its actual start"""
+        lag_seconds = max(lag_seconds, 0.0)
+        with self._lock:
+            job = self._job(job_id)
+            job["last_queue_lag_seconds"] = lag_seconds
+            job["max_queue_lag_seconds"] = max(job["max_queue_lag_seconds"], lag_seconds)
+
+    def record_missed(self, job_id: str) -> None:
+        """Record a run that APScheduler dropped because it was too late"""
+        with self._lock:
+            self._job(job_id)["missed"] += 1
+
+    def job_ids(self) -> list[str]:
+        """Ids of the jobs that have recorded anything, in name order"""
+        with self._lock:
+            return sorted(self._jobs)
+
+    def snapshot(self, job_id: str) -> dict:
+        """Return a copy of one job's metrics, with a labelled duration histogram"""
+        with self._lock:
+            job = self._job(job_id)
+            labels = [f"le_{upper_bound}" for upper_bound in DURATION_BUCKETS] + ["le_inf"]
+            return {
+                "runs": dict(job["runs"]),
+                "missed": job["missed"],
+                "duration_histogram": dict(zip(labels, job["duration_buckets"])),
+                "duration_sum_seconds": job["duration_sum_seconds"],
+                "totals": dict(job["totals"]),
+                "last_queue_lag_seconds": job["last_queue_lag_seconds"],
+                "max_queue_lag_seconds": job["max_queue_lag_seconds"],
+                "last_run": dict(job["last_run"]) if job["last_run"] else None,
+            }
+
+
+# Global metrics registry shared by the scheduler and the admin endpoints
+job_metrics = JobMetrics()
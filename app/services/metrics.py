@@ -0,0 +1,299 @@
+"""
+In-process metrics in the Prometheus text exposition format
+"""
+from bisect import bisect_left
+from functools import wraps
+import threading
+import time
+from typing import Callable, Iterable
+
+from app.database import engine
+from app.services.job_metrics import DURATION_BUCKETS as JOB_DURATION_BUCKETS, job_metrics
+from app.services.query_stats import current_stats
+
+# Upper bounds (seconds) of the request and operation latency buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _ShardedMetric:
+    """
+    Values are kept in one dict per thread, so recording never takes a lock
+    and no update is lost between threads: each thread only writes its own
+    shard. A scrape copies every shard (dict.copy is atomic under the GIL)
+    and adds them up. Shards of finished threads are kept, so totals never
+    go backwards.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshot(self) -> list[dict]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [shard.copy() for shard in shards]
+
+
+class Counter(_ShardedMetric):
+    """Monotonic total, e.g. requests or failures"""
+
+    kind = "counter"
+
+    def inc(self, *labelvalues, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labelvalues] = shard.get(labelvalues, 0) + amount
+
+    def collect(self) -> list[str]:
+        totals: dict[tuple, float] = {}
+        for shard in self._snapshot():
+            for labelvalues, value in shard.items():
+                totals[labelvalues] = totals.get(labelvalues, 0) + value
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+            for labelvalues, value in sorted(totals.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight"""
+
+    kind = "gauge"
+
+    def dec(self, *labelvalues, amount: float = 1) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+
+class Histogram(_ShardedMetric):
+    """Observation counts per bucket plus their sum and count, e.g. latencies"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labelvalues) -> None:
+        shard = self._shard()
+        # [count per bucket ..., count above the last bucket, sum]
+        values = shard.get(labelvalues)
+        if values is None:
+            values = shard[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def collect(self) -> list[str]:
+        totals: dict[tuple, list] = {}
+        for shard in self._snapshot():
+            for labelvalues, values in shard.items():
+                total = totals.setdefault(labelvalues, [0] * len(values[:-1]) + [0.0])
+                for index, value in enumerate(list(values)):
+                    total[index] += value
+        lines = []
+        for labelvalues, values in sorted(totals.items()):
+            lines.extend(_histogram_lines(self.name, self.labelnames, labelvalues, self.buckets, values[:-1], values[-1]))
+        return lines
+
+
+def _histogram_lines(name, labelnames, labelvalues, buckets, counts, total_sum) -> list[str]:
+    """Cumulative _bucket lines plus _sum and _count for one label set"""
+    lines = []
+    cumulative = 0
+    for upper_bound, count in zip((*buckets, float("inf")), counts):
+        cumulative += count
+        le = f'le="{_format_value(upper_bound)}"'
+        lines.append(f"{name}_bucket{_format_labels(labelnames, labelvalues, le)} {cumulative}")
+    lines.append(f"{name}_sum{_format_labels(labelnames, labelvalues)} {_format_value(float(total_sum))}")
+    lines.append(f"{name}_count{_format_labels(labelnames, labelvalues)} {cumulative}")
+    return lines
+
+
+class MetricsRegistry:
+    """Metrics plus collector callbacks that read values kept elsewhere at scrape time"""
+
+    def __init__(self):
+        self._metrics: list[_ShardedMetric] = []
+        # callback() -> list of (name, kind, documentation, lines)
+        self._collectors: list[Callable[[], list[tuple[str, str, str, list[str]]]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families = [(metric.name, metric.kind, metric.documentation, metric.collect()) for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# --- HTTP ---
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests being handled"
+))
+db_queries = registry.register(Counter(
+    "db_queries_total", "SQL statements run by HTTP requests", ("method", "route")
+))
+db_query_seconds = registry.register(Counter(
+    "db_query_seconds_total", "Time HTTP requests spent in SQL statements", ("method", "route")
+))
+
+# --- business operations ---
+bills_created = registry.register(Counter(
+    "bills_created_total", "Bills created", ("bill_type",)
+))
+bill_create_duration = registry.register(Histogram(
+    "bill_create_duration_seconds", "Time to create and commit a bill", ("bill_type",)
+))
+payment_allocation_duration = registry.register(Histogram(
+    "payment_allocation_duration_seconds", "Time to allocate and commit a payment", ("target",)
+))
+notification_duration = registry.register(Histogram(
+    "notification_send_duration_seconds", "Notification send latency", ("channel",),
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+))
+notifications_failed = registry.register(Counter(
+    "notifications_failed_total", "Notifications that could not be sent", ("channel",)
+))
+
+
+
+def _collect_db_pool() -> list[tuple[str, str, str, list[str]]]:
+    pool = engine.pool
+    return [
+        (name, "gauge", documentation, [f"{name} {read()}"])
+        for name, documentation, read in (
+            ("db_pool_size", "Connections the pool keeps open", pool.size),
+            ("db_pool_checked_out", "Pool connections in use", pool.checkedout),
+            ("db_pool_checked_in", "Idle pool connections", pool.checkedin),
+            # QueuePool counts overflow up from -size
+            ("db_pool_overflow", "Connections open beyond the pool size", lambda: max(pool.overflow(), 0)),
+        )
+    ]
+
+
+def _collect_scheduler_jobs() -> list[tuple[str, str, str, list[str]]]:
+    runs, missed, durations = [], [], []
+    for job_id in job_metrics.job_ids():
+        job = job_metrics.snapshot(job_id)
+        for status, count in job["runs"].items():
+            runs.append(f"scheduler_job_runs_total{_format_labels(('job', 'status'), (job_id, status))} {count}")
+        missed.append(f"scheduler_job_missed_total{_format_labels(('job',), (job_id,))} {job['missed']}")
+        durations.extend(_histogram_lines(
+            "scheduler_job_duration_seconds", ("job",), (job_id,), JOB_DURATION_BUCKETS,
+            list(job["duration_histogram"].values()), job["duration_sum_seconds"],
+        ))
+    return [
+        ("scheduler_job_runs_total", "counter", "Scheduled job runs by outcome", runs),
+        ("scheduler_job_missed_total", "counter", "Scheduled runs dropped for starting too late", missed),
+        ("scheduler_job_duration_seconds", "histogram", "Scheduled job run time", durations),
+    ]
+
+
+registry.register_collector(_collect_db_pool)
+registry.register_collector(_collect_scheduler_jobs)
+
+
+def track_notification(channel: str):
+    """Decorator for send functions returning True on success: latency and failures per channel"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            sent = False
+            try:
+                sent = func(*args, **kwargs)
+                return sent
+            finally:
+                notification_duration.observe(time.perf_counter() - started, channel)
+                if not sent:
+                    notifications_failed.inc(channel)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and query counts per route
+    template (/items/{id}, not /items/42, so label sets stay bounded).
+    Must run inside QueryStatsMiddleware to see the request's query stats.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            method, path = scope["method"], route.path if route is not None else "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, method, path)
+            http_requests.inc(method, path, status_code)
+            stats = current_stats()
+            if stats is not None and stats.count:
+                db_queries.inc(method, path, amount=stats.count)
+                db_query_seconds.inc(method, path, amount=stats.duration_seconds)
@@ -3,6 +3,7 @@ Service for generating unique model numbers and QR codes
 """
 import json
 import os
+import orjson
 import re
 import qrcode
 from datetime import datetime
@@ -145,8 +146,8 @@ class ModelNumberService:
             return normalized_value, "plain_model_number"
 
         try:
-            payload = json.loads(normalized_value)
-        except json.JSONDecodeError as exc:
+            payload = orjson.loads(normalized_value)
+        except orjson.JSONDecodeError as exc:
             raise ValueError("Unsupported QR code format") from exc
 
         if not isinstance(payload, dict):
@@ -10,6 +10,7 @@ from typing import List, Optional
 import requests
 import logging
 from dotenv import load_dotenv
+from app.services.metrics import track_notification
 
 # Force reload environment variables
 load_dotenv(override=True)
@@ -38,6 +39,7 @@ class NotificationService:
     """Service to handle email and WhatsApp notifications"""
     
     @staticmethod
+    @track_notification("email")
     def send_email(
         recipient_email: str,
         subject: str,
@@ -148,6 +150,7 @@ class NotificationService:
             return False
     
     @staticmethod
+    @track_notification("whatsapp")
     def send_whatsapp(
         phone_number: str,
         message_text: str,
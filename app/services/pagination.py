@@ -0,0 +1,27 @@
+import base64
+import json
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+class Pagination:
+    """Opaque keyset cursors: the sort key of the last row of a page, base64url-encoded JSON."""
+
+    @staticmethod
+    def encode_cursor(*values: Any) -> str:
+        raw = json.dumps(list(values), separators=(",", ":"), default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, types: tuple[type, ...]) -> list[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+        if not isinstance(values, list) or len(values) != len(types):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        if not all(isinstance(value, expected) for value, expected in zip(values, types)):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        return values
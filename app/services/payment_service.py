@@ -1,5 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
+import time
 
 from fastapi import HTTPException, status
 from sqlalchemy import and_
@@ -24,7 +25,9 @@ from app.schemas.payment import (
     CustomerLedgerResponse,
 )
 from app.services.customer_service import CustomerService
+from app.services.event_broker import PAYMENT, event_broker
 from app.services.financial_service import FinancialService, ZERO
+from app.services.metrics import payment_allocation_duration
 from app.services.supplier_service import SupplierService
 
 
@@ -183,8 +186,27 @@ class PaymentService:
 
         return created_payments
 
+    @staticmethod
+    def _publish_payments(payments: list[Payment]) -> None:
+        """Push committed (and refreshed) payments to the live connections"""
+        event_broker.publish(PAYMENT, {
+            "payments": [
+                {
+                    "payment_id": payment.id,
+                    "bill_id": payment.bill_id,
+                    "customer_id": payment.customer_id,
+                    "supplier_id": payment.supplier_id,
+                    "payment_type": payment.payment_type.value,
+                    "amount": payment.amount,
+                }
+                for payment in payments
+            ],
+            "total_amount": FinancialService.sum_payments(payments),
+        })
+
     @staticmethod
     def record_customer_payment(db: Session, payload: CustomerDuePaymentCreate, current_user: User) -> PaymentCreateResult:
+        started = time.perf_counter()
         customer = CustomerService.get_customer(db, payload.customer_id)
 
         if payload.bill_id is not None:
@@ -210,6 +232,8 @@ class PaymentService:
         db.commit()
         for payment in payments:
             db.refresh(payment)
+        payment_allocation_duration.observe(time.perf_counter() - started, "customer")
+        PaymentService._publish_payments(payments)
         return PaymentCreateResult(
             payments=payments,
             total_allocated_amount=FinancialService.sum_payments(payments),
@@ -217,6 +241,7 @@ class PaymentService:
 
     @staticmethod
     def record_supplier_payment(db: Session, payload: SupplierPayablePaymentCreate, current_user: User) -> PaymentCreateResult:
+        started = time.perf_counter()
         supplier = SupplierService.get_supplier(db, payload.supplier_id)
 
         if payload.bill_id is not None:
@@ -242,6 +267,8 @@ class PaymentService:
         db.commit()
         for payment in payments:
             db.refresh(payment)
+        payment_allocation_duration.observe(time.perf_counter() - started, "supplier")
+        PaymentService._publish_payments(payments)
         return PaymentCreateResult(
             payments=payments,
             total_allocated_amount=FinancialService.sum_payments(payments),
@@ -249,6 +276,7 @@ class PaymentService:
 
     @staticmethod
     def add_bill_payment(db: Session, bill_id: int, payload: PaymentCreate, current_user: User) -> PaymentCreateResult:
+        started = time.perf_counter()
         bill = PaymentService._get_bill_for_payment(db, bill_id)
         FinancialService.apply_payment_to_bill(bill=bill, amount=payload.amount)
         payment = PaymentService._base_payment_record(
@@ -270,6 +298,8 @@ class PaymentService:
 
         db.commit()
         db.refresh(payment)
+        payment_allocation_duration.observe(time.perf_counter() - started, "bill")
+        PaymentService._publish_payments([payment])
         return PaymentCreateResult(payments=[payment], total_allocated_amount=FinancialService.money(payment.amount))
 
     @staticmethod
@@ -492,7 +522,12 @@ class PaymentService:
 
     @staticmethod
     def dashboard_due_summary(db: Session) -> DueDashboardSummaryResponse:
-        finalized_bills = db.query(Bill).filter(Bill.finalized_at.isnot(None)).all()
+        finalized_bills = (
+            db.query(Bill)
+            .options(joinedload(Bill.customer), joinedload(Bill.supplier))
+            .filter(Bill.finalized_at.isnot(None))
+            .all()
+        )
         recent_payments = db.query(Payment).order_by(Payment.paid_at.desc(), Payment.id.desc()).limit(10).all()
 
         customer_due_map: dict[int, tuple[Customer, Decimal, int]] = {}
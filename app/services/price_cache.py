@@ -0,0 +1,109 @@
+"""
+Cache of item prices and per-location stock for pricing carts
+"""
+from collections import OrderedDict
+from decimal import Decimal
+import logging
+import threading
+from typing import NamedTuple
+
+from sqlalchemy.orm import Session
+
+from app.models.item import Item
+from app.models.stock_level import StockLevel
+from app.services.reference_cache import ITEMS, STOCK, reference_cache
+
+logger = logging.getLogger(__name__)
+
+
+class PriceEntry(NamedTuple):
+    item_id: int
+    model_number: str
+    name: str
+    buying_price: Decimal
+    selling_price: Decimal
+    # location id -> quantity on hand
+    stock: dict[int, int]
+
+
+class PriceCache:
+    """
+    LRU map of model number -> prices and stock per location.
+
+    Read with plain SELECTs (never FOR UPDATE), so quoting a cart never
+    waits on or blocks a bill being written. Entries are dropped through
+    the reference cache invalidations that bills and item writes already
+    send, the same way as the scan cache.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, PriceEntry] = OrderedDict()
+        # Bumped on every invalidation; loads that started before one are not stored
+        self._generation = 0
+        reference_cache.subscribe(self._on_invalidate)
+
+    def _on_invalidate(self, namespace: str, keys: tuple[str, ...]) -> None:
+        if namespace not in (ITEMS, STOCK):
+            return
+        with self._lock:
+            self._generation += 1
+            if keys:
+                for model_number in keys:
+                    self._entries.pop(model_number, None)
+            else:
+                self._entries.clear()
+
+    def get_many(self, db: Session, model_numbers) -> dict[str, PriceEntry]:
+        """Return entries for the model numbers that exist, loading misses with two IN queries"""
+        found: dict[str, PriceEntry] = {}
+        missing = []
+        with self._lock:
+            for model_number in dict.fromkeys(model_numbers):
+                entry = self._entries.get(model_number)
+                if entry is None:
+                    missing.append(model_number)
+                else:
+                    self._entries.move_to_end(model_number)
+                    found[model_number] = entry
+
+        if missing:
+            generation = self._generation
+            items = (
+                db.query(Item.id, Item.model_number, Item.name, Item.buying_price, Item.selling_price)
+                .filter(Item.model_number.in_(missing))
+                .all()
+            )
+            stock: dict[int, dict[int, int]] = {item.id: {} for item in items}
+            if items:
+                levels = (
+                    db.query(StockLevel.item_id, StockLevel.location_id, StockLevel.quantity)
+                    .filter(StockLevel.item_id.in_(stock))
+                    .all()
+                )
+                for level in levels:
+                    stock[level.item_id][level.location_id] = level.quantity
+            loaded = {
+                item.model_number: PriceEntry(
+                    item_id=item.id,
+                    model_number=item.model_number,
+                    name=item.name,
+                    buying_price=item.buying_price,
+                    selling_price=item.selling_price,
+                    stock=stock[item.id],
+                )
+                for item in items
+            }
+            with self._lock:
+                if generation == self._generation:
+                    self._entries.update(loaded)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            found.update(loaded)
+
+        return found
+
+
+# Global cache shared by the bill quote endpoint
+price_cache = PriceCache()
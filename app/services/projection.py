@@ -0,0 +1,98 @@
+from enum import Enum
+import threading
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+
+FULL_PROFILE = "full"
+
+FIELDS_QUERY_DESCRIPTION = "Comma-separated response fields, or a profile name (pos, full)"
+
+
+class Projection:
+    """
+    Sparse fieldsets for a list endpoint.
+
+    `fields` is either a named profile (e.g. "pos", "full") or a
+    comma-separated list of top-level response fields that map to plain
+    columns. Projected lists select only those columns and never load
+    relationships; they are rendered with a subset of the response model,
+    so every field keeps exactly the wire format of the full response.
+    """
+
+    def __init__(
+        self,
+        response_model: type[BaseModel],
+        columns: dict[str, ColumnElement],
+        profiles: dict[str, tuple[str, ...]],
+        required: tuple[str, ...] = ("id",),
+    ):
+        self.response_model = response_model
+        self.columns = columns
+        self.profiles = profiles
+        # Always selected (e.g. keyset cursor columns), only rendered when asked for
+        self.required = required
+        self._adapters: dict[tuple[str, ...], TypeAdapter] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, fields: Optional[str]) -> Optional[tuple[str, ...]]:
+        """Return the requested field names, or None for the full response"""
+        if fields is None or not fields.strip() or fields.strip() == FULL_PROFILE:
+            return None
+        if fields.strip() in self.profiles:
+            return self.profiles[fields.strip()]
+
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in self.columns]
+        if unknown or not names:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Unknown fields: {', '.join(unknown) or fields}. "
+                    f"Allowed fields: {', '.join(self.columns)}; "
+                    f"profiles: {', '.join((*self.profiles, FULL_PROFILE))}"
+                ),
+            )
+        return names
+
+    def select(self, query: Query, fields: tuple[str, ...]) -> list:
+        """Run an entity query with only the projected (and required) columns selected"""
+        names = tuple(dict.fromkeys((*fields, *self.required)))
+        return query.with_entities(*(self.columns[name].label(name) for name in names)).all()
+
+    def _adapter(self, fields: tuple[str, ...]) -> TypeAdapter:
+        with self._lock:
+            adapter = self._adapters.get(fields)
+            if adapter is None:
+                model_fields = self.response_model.model_fields
+                projected = create_model(
+                    f"{self.response_model.__name__}Projection",
+                    **{name: (model_fields[name].annotation, model_fields[name]) for name in fields},
+                )
+                adapter = TypeAdapter(list[projected])
+                self._adapters[fields] = adapter
+            return adapter
+
+    def render(self, fields: tuple[str, ...], rows) -> bytes:
+        """Encode projected rows as a JSON array"""
+        records = [
+            {
+                name: value.value if isinstance(value, Enum) else value
+                for name, value in row._mapping.items()
+            }
+            for row in rows
+        ]
+        adapter = self._adapter(fields)
+        return adapter.dump_json(adapter.validate_python(records))
+
+    def response(self, fields: tuple[str, ...], rows, response: Response) -> Response:
+        """JSON response for projected rows, keeping headers already set on the route's response"""
+        return Response(
+            content=self.render(fields, rows),
+            media_type="application/json",
+            headers=dict(response.headers),
+        )
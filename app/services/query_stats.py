@@ -0,0 +1,116 @@
+"""
+Per-request SQL query counting, N+1 detection and Server-Timing headers
+"""
+from collections import Counter
+from contextvars import ContextVar
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Characters of a statement quoted in N+1 warnings
+STATEMENT_PREVIEW_LENGTH = 200
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised in strict mode when a request runs more queries than settings.query_budget"""
+
+
+class QueryStats:
+    """Queries run by one request: count, time spent in the database, count per statement"""
+
+    __slots__ = ("count", "duration_seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration_seconds = 0.0
+        # Statement text -> executions; lazy loads of the same relationship share one text
+        self.statements: Counter[str] = Counter()
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first"""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration_seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+# Stats of the request being handled; copied into the threadpool that runs sync endpoints
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def route_label(scope) -> str:
+    """METHOD /route/{template} of a handled request, so /items/1 and /items/2 count together"""
+    route = scope.get("route")
+    return f"{scope['method']} {route.path if route is not None else scope['path']}"
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.statements[statement] += 1
+    if settings.query_budget_strict and 0 < settings.query_budget < stats.count:
+        raise QueryBudgetExceeded(f"Request exceeded the query budget of {settings.query_budget}")
+    if context is not None:
+        context._query_started_at = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _time_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started_at = getattr(context, "_query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.duration_seconds += time.perf_counter() - started_at
+
+
+def _report(label: str, stats: QueryStats) -> None:
+    for statement, count in stats.repeated(settings.query_repeat_warning):
+        preview = " ".join(statement.split())[:STATEMENT_PREVIEW_LENGTH]
+        logger.warning(f"🔁 Possible N+1 in {label}: {count} x {preview}")
+    if 0 < settings.query_budget < stats.count:
+        logger.warning(f"🐢 {label} ran {stats.count} queries (budget {settings.query_budget})")
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects QueryStats for every HTTP request, adds
+    a Server-Timing header with the query count and database time, and
+    logs statements repeated within the request (likely N+1 lazy loads)
+    and requests over the query budget.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            _report(route_label(scope), stats)
@@ -0,0 +1,265 @@
+"""
+Versioned in-process cache for category and item reference data
+"""
+import logging
+import os
+import select
+import socket
+import threading
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models.category import Category
+from app.models.item import Item
+from app.schemas.item import ItemOut
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL channel used to tell the other workers that a namespace changed
+NOTIFY_CHANNEL = "reference_cache"
+
+CATEGORIES = "categories"
+ITEMS = "items"
+# Item fields such as quantity changed; keys are the affected model numbers
+STOCK = "stock"
+NAMESPACES = (CATEGORIES, ITEMS, STOCK)
+
+# NOTIFY payloads are capped at 8000 bytes; past this, keys are dropped
+# and the whole namespace is invalidated instead
+MAX_NOTIFY_PAYLOAD = 7000
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+ITEM_COLUMNS = tuple(Item.__table__.columns.keys())
+
+# Seconds between reconnect attempts after the LISTEN connection drops
+LISTEN_RETRY_SECONDS = 5
+
+
+class ReferenceCache:
+    """
+    Categories (by id and by lower-cased name) and item ids by model number.
+
+    Every namespace has a version number that write endpoints bump through
+    invalidate(). Readers load data tagged with the version seen before the
+    query, so a load that races with a write is stored as stale and thrown
+    away on the next read. Other workers learn about writes through
+    PostgreSQL LISTEN/NOTIFY.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {namespace: 0 for namespace in NAMESPACES}
+        self._categories: dict[int, dict] = {}
+        self._category_ids_by_name: dict[str, int] = {}
+        self._categories_version: int | None = None
+        self._item_ids: dict[str, int] = {}
+        self._item_ids_version: int | None = None
+        self._listener: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._subscribers = []
+
+    def version(self, namespace: str) -> int:
+        return self._versions[namespace]
+
+    # --- categories ---
+
+    def _load_categories(self, db: Session) -> None:
+        version = self._versions[CATEGORIES]
+        rows = db.query(Category).all()
+        categories = {
+            row.id: {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "created_at": row.created_at,
+            }
+            for row in rows
+        }
+        with self._lock:
+            self._categories = categories
+            self._category_ids_by_name = {row["name"].lower(): category_id for category_id, row in categories.items()}
+            self._categories_version = version
+
+    def _ensure_categories(self, db: Session) -> None:
+        if self._categories_version != self._versions[CATEGORIES]:
+            self._load_categories(db)
+
+    def list_categories(self, db: Session) -> list[dict]:
+        """Return every category ordered by id"""
+        self._ensure_categories(db)
+        categories = self._categories
+        return [categories[category_id] for category_id in sorted(categories)]
+
+    def get_category(self, db: Session, category_id: int) -> dict | None:
+        """Return one category, or None if it does not exist"""
+        self._ensure_categories(db)
+        category = self._categories.get(category_id)
+        if category is not None:
+            return category
+
+        # Created on another worker before its NOTIFY arrived?
+        if db.query(Category.id).filter(Category.id == category_id).scalar() is None:
+            return None
+        self._bump(CATEGORIES)
+        self._ensure_categories(db)
+        return self._categories.get(category_id)
+
+    def category_exists(self, db: Session, category_id: int) -> bool:
+        return self.get_category(db, category_id) is not None
+
+    def find_category_id_by_name(self, db: Session, name: str) -> int | None:
+        """Case-insensitive lookup of a category id by name"""
+        self._ensure_categories(db)
+        category_id = self._category_ids_by_name.get(name.lower())
+        if category_id is not None:
+            return category_id
+
+        # Not cached: confirm against the database (served by ix_categories_name_lower)
+        # so a category created on another worker before its NOTIFY arrives is still seen
+        return (
+            db.query(Category.id)
+            .filter(func.lower(Category.name) == name.lower())
+            .scalar()
+        )
+
+    # --- items ---
+
+    def find_item_id_by_model_number(self, db: Session, model_number: str) -> int | None:
+        """Return the id of the item with this model number, or None"""
+        with self._lock:
+            if self._item_ids_version != self._versions[ITEMS]:
+                self._item_ids = {}
+                self._item_ids_version = self._versions[ITEMS]
+            version = self._item_ids_version
+            item_id = self._item_ids.get(model_number)
+        if item_id is not None:
+            return item_id
+
+        item_id = db.query(Item.id).filter(Item.model_number == model_number).scalar()
+        if item_id is not None:
+            with self._lock:
+                if self._item_ids_version == version:
+                    self._item_ids[model_number] = item_id
+        return item_id
+
+    def get_item_by_model_number(self, db: Session, model_number: str) -> Item | None:
+        item_id = self.find_item_id_by_model_number(db, model_number)
+        if item_id is None:
+            return None
+        item_obj = db.get(Item, item_id)
+        if item_obj is None or item_obj.model_number != model_number:
+            # Deleted on another worker before its NOTIFY arrived
+            self._bump(ITEMS)
+            return None
+        return item_obj
+
+    def item_out(self, db: Session, item_obj: Item) -> ItemOut:
+        """Build ItemOut with the category taken from the cache instead of a lazy load"""
+        category = self.get_category(db, item_obj.category_id)
+        if category is None:
+            return ItemOut.model_validate(item_obj)
+        data = {column: getattr(item_obj, column) for column in ITEM_COLUMNS}
+        data["category"] = category
+        return ItemOut.model_validate(data)
+
+    # --- invalidation ---
+
+    def subscribe(self, callback) -> None:
+        """
+        Register callback(namespace, keys) for every invalidation, local or
+        from another worker. An empty keys tuple means the whole namespace.
+        """
+        self._subscribers.append(callback)
+
+    def _bump(self, namespace: str, keys: tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._versions[namespace] += 1
+        for callback in self._subscribers:
+            try:
+                callback(namespace, keys)
+            except Exception as e:
+                logger.error(f"❌ Error in {namespace} cache invalidation subscriber: {str(e)}")
+
+    def invalidate(self, namespace: str, keys=()) -> None:
+        """
+        Bump a namespace after a committed write, here and on every other worker.
+        Call it after db.commit() so no worker reloads uncommitted data.
+        """
+        keys = tuple(keys)
+        payload = f"{namespace}|{WORKER_ID}|{','.join(keys)}"
+        if len(payload) > MAX_NOTIFY_PAYLOAD:
+            keys = ()
+            payload = f"{namespace}|{WORKER_ID}|"
+
+        self._bump(namespace, keys)
+        try:
+            with engine.connect() as connection:
+                connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": NOTIFY_CHANNEL, "payload": payload}
+                )
+                connection.commit()
+        except Exception as e:
+            logger.error(f"❌ Error publishing {namespace} cache invalidation: {str(e)}")
+
+    def invalidate_all(self) -> None:
+        """Bump every namespace locally (no NOTIFY)"""
+        for namespace in NAMESPACES:
+            self._bump(namespace)
+
+    # --- cross-worker listener ---
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = engine.raw_connection()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                cursor = driver_connection.cursor()
+                cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Anything may have changed while we were not listening
+                self.invalidate_all()
+                logger.info("👂 Listening for reference cache invalidations")
+
+                while not self._stop.is_set():
+                    readable, _, _ = select.select([driver_connection], [], [], 1.0)
+                    if not readable:
+                        continue
+                    driver_connection.poll()
+                    while driver_connection.notifies:
+                        notification = driver_connection.notifies.pop(0)
+                        namespace, sender, keys = (notification.payload.split("|", 2) + ["", ""])[:3]
+                        if namespace in self._versions and sender != WORKER_ID:
+                            self._bump(namespace, tuple(key for key in keys.split(",") if key))
+            except Exception as e:
+                logger.warning(f"⚠️ Reference cache listener error: {str(e)}")
+                self.invalidate_all()
+                self._stop.wait(LISTEN_RETRY_SECONDS)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.invalidate()
+                    except Exception:
+                        pass
+
+    def start_listener(self) -> None:
+        """Start the background LISTEN thread (once per worker)"""
+        if self._listener is not None and self._listener.is_alive():
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name="reference-cache-listener", daemon=True)
+        self._listener.start()
+
+    def stop_listener(self) -> None:
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=LISTEN_RETRY_SECONDS)
+            self._listener = None
+
+
+# Global cache shared by the category and item routers
+reference_cache = ReferenceCache()
@@ -0,0 +1,170 @@
+"""
+Hot cache of serialized items for barcode and QR scans
+"""
+from collections import OrderedDict
+import logging
+import threading
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.models.item import Item
+from app.services.model_number_service import ModelNumberService
+from app.services.reference_cache import CATEGORIES, ITEMS, STOCK, reference_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ScanCache:
+    """
+    LRU map of model number -> ItemOut already encoded as JSON bytes.
+
+    Scan responses are assembled by splicing these bytes into the response
+    body, so a hit costs no query and no pydantic serialization. Entries are
+    dropped through the reference cache invalidations: per model number on
+    stock changes and item writes, wholesale when categories change.
+    """
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        # Bumped on every invalidation; loads that started before one are not stored
+        self._generation = 0
+        reference_cache.subscribe(self._on_invalidate)
+
+    def _on_invalidate(self, namespace: str, keys: tuple[str, ...]) -> None:
+        if namespace not in (CATEGORIES, ITEMS, STOCK):
+            return
+        with self._lock:
+            self._generation += 1
+            if keys and namespace != CATEGORIES:
+                for model_number in keys:
+                    self._entries.pop(model_number, None)
+            else:
+                self._entries.clear()
+
+    def _get(self, model_number: str) -> bytes | None:
+        with self._lock:
+            payload = self._entries.get(model_number)
+            if payload is not None:
+                self._entries.move_to_end(model_number)
+            return payload
+
+    def _store(self, generation: int, payloads: dict[str, bytes]) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.update(payloads)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_many(self, db: Session, model_numbers) -> dict[str, bytes]:
+        """Return serialized items for the model numbers that exist, loading misses in one query"""
+        found: dict[str, bytes] = {}
+        missing = []
+        for model_number in dict.fromkeys(model_numbers):
+            payload = self._get(model_number)
+            if payload is None:
+                missing.append(model_number)
+            else:
+                found[model_number] = payload
+
+        if missing:
+            generation = self._generation
+            items = db.query(Item).filter(Item.model_number.in_(missing)).all()
+            loaded = {
+                item_obj.model_number: orjson.dumps(reference_cache.item_out(db, item_obj).model_dump(mode="json"))
+                for item_obj in items
+            }
+            self._store(generation, loaded)
+            found.update(loaded)
+
+        return found
+
+    def get(self, db: Session, model_number: str) -> bytes | None:
+        return self.get_many(db, (model_number,)).get(model_number)
+
+    def get_batch(self, db: Session, model_numbers: list[str], ids: list[int]) -> bytes:
+        """
+        Encode an ItemBatchResponse for the given model numbers and ids, in
+        request order with duplicates dropped. Ids are mapped to model
+        numbers with one query; items then come from the cache, misses
+        from one IN query.
+        """
+        model_numbers = list(dict.fromkeys(model_number.strip() for model_number in model_numbers))
+        ids = list(dict.fromkeys(ids))
+        model_numbers_by_id = dict(
+            db.query(Item.id, Item.model_number).filter(Item.id.in_(ids)).all()
+        ) if ids else {}
+
+        payloads = self.get_many(db, (*model_numbers, *model_numbers_by_id.values()))
+
+        # An item asked for both by model number and by id is listed once
+        found: dict[str, bytes] = {}
+        missing_model_numbers = []
+        for model_number in model_numbers:
+            if model_number in payloads:
+                found.setdefault(model_number, payloads[model_number])
+            else:
+                missing_model_numbers.append(model_number)
+        missing_ids = []
+        for item_id in ids:
+            model_number = model_numbers_by_id.get(item_id)
+            if model_number in payloads:
+                found.setdefault(model_number, payloads[model_number])
+            else:
+                missing_ids.append(item_id)
+
+        return b"".join((
+            b'{"items":[', b",".join(found.values()),
+            b'],"missing_model_numbers":', orjson.dumps(missing_model_numbers),
+            b',"missing_ids":', orjson.dumps(missing_ids),
+            b"}",
+        ))
+
+    @staticmethod
+    def resolve_response(scanned_value: str, model_number: str, qr_format: str, item_payload: bytes) -> bytes:
+        """Encode a QRResolveResponse around an already serialized item"""
+        return b"".join((
+            b'{"scanned_value":', orjson.dumps(scanned_value.strip()),
+            b',"resolved_model_number":', orjson.dumps(model_number),
+            b',"qr_format":', orjson.dumps(qr_format),
+            b',"item":', item_payload,
+            b"}",
+        ))
+
+    def resolve_batch(self, db: Session, scanned_values: list[str]) -> bytes:
+        """
+        Resolve many scanned codes at once. Results keep the request order;
+        codes that fail to parse or match no item carry an error instead.
+        """
+        parsed = []
+        for scanned_value in scanned_values:
+            try:
+                model_number, qr_format = ModelNumberService.resolve_scanned_value(scanned_value)
+                parsed.append((scanned_value, model_number, qr_format, None))
+            except ValueError as exc:
+                parsed.append((scanned_value, None, None, str(exc)))
+
+        payloads = self.get_many(db, (model_number for _, model_number, _, error in parsed if error is None))
+
+        results = []
+        for scanned_value, model_number, qr_format, error in parsed:
+            item_payload = payloads.get(model_number) if error is None else None
+            if item_payload is not None:
+                results.append(self.resolve_response(scanned_value, model_number, qr_format, item_payload))
+                continue
+            if error is None:
+                error = f"Item with model number {model_number} not found"
+            results.append(orjson.dumps({
+                "scanned_value": scanned_value.strip(),
+                "resolved_model_number": model_number,
+                "error": error,
+            }))
+
+        return b'{"results":[' + b",".join(results) + b"]}"
+
+
+# Global cache shared by the item router
+scan_cache = ScanCache()
@@ -1,17 +1,34 @@
 """
 Scheduler for automated low stock alert checks
 """
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from functools import wraps
+from sqlalchemy import delete, func, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, joinedload
+from app.config import settings
+from app.database import SessionLocal, engine
 from app.models.low_stock_alert import LowStockAlert
 from app.models.item import Item
 from app.models.user import User
+from app.models.scheduler_job_claim import SchedulerJobClaim
+from app.models.scheduled_job_run import ScheduledJobRun
 from app.services.alert_service import AlertService
+from app.services.draft_bill_service import DraftBillService
+from app.services.idempotency import IdempotencyStore
+from app.services.inventory_valuation_service import InventoryValuationService
+from app.services.stock_service import StockService
+from app.services.job_metrics import job_metrics
 from app.services.notification_service import NotificationService
 import logging
+import os
+import socket
+import threading
+import time
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -19,31 +36,345 @@ logger = logging.getLogger(__name__)
 # Global scheduler instance
 scheduler = BackgroundScheduler(daemon=True)
 
+# Leader election: the worker holding this PostgreSQL advisory lock runs the
+# leader-only jobs. The lock lives on a dedicated autocommit connection and is
+# released automatically by PostgreSQL if the worker dies.
+SCHEDULER_LEADER_LOCK_KEY = 7420190001
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
 
-def daily_low_stock_check():
+_leader_lock = threading.Lock()
+_leader_connection = None
+
+# Tracked jobs by id, used by the admin endpoints for on-demand runs
+TRACKED_JOBS = {}
+
+# Start time of the current run of each job, used to compute queue lag
+_run_started_at = {}
+
+
+def is_leader() -> bool:
+    """Return True if this worker currently holds the scheduler leader lock"""
+    return _leader_connection is not None
+
+
+def refresh_leadership():
+    """
+    Try to become the scheduler leader, or confirm that we still are.
+    Runs on every worker at a short interval so a new leader takes over
+    shortly after the previous one goes away.
+    """
+    global _leader_connection
+
+    with _leader_lock:
+        if _leader_connection is not None:
+            try:
+                _leader_connection.execute(text("SELECT 1"))
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Lost scheduler leader connection: {str(e)}")
+                _close_leader_connection()
+
+        connection = None
+        try:
+            connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            acquired = connection.execute(
+                text("SELECT pg_try_advisory_lock(:key)"),
+                {"key": SCHEDULER_LEADER_LOCK_KEY}
+            ).scalar()
+        except Exception as e:
+            logger.error(f"❌ Error during scheduler leader election: {str(e)}")
+            if connection is not None:
+                connection.close()
+            return
+
+        if acquired:
+            _leader_connection = connection
+            logger.info(f"👑 Worker {WORKER_ID} is now the scheduler leader")
+        else:
+            connection.close()
+
+
+def release_leadership():
+    """Give up the scheduler leader lock, if held"""
+    with _leader_lock:
+        if _leader_connection is not None:
+            try:
+                _leader_connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": SCHEDULER_LEADER_LOCK_KEY}
+                )
+            except Exception as e:
+                logger.error(f"Error releasing scheduler leader lock: {str(e)}")
+            _close_leader_connection()
+            logger.info(f"Worker {WORKER_ID} released scheduler leadership")
+
+
+def _close_leader_connection():
+    global _leader_connection
+
+    try:
+        _leader_connection.close()
+    except Exception:
+        pass
+    _leader_connection = None
+
+
+def leader_only(func):
+    """Decorator for scheduler jobs that must run on a single worker only"""
+    @wraps(func)
+    def wrapper(*args, manual: bool = False, **kwargs):
+        if not manual and not is_leader():
+            logger.info(f"⏭️ Skipping {func.__name__}: worker {WORKER_ID} is not the scheduler leader")
+            return None
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def tracked_job(job_id: str):
+    """
+    Decorator that records every run of a scheduled job.
+    The job returns a dict of counters (see job_metrics.RUN_COUNTERS), or
+    None when it skipped its work. Each run is folded into the in-process
+    job_metrics and written to scheduled_job_runs, except scheduled runs
+    that skipped their work (non-leaders, partitions already claimed):
+    those would add a row per worker per run and say nothing.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(manual: bool = False, requested_at: datetime | None = None):
+            started_at = datetime.utcnow()
+            _run_started_at[job_id] = datetime.now(pytz.UTC)
+            if requested_at is not None:
+                job_metrics.record_queue_lag(job_id, (started_at - requested_at).total_seconds())
+
+            started = time.perf_counter()
+            stats = None
+            error = None
+            try:
+                stats = func(manual=manual) if manual else func()
+                status = "skipped" if stats is None else "success"
+            except Exception as e:
+                status = "failed"
+                error = str(e)
+                logger.error(f"❌ Job {job_id} failed: {error}", exc_info=True)
+            duration_seconds = time.perf_counter() - started
+
+            job_metrics.record_run(job_id, status, started_at, duration_seconds, stats)
+            if status == "skipped" and not manual:
+                logger.info(f"⏭️ Job {job_id} had nothing to do on worker {WORKER_ID}")
+                return
+            _record_job_run(
+                job_id=job_id,
+                status=status,
+                manual=manual,
+                started_at=started_at,
+                duration_seconds=duration_seconds,
+                stats=stats or {},
+                error=error
+            )
+            logger.info(f"⏱️ Job {job_id} finished with status {status} in {duration_seconds:.2f}s")
+
+        TRACKED_JOBS[job_id] = wrapper
+        return wrapper
+    return decorator
+
+
+def _record_job_run(
+    job_id: str,
+    status: str,
+    manual: bool,
+    started_at: datetime,
+    duration_seconds: float,
+    stats: dict,
+    error: str | None
+):
+    db = SessionLocal()
+    try:
+        db.add(ScheduledJobRun(
+            job_id=job_id,
+            status=status,
+            worker_id=WORKER_ID,
+            manual=manual,
+            started_at=started_at,
+            finished_at=started_at + timedelta(seconds=duration_seconds),
+            duration_ms=int(duration_seconds * 1000),
+            items_scanned=stats.get("items_scanned", 0),
+            rows_affected=stats.get("rows_affected", 0),
+            emails_sent=stats.get("emails_sent", 0),
+            emails_failed=stats.get("emails_failed", 0),
+            error=error
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error recording run of job {job_id}: {str(e)}")
+    finally:
+        db.close()
+
+
+def _on_job_event(event):
+    """APScheduler listener: queue lag for executed runs, counters for missed ones"""
+    if event.code == EVENT_JOB_MISSED:
+        job_metrics.record_missed(event.job_id)
+        logger.warning(f"⚠️ Job {event.job_id} missed its run at {event.scheduled_run_time}")
+        return
+
+    started_at = _run_started_at.pop(event.job_id, None)
+    if started_at is not None and event.scheduled_run_time is not None:
+        job_metrics.record_queue_lag(event.job_id, (started_at - event.scheduled_run_time).total_seconds())
+
+
+def run_job_now(job_id: str) -> None:
+    """Run a tracked job immediately in the calling thread (on-demand trigger)"""
+    TRACKED_JOBS[job_id](manual=True, requested_at=datetime.utcnow())
+
+
+def claim_partition(db: Session, job_id: str, run_key: str, partition: int) -> bool:
+    """
+    Claim one partition of a job run for this worker.
+    Returns True for the first worker to claim it, or for a worker taking
+    over a claim that was neither completed nor renewed within
+    settings.scheduler_claim_lease_minutes (its worker died). Call
+    complete_partition() when done, or release_partition() on failure.
+    """
+    lease_expired = func.now() - timedelta(minutes=settings.scheduler_claim_lease_minutes)
+    result = db.execute(
+        insert(SchedulerJobClaim)
+        .values(job_id=job_id, run_key=run_key, partition=partition, claimed_by=WORKER_ID)
+        .on_conflict_do_update(
+            index_elements=["job_id", "run_key", "partition"],
+            set_={"claimed_by": WORKER_ID, "claimed_at": func.now()},
+            where=SchedulerJobClaim.completed_at.is_(None) & (SchedulerJobClaim.claimed_at < lease_expired),
+        )
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _own_claim(job_id: str, run_key: str, partition: int):
+    return (
+        SchedulerJobClaim.job_id == job_id,
+        SchedulerJobClaim.run_key == run_key,
+        SchedulerJobClaim.partition == partition,
+        SchedulerJobClaim.claimed_by == WORKER_ID,
+    )
+
+
+def complete_partition(db: Session, job_id: str, run_key: str, partition: int) -> None:
+    """Mark this worker's claim on a partition as done, so it is never retried"""
+    db.execute(
+        update(SchedulerJobClaim)
+        .where(*_own_claim(job_id, run_key, partition))
+        .values(completed_at=func.now())
+    )
+    db.commit()
+
+
+def release_partition(db: Session, job_id: str, run_key: str, partition: int) -> None:
+    """Drop this worker's claim on a failed partition, so the next run retries it"""
+    db.execute(delete(SchedulerJobClaim).where(*_own_claim(job_id, run_key, partition)))
+    db.commit()
+
+
+def delete_old_claims(db: Session, cutoff: datetime) -> int:
+    """Delete partition claims made before cutoff; returns the number of rows deleted"""
+    result = db.execute(delete(SchedulerJobClaim).where(SchedulerJobClaim.claimed_at < cutoff))
+    return result.rowcount
+
+
+@tracked_job("daily_low_stock_check")
+def daily_low_stock_check(manual: bool = False):
     """
     Daily job to check all low stock items and send email alerts
-    Runs every day at 9:00 AM UTC
+    Runs every day at 9:00 AM UTC on every worker. Users are split into
+    settings.scheduler_partitions partitions by id; each worker claims and
+    processes partitions one at a time, so the scan is spread across
+    workers without any user being processed twice.
+    The job fires again every hour until the end of the day with the same
+    run key: completed partitions are skipped, while failed ones and ones
+    whose worker died (lease expired) are picked up again.
+    Manual runs use their own run key so they never collide with the daily run.
+    """
+    partitions = max(settings.scheduler_partitions, 1)
+    if manual:
+        run_key = datetime.utcnow().strftime("manual-%Y%m%d%H%M%S%f")
+    else:
+        run_key = datetime.utcnow().strftime("%Y-%m-%d")
+
+    stats = None
+    failed_partitions = []
+
+    for partition in range(partitions):
+        db = SessionLocal()
+        try:
+            claimed = claim_partition(db, "daily_low_stock_check", run_key, partition)
+        except Exception as e:
+            logger.error(f"❌ Error claiming daily low stock check partition {partition}: {str(e)}", exc_info=True)
+            failed_partitions.append(partition)
+            continue
+        finally:
+            db.close()
+
+        if not claimed:
+            logger.info(f"⏭️ Partition {partition + 1}/{partitions} of daily low stock check already claimed")
+            continue
+
+        db = SessionLocal()
+        try:
+            partition_stats = _daily_low_stock_check_partition(partition, partitions)
+            complete_partition(db, "daily_low_stock_check", run_key, partition)
+        except Exception as e:
+            logger.error(f"❌ Error in daily_low_stock_check partition {partition}: {str(e)}", exc_info=True)
+            failed_partitions.append(partition)
+            try:
+                db.rollback()
+                release_partition(db, "daily_low_stock_check", run_key, partition)
+            except Exception as release_error:
+                logger.error(f"❌ Error releasing daily low stock check partition {partition}: {str(release_error)}")
+            continue
+        finally:
+            db.close()
+
+        stats = stats or {"items_scanned": 0, "emails_sent": 0, "emails_failed": 0}
+        for counter, value in partition_stats.items():
+            stats[counter] += value
+
+    if failed_partitions:
+        raise RuntimeError(f"Daily low stock check failed for partition(s) {failed_partitions}")
+
+    return stats
+
+
+def _daily_low_stock_check_partition(partition: int, partitions: int) -> dict:
+    """
+    Check low stock items and send email alerts for the users in one partition
+    Returns counters for items scanned and emails sent or failed
     """
     logger.info("=" * 60)
-    logger.info("🔍 Starting daily low stock check...")
+    logger.info(f"🔍 Starting daily low stock check (partition {partition + 1}/{partitions})...")
     logger.info("=" * 60)
     
     db = SessionLocal()
     try:
         # Get all users with notifications enabled
-        users = db.query(User).filter(User.notification_enabled == True).all()
+        users = db.query(User).filter(
+            User.notification_enabled == True,
+            User.id % partitions == partition
+        ).all()
         
         logger.info(f"Found {len(users)} users with notifications enabled")
         
         total_alerts_sent = 0
+        total_alerts_failed = 0
+        items_scanned = 0
         
         for user in users:
             try:
                 # Get all low stock items for this user
-                low_stock_items = db.query(Item).filter(
+                low_stock_items = db.query(Item).options(joinedload(Item.category)).filter(
                     Item.quantity < user.alert_threshold
                 ).all()
+                items_scanned += len(low_stock_items)
                 
                 if not low_stock_items:
                     logger.info(f"✅ No low stock items for user {user.email}")
@@ -132,6 +463,7 @@ def daily_low_stock_check():
                     total_alerts_sent += 1
                     logger.info(f"✅ Alert sent to {user.email}")
                 else:
+                    total_alerts_failed += 1
                     logger.error(f"❌ Failed to send alert to {user.email}")
                 
             except Exception as e:
@@ -142,13 +474,159 @@ def daily_low_stock_check():
         logger.info(f"✅ Daily low stock check completed")
         logger.info(f"   Total alerts sent: {total_alerts_sent}")
         logger.info("=" * 60)
-        
-    except Exception as e:
-        logger.error(f"❌ Error in daily_low_stock_check: {str(e)}", exc_info=True)
+
+        return {
+            "items_scanned": items_scanned,
+            "emails_sent": total_alerts_sent,
+            "emails_failed": total_alerts_failed
+        }
+
+    finally:
+        db.close()
+
+
+@tracked_job("archive_resolved_alerts")
+@leader_only
+def archive_resolved_alerts():
+    """
+    Daily job to move resolved alerts older than the retention window
+    into the low_stock_alert_daily_counts roll-up table.
+    Works in small batches and commits after each one to keep locks short.
+    """
+    logger.info("🗄️ Starting resolved alert archival...")
+
+    cutoff = datetime.utcnow() - timedelta(days=settings.alert_retention_days)
+    rows_moved = 0
+    batches = 0
+
+    db = SessionLocal()
+    try:
+        while True:
+            moved = AlertService.archive_resolved_alerts(
+                db=db,
+                cutoff=cutoff,
+                batch_size=settings.alert_archive_batch_size
+            )
+            db.commit()
+
+            if not moved:
+                break
+
+            rows_moved += moved
+            batches += 1
+
+            if moved < settings.alert_archive_batch_size:
+                break
+
+        logger.info(f"✅ Archived {rows_moved} resolved alert(s) in {batches} batch(es)")
+        return {"rows_affected": rows_moved}
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@tracked_job("inventory_valuation_snapshot")
+@leader_only
+def inventory_valuation_snapshot():
+    """
+    Nightly job that recomputes item stock totals and the live stock
+    valuation for every category (correcting anything a failed incremental
+    refresh missed) and stores the valuation as that day's point-in-time snapshot.
+    """
+    logger.info("📦 Writing inventory valuation snapshot...")
+
+    snapshot_date = datetime.utcnow().date()
+    db = SessionLocal()
+    try:
+        items_reconciled = StockService.reconcile_item_totals(db)
+        if items_reconciled:
+            logger.warning(f"⚠️ Corrected stock totals of {items_reconciled} item(s)")
+        rows_written = InventoryValuationService.write_snapshot(db, snapshot_date)
+        db.commit()
+        logger.info(f"✅ Inventory valuation snapshot for {snapshot_date}: {rows_written} category row(s)")
+        return {"rows_affected": rows_written}
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@tracked_job("expire_idempotency_keys")
+@leader_only
+def expire_idempotency_keys():
+    """
+    Hourly job that deletes Idempotency-Key rows past their replay window,
+    in batches committed one at a time, and scheduler partition claims
+    older than settings.scheduler_claim_retention_days.
+    """
+    logger.info("🔑 Expiring idempotency keys...")
+
+    rows_deleted = 0
+    db = SessionLocal()
+    try:
+        while True:
+            deleted = IdempotencyStore.delete_expired(db, batch_size=1000)
+            db.commit()
+            rows_deleted += deleted
+            if deleted < 1000:
+                break
+
+        logger.info(f"✅ Deleted {rows_deleted} expired idempotency key(s)")
+
+        claims_deleted = delete_old_claims(
+            db, datetime.utcnow() - timedelta(days=settings.scheduler_claim_retention_days)
+        )
+        db.commit()
+        rows_deleted += claims_deleted
+        logger.info(f"✅ Deleted {claims_deleted} old scheduler partition claim(s)")
+        return {"rows_affected": rows_deleted}
+
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
 
 
+@tracked_job("expire_draft_bills")
+@leader_only
+def expire_draft_bills():
+    """
+    Hourly job that deletes draft bills past their expiry. Expired drafts
+    already hold no reservations; this only reclaims the rows.
+    """
+    logger.info("🛒 Expiring draft bills...")
+
+    rows_deleted = 0
+    db = SessionLocal()
+    try:
+        while True:
+            deleted = DraftBillService.delete_expired(db, batch_size=1000)
+            db.commit()
+            rows_deleted += deleted
+            if deleted < 1000:
+                break
+
+        logger.info(f"✅ Deleted {rows_deleted} expired draft bill(s)")
+        return {"rows_affected": rows_deleted}
+
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def get_archive_metrics() -> dict:
+    """Return a snapshot of the alert archival job metrics"""
+    return job_metrics.snapshot("archive_resolved_alerts")
+
+
 def start_scheduler():
     """
     Start the background scheduler
@@ -156,18 +634,71 @@ def start_scheduler():
     """
     try:
         if not scheduler.running:
-            # Schedule the daily check - runs every day at 9:00 AM UTC
+            refresh_leadership()
+
+            # Leader election - every worker competes for the leader lock
+            scheduler.add_job(
+                func=refresh_leadership,
+                trigger=IntervalTrigger(seconds=settings.scheduler_leader_check_seconds),
+                id='scheduler_leader_election',
+                name='Scheduler Leader Election',
+                replace_existing=True
+            )
+
+            # Schedule the daily check - runs every day at 9:00 AM UTC, then
+            # hourly to retry partitions that failed or whose worker died
             scheduler.add_job(
                 func=daily_low_stock_check,
-                trigger=CronTrigger(hour=9, minute=0, timezone=pytz.UTC),
+                trigger=CronTrigger(hour="9-23", minute=0, timezone=pytz.UTC),
                 id='daily_low_stock_check',
                 name='Daily Low Stock Check',
                 replace_existing=True
             )
+
+            # Archive old resolved alerts - runs every day at 3:00 AM UTC
+            scheduler.add_job(
+                func=archive_resolved_alerts,
+                trigger=CronTrigger(hour=3, minute=0, timezone=pytz.UTC),
+                id='archive_resolved_alerts',
+                name='Archive Resolved Alerts',
+                replace_existing=True
+            )
+            
+            # Inventory valuation snapshot - runs every day at 0:30 AM UTC
+            scheduler.add_job(
+                func=inventory_valuation_snapshot,
+                trigger=CronTrigger(hour=0, minute=30, timezone=pytz.UTC),
+                id='inventory_valuation_snapshot',
+                name='Inventory Valuation Snapshot',
+                replace_existing=True
+            )
+
+            # Expire idempotency keys - runs every hour
+            scheduler.add_job(
+                func=expire_idempotency_keys,
+                trigger=CronTrigger(minute=15, timezone=pytz.UTC),
+                id='expire_idempotency_keys',
+                name='Expire Idempotency Keys',
+                replace_existing=True
+            )
+
+            # Expire draft bills - runs every hour
+            scheduler.add_job(
+                func=expire_draft_bills,
+                trigger=CronTrigger(minute=45, timezone=pytz.UTC),
+                id='expire_draft_bills',
+                name='Expire Draft Bills',
+                replace_existing=True
+            )
             
+            scheduler.add_listener(_on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
             scheduler.start()
             logger.info("✅ Scheduler started successfully")
-            logger.info("📅 Daily low stock check scheduled for 9:00 AM UTC")
+            logger.info("📅 Daily low stock check scheduled for 9:00 AM UTC (hourly retries until midnight)")
+            logger.info("📅 Resolved alert archival scheduled for 3:00 AM UTC")
+            logger.info("📅 Inventory valuation snapshot scheduled for 0:30 AM UTC")
+            logger.info("📅 Idempotency key and partition claim expiry scheduled hourly at :15")
+            logger.info("📅 Draft bill expiry scheduled hourly at :45")
         else:
             logger.info("Scheduler is already running")
     
@@ -184,5 +715,6 @@ def stop_scheduler():
         if scheduler.running:
             scheduler.shutdown(wait=False)
             logger.info("✅ Scheduler stopped")
+        release_leadership()
     except Exception as e:
         logger.error(f"Error stopping scheduler: {str(e)}")
@@ -0,0 +1,52 @@
+import re
+from typing import Sequence
+
+from sqlalchemy import func, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+PHONE_QUERY_PATTERN = re.compile(r"^\+?[\d\s\-().]+$")
+
+
+class SearchService:
+    """Helpers for ranked, pg_trgm-indexed free-text search over party tables."""
+
+    @staticmethod
+    def normalize_query(query: str) -> tuple[str, str | None]:
+        """Return the trimmed text query and, for phone-like input, its bare digits."""
+        text_query = " ".join(query.split())
+        digits = None
+        if PHONE_QUERY_PATTERN.fullmatch(text_query):
+            digits = re.sub(r"\D", "", text_query) or None
+        return text_query, digits
+
+    @staticmethod
+    def _like_pattern(value: str) -> str:
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return f"%{escaped}%"
+
+    @staticmethod
+    def match_filter(
+        *,
+        text_columns: Sequence[ColumnElement],
+        phone_column: ColumnElement,
+        text_query: str,
+        digits: str | None,
+    ) -> ColumnElement:
+        # ILIKE '%q%' is served by the gin_trgm_ops indexes once q has 3+ characters.
+        pattern = SearchService._like_pattern(text_query)
+        clauses = [column.ilike(pattern, escape="\\") for column in text_columns]
+        clauses.append(phone_column.ilike(SearchService._like_pattern(digits or text_query), escape="\\"))
+        return or_(*clauses)
+
+    @staticmethod
+    def rank(
+        *,
+        text_columns: Sequence[ColumnElement],
+        phone_column: ColumnElement,
+        text_query: str,
+        digits: str | None,
+    ) -> ColumnElement:
+        scores = [func.word_similarity(text_query, func.coalesce(column, "")) for column in text_columns]
+        scores.append(func.word_similarity(digits or text_query, phone_column))
+        return func.greatest(*scores)
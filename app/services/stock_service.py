@@ -0,0 +1,298 @@
+"""
+Per-location stock levels and the maintained item totals
+"""
+import logging
+from typing import Iterable, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.bill import BillType
+from app.models.item import Item
+from app.models.location import Location
+from app.models.stock_level import StockLevel
+from app.schemas.location import ItemStockLevel, LocationCreate, LocationStockLevel, LocationUpdate
+
+logger = logging.getLogger(__name__)
+
+
+class StockService:
+    """
+    Stock is held per (item, location) in stock_levels, so tills at
+    different locations update different rows. items.quantity is the sum
+    over all locations; it is refreshed after each bill commits, in a
+    short transaction of its own, rather than inside the bill's transaction.
+    """
+
+    # --- locations ---
+
+    @staticmethod
+    def list_locations(db: Session, include_inactive: bool = False) -> list[Location]:
+        location_query = db.query(Location)
+        if not include_inactive:
+            location_query = location_query.filter(Location.is_active.is_(True))
+        return location_query.order_by(Location.name.asc()).all()
+
+    @staticmethod
+    def get_location(db: Session, location_id: int) -> Location:
+        location = db.query(Location).filter(Location.id == location_id).first()
+        if not location:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Location with id {location_id} not found")
+        return location
+
+    @staticmethod
+    def resolve_location(db: Session, location_id: Optional[int]) -> Location:
+        """The given active location, or the default location when None"""
+        if location_id is None:
+            location = db.query(Location).filter(Location.is_default.is_(True)).first()
+            if not location:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No default location configured")
+            return location
+
+        location = StockService.get_location(db, location_id)
+        if not location.is_active:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Location {location.name} is inactive")
+        return location
+
+    @staticmethod
+    def _ensure_name_available(db: Session, name: str, location_id: Optional[int] = None) -> None:
+        existing = db.query(Location.id).filter(func.lower(Location.name) == name.lower())
+        if location_id is not None:
+            existing = existing.filter(Location.id != location_id)
+        if existing.first():
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Location {name} already exists")
+
+    @staticmethod
+    def _clear_default(db: Session) -> None:
+        db.execute(
+            update(Location)
+            .where(Location.is_default.is_(True))
+            .values(is_default=False)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def create_location(db: Session, payload: LocationCreate) -> Location:
+        StockService._ensure_name_available(db, payload.name)
+        if payload.is_default:
+            StockService._clear_default(db)
+        location = Location(**payload.model_dump())
+        db.add(location)
+        db.commit()
+        db.refresh(location)
+        return location
+
+    @staticmethod
+    def update_location(db: Session, location_id: int, payload: LocationUpdate) -> Location:
+        location = StockService.get_location(db, location_id)
+        update_data = payload.model_dump(exclude_unset=True)
+        if update_data.get("name") is not None:
+            update_data["name"] = update_data["name"].strip()
+            StockService._ensure_name_available(db, update_data["name"], location_id)
+        if update_data.get("is_default") is False and location.is_default:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Mark another location as default instead",
+            )
+        if update_data.get("is_default") and not location.is_default:
+            StockService._clear_default(db)
+        if update_data.get("is_active") is False and (location.is_default or update_data.get("is_default")):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The default location cannot be deactivated")
+
+        for field, value in update_data.items():
+            if value is not None:
+                setattr(location, field, value)
+        db.commit()
+        db.refresh(location)
+        return location
+
+    # --- stock movements ---
+
+    @staticmethod
+    def apply_bill(
+        db: Session,
+        *,
+        bill_type: BillType,
+        location: Location,
+        quantity_by_item_id: dict[int, int],
+        model_numbers_by_item_id: dict[int, str],
+    ) -> dict[int, int]:
+        """
+        Move a bill's stock at one location with one statement per item, in
+        item id order so two multi-item bills cannot deadlock:
+        sells run a conditional UPDATE ... WHERE quantity >= :q RETURNING,
+        buys an INSERT ... ON CONFLICT DO UPDATE that adds to the row.
+        Returns the new quantity at the location per item id.
+        """
+        new_quantities: dict[int, int] = {}
+        for item_id in sorted(quantity_by_item_id):
+            quantity = quantity_by_item_id[item_id]
+            if bill_type == BillType.sell:
+                stmt = (
+                    update(StockLevel)
+                    .where(
+                        StockLevel.item_id == item_id,
+                        StockLevel.location_id == location.id,
+                        StockLevel.quantity >= quantity,
+                    )
+                    .values(quantity=StockLevel.quantity - quantity, updated_at=func.now())
+                )
+            else:
+                stmt = insert(StockLevel).values(item_id=item_id, location_id=location.id, quantity=quantity)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[StockLevel.item_id, StockLevel.location_id],
+                    set_={"quantity": StockLevel.quantity + stmt.excluded.quantity, "updated_at": func.now()},
+                )
+            new_quantity = db.execute(
+                stmt.returning(StockLevel.quantity).execution_options(synchronize_session=False)
+            ).scalar_one_or_none()
+            if new_quantity is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Not enough stock for {model_numbers_by_item_id[item_id]} at {location.name}",
+                )
+            new_quantities[item_id] = new_quantity
+        return new_quantities
+
+    @staticmethod
+    def set_item_quantity(db: Session, item_id: int, quantity: int) -> tuple[int, int]:
+        """
+        Make an item's total stock `quantity` by adjusting its row at the
+        default location; stock held at other locations is left as is.
+        Used when a quantity is set directly through the item endpoints.
+        Returns the default location id and the new quantity there.
+        """
+        default_location = StockService.resolve_location(db, None)
+        levels = db.execute(
+            select(StockLevel.location_id, StockLevel.quantity)
+            .where(StockLevel.item_id == item_id)
+            .with_for_update()
+        ).all()
+        elsewhere = sum(level.quantity for level in levels if level.location_id != default_location.id)
+        if quantity < elsewhere:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Quantity cannot be less than the {elsewhere} unit(s) held at other locations",
+            )
+
+        stmt = insert(StockLevel).values(item_id=item_id, location_id=default_location.id, quantity=quantity - elsewhere)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StockLevel.item_id, StockLevel.location_id],
+            set_={"quantity": stmt.excluded.quantity, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+        return default_location.id, quantity - elsewhere
+
+    # --- maintained totals ---
+
+    @staticmethod
+    def refresh_item_totals(db: Session, item_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Set items.quantity to the sum of the items' stock levels and return
+        the new totals. The item rows are locked (in id order) before the
+        sum is read, so a refresh that waited on another one always sums
+        that one's committed stock too and never writes an older total.
+        FOR NO KEY UPDATE, not FOR UPDATE: bills take FOR KEY SHARE on their
+        items (foreign key checks, in line order) and must not queue on it.
+        """
+        item_ids = sorted(set(item_ids))
+        if not item_ids:
+            return {}
+
+        db.execute(select(Item.id).where(Item.id.in_(item_ids)).order_by(Item.id).with_for_update(key_share=True))
+        totals = (
+            select(StockLevel.item_id, func.sum(StockLevel.quantity).label("quantity"))
+            .where(StockLevel.item_id.in_(item_ids))
+            .group_by(StockLevel.item_id)
+            .subquery()
+        )
+        rows = db.execute(
+            update(Item)
+            .where(Item.id == totals.c.item_id)
+            .values(quantity=totals.c.quantity)
+            .returning(Item.id, Item.quantity)
+            .execution_options(synchronize_session=False)
+        ).all()
+        return {row.id: row.quantity for row in rows}
+
+    @staticmethod
+    def refresh_totals_after_commit(item_ids: Iterable[int]) -> dict[int, int]:
+        """
+        Refresh item totals in a short transaction of their own after a bill
+        has committed. Failures are logged and corrected by reconcile_item_totals.
+        """
+        item_ids = set(item_ids)
+        if not item_ids:
+            return {}
+        db = SessionLocal()
+        try:
+            totals = StockService.refresh_item_totals(db, item_ids)
+            db.commit()
+            return totals
+        except Exception as e:
+            db.rollback()
+            logger.error(f"❌ Error refreshing stock totals for items {sorted(item_ids)}: {str(e)}")
+            return {}
+        finally:
+            db.close()
+
+    @staticmethod
+    def reconcile_item_totals(db: Session) -> int:
+        """Refresh every item whose total drifted from its stock levels; returns how many"""
+        totals = (
+            select(StockLevel.item_id, func.sum(StockLevel.quantity).label("quantity"))
+            .group_by(StockLevel.item_id)
+            .subquery()
+        )
+        drifted_ids = db.execute(
+            select(Item.id)
+            .join(totals, totals.c.item_id == Item.id)
+            .where(Item.quantity != totals.c.quantity)
+        ).scalars().all()
+        StockService.refresh_item_totals(db, drifted_ids)
+        return len(drifted_ids)
+
+    # --- reads ---
+
+    @staticmethod
+    def list_location_stock(
+        db: Session,
+        location_id: int,
+        *,
+        low_stock_threshold: int,
+        low_stock_only: bool = False,
+    ) -> list[LocationStockLevel]:
+        """Stock held at one location, optionally only items below the threshold there"""
+        stock_query = (
+            db.query(StockLevel.item_id, Item.model_number, Item.name, StockLevel.quantity)
+            .join(Item, Item.id == StockLevel.item_id)
+            .filter(StockLevel.location_id == location_id)
+        )
+        if low_stock_only:
+            stock_query = stock_query.filter(StockLevel.quantity < low_stock_threshold)
+        rows = stock_query.order_by(Item.name.asc(), Item.id.asc()).all()
+        return [
+            LocationStockLevel(
+                item_id=row.item_id,
+                model_number=row.model_number,
+                name=row.name,
+                quantity=row.quantity,
+                is_low_stock=row.quantity < low_stock_threshold,
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def item_stock(db: Session, item_id: int) -> list[ItemStockLevel]:
+        """An item's stock per location"""
+        rows = (
+            db.query(StockLevel.location_id, Location.name.label("location_name"), StockLevel.quantity)
+            .join(Location, Location.id == StockLevel.location_id)
+            .filter(StockLevel.item_id == item_id)
+            .order_by(Location.name.asc())
+            .all()
+        )
+        return [ItemStockLevel.model_validate(row._asdict()) for row in rows]
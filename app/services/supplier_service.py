@@ -1,14 +1,37 @@
-from decimal import Decimal
-from typing import Iterable, List, Optional
+from typing import Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, or_
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
-from app.models.bill import Bill, BillType
 from app.models.supplier import Supplier
 from app.schemas.supplier import SupplierCreate, SupplierDetailResponse, SupplierListItem, SupplierSummary, SupplierUpdate
 from app.services.financial_service import FinancialService
+from app.services.pagination import Pagination
+from app.services.projection import Projection
+from app.services.search_service import SearchService
+
+
+# Sparse fieldsets for the supplier lists; the nested summary is only in the full response
+SUPPLIER_PROJECTION = Projection(
+    SupplierListItem,
+    columns={
+        "id": Supplier.id,
+        "supplier_name": Supplier.supplier_name,
+        "company_name": Supplier.company_name,
+        "contact_person": Supplier.contact_person,
+        "phone_number": Supplier.phone_number,
+        "email": Supplier.email,
+        "payable_balance": Supplier.payable_balance,
+        "is_active": Supplier.is_active,
+        "created_at": Supplier.created_at,
+    },
+    profiles={
+        "pos": ("id", "supplier_name", "company_name", "phone_number", "payable_balance"),
+    },
+    # keyset cursor columns
+    required=("id", "supplier_name"),
+)
 
 
 class SupplierService:
@@ -32,38 +55,21 @@ class SupplierService:
         return supplier
 
     @staticmethod
-    def _build_summary_map(db: Session, supplier_ids: Iterable[int]) -> dict[int, SupplierSummary]:
-        supplier_ids = list(supplier_ids)
-        if not supplier_ids:
-            return {}
-
-        rows = (
-            db.query(
-                Supplier.id.label("supplier_id"),
-                func.count(func.distinct(Bill.id)).label("number_of_purchase_bills"),
-                func.coalesce(func.sum(Bill.total_amount), 0).label("total_purchased_amount"),
-                func.coalesce(func.sum(Bill.paid_amount), 0).label("total_paid"),
-                Supplier.payable_balance.label("payable_balance"),
-            )
-            .outerjoin(Bill, Bill.supplier_id == Supplier.id)
-            .filter(Supplier.id.in_(supplier_ids))
-            .filter(or_(Bill.id.is_(None), Bill.bill_type == BillType.buy))
-            .group_by(Supplier.id)
-            .all()
+    def _summary(supplier: Supplier) -> SupplierSummary:
+        return SupplierSummary(
+            number_of_purchase_bills=supplier.purchase_bills_count,
+            total_purchased_amount=supplier.total_purchased,
+            payable_balance=supplier.payable_balance,
+            total_paid=supplier.total_paid,
         )
 
-        summary_map: dict[int, SupplierSummary] = {}
-        for row in rows:
-            summary_map[row.supplier_id] = SupplierSummary(
-                number_of_purchase_bills=int(row.number_of_purchase_bills or 0),
-                total_purchased_amount=Decimal(row.total_purchased_amount or 0),
-                payable_balance=Decimal(row.payable_balance or 0),
-                total_paid=Decimal(row.total_paid or 0),
-            )
-        return summary_map
+    @staticmethod
+    def page_cursor(item) -> str:
+        """Keyset cursor pointing just after the given list row."""
+        return Pagination.encode_cursor(item.supplier_name, item.id)
 
     @staticmethod
-    def _to_list_item(supplier: Supplier, summary: SupplierSummary) -> SupplierListItem:
+    def _to_list_item(supplier: Supplier, summary: Optional[SupplierSummary]) -> SupplierListItem:
         return SupplierListItem(
             id=supplier.id,
             supplier_name=supplier.supplier_name,
@@ -83,54 +89,54 @@ class SupplierService:
         *,
         include_inactive: bool = False,
         query: Optional[str] = None,
-    ) -> List[SupplierListItem]:
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_summary: bool = True,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> list:
         supplier_query = db.query(Supplier)
         if not include_inactive:
             supplier_query = supplier_query.filter(Supplier.is_active.is_(True))
 
-        if query:
-            q = f"%{query.strip()}%"
-            supplier_query = supplier_query.filter(
-                or_(
-                    Supplier.supplier_name.ilike(q),
-                    Supplier.company_name.ilike(q),
-                    Supplier.contact_person.ilike(q),
-                    Supplier.phone_number.ilike(q),
-                    Supplier.email.ilike(q),
-                )
+        if query and query.strip():
+            text_query, digits = SearchService.normalize_query(query)
+            search_columns = dict(
+                text_columns=[
+                    Supplier.supplier_name,
+                    Supplier.company_name,
+                    Supplier.contact_person,
+                    Supplier.email,
+                ],
+                phone_column=Supplier.phone_number,
+                text_query=text_query,
+                digits=digits,
+            )
+            supplier_query = supplier_query.filter(SearchService.match_filter(**search_columns)).order_by(
+                SearchService.rank(**search_columns).desc(),
+                Supplier.supplier_name.asc(),
             )
+        else:
+            if cursor:
+                after_name, after_id = Pagination.decode_cursor(cursor, (str, int))
+                supplier_query = supplier_query.filter(tuple_(Supplier.supplier_name, Supplier.id) > tuple_(after_name, after_id))
+            supplier_query = supplier_query.order_by(Supplier.supplier_name.asc(), Supplier.id.asc())
 
-        suppliers = supplier_query.order_by(Supplier.supplier_name.asc()).all()
-        summary_map = SupplierService._build_summary_map(db, [supplier.id for supplier in suppliers])
+        if limit is not None:
+            supplier_query = supplier_query.limit(limit)
 
+        if fields:
+            return SUPPLIER_PROJECTION.select(supplier_query, fields)
+
+        suppliers = supplier_query.all()
         return [
-            SupplierService._to_list_item(
-                supplier,
-                summary_map.get(
-                    supplier.id,
-                    SupplierSummary(
-                        number_of_purchase_bills=0,
-                        total_purchased_amount=Decimal("0"),
-                        payable_balance=supplier.payable_balance,
-                    ),
-                ),
-            )
+            SupplierService._to_list_item(supplier, SupplierService._summary(supplier) if include_summary else None)
             for supplier in suppliers
         ]
 
     @staticmethod
     def get_supplier_detail(db: Session, supplier_id: int) -> SupplierDetailResponse:
         supplier = SupplierService.get_supplier(db, supplier_id)
-        summary = SupplierService._build_summary_map(db, [supplier.id]).get(
-            supplier.id,
-            SupplierSummary(
-                number_of_purchase_bills=0,
-                total_purchased_amount=Decimal("0"),
-                payable_balance=supplier.payable_balance,
-            ),
-        )
-
-        list_item = SupplierService._to_list_item(supplier, summary)
+        list_item = SupplierService._to_list_item(supplier, SupplierService._summary(supplier))
         return SupplierDetailResponse(
             **list_item.model_dump(),
             address=supplier.address,
@@ -0,0 +1,173 @@
+"""
+Table-level version counters for ETag / Last-Modified on read endpoints
+"""
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+import logging
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app import oauth2
+from app.database import SessionLocal, get_db
+from app.models.table_version import TableVersion
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Tables whose writes are counted; read endpoints declare which of these they depend on
+TRACKED_TABLES = frozenset({
+    "bills",
+    "categories",
+    "customers",
+    "inventory_transactions",
+    "items",
+    "locations",
+    "payments",
+    "stock_levels",
+    "suppliers",
+})
+
+# Session.info key holding the tracked tables written in the current transaction
+_WRITTEN_TABLES_KEY = "written_tables"
+
+
+class TableVersionService:
+    """
+    Per-table change counters.
+
+    Every SessionLocal session records which tracked tables it writes to,
+    through ORM flushes or bulk update/delete/insert statements, and bumps
+    their counters with one statement as the last write of the same
+    transaction, so versions and rows commit together. The counter rows are
+    shared by every writer, so they are taken last (after stock and other
+    rows) and in table name order: held only for the commit, never deadlocking.
+    """
+
+    @staticmethod
+    def bump(db: Session, table_names) -> None:
+        """Increment the counters of the given tables in the session's transaction"""
+        table_names = sorted(set(table_names))
+        if not table_names:
+            return
+        stmt = insert(TableVersion).values([
+            {"table_name": table_name, "version": 1} for table_name in table_names
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def get_versions(db: Session, table_names) -> tuple[tuple[tuple[str, int], ...], datetime | None]:
+        """Return ((table, version), ...) in name order and the latest change time"""
+        table_names = sorted(set(table_names))
+        rows = db.execute(
+            select(TableVersion.table_name, TableVersion.version, TableVersion.updated_at)
+            .where(TableVersion.table_name.in_(table_names))
+        ).all()
+        by_name = {row.table_name: row for row in rows}
+        versions = tuple((table_name, by_name[table_name].version if table_name in by_name else 0) for table_name in table_names)
+        updated = [row.updated_at for row in rows]
+        return versions, max(updated) if updated else None
+
+    @staticmethod
+    def etag(request: Request, versions, user: User) -> str:
+        # The query string is part of the tag: different filters/pages are different representations.
+        # So is the user: some listings default to their alert threshold (users are not tracked)
+        digest = hashlib.sha1(
+            f"{request.url.path}?{request.url.query}|{versions}|{user.id}:{user.alert_threshold}".encode()
+        ).hexdigest()[:20]
+        return f'W/"{digest}"'
+
+    @staticmethod
+    def check_not_modified(db: Session, request: Request, response: Response, table_names, user: User) -> None:
+        """
+        Set ETag and Last-Modified on the response, or raise a 304 when the
+        client's If-None-Match / If-Modified-Since still matches.
+        If-Modified-Since only has one-second resolution, so it is consulted
+        only when the client sent no If-None-Match.
+        """
+        versions, last_modified = TableVersionService.get_versions(db, table_names)
+        etag = TableVersionService.etag(request, versions, user)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if last_modified is not None:
+            last_modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+            not_modified = etag in candidates or "*" in candidates
+        else:
+            not_modified = False
+            if_modified_since = request.headers.get("if-modified-since")
+            if if_modified_since and last_modified is not None:
+                try:
+                    not_modified = last_modified <= parsedate_to_datetime(if_modified_since)
+                except (TypeError, ValueError):
+                    not_modified = False
+
+        if not_modified:
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+
+def conditional_get(*table_names: str):
+    """
+    Route dependency: answer 304 Not Modified without running the endpoint
+    when none of the given tables changed since the client's copy.
+    """
+    unknown = set(table_names) - TRACKED_TABLES
+    if unknown:
+        raise ValueError(f"Untracked tables: {', '.join(sorted(unknown))}")
+
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(oauth2.get_current_user),
+    ) -> None:
+        TableVersionService.check_not_modified(db, request, response, table_names, current_user)
+
+    return Depends(dependency)
+
+
+# --- write tracking on every SessionLocal session ---
+
+def _mark_written(session: Session, table_name: str | None) -> None:
+    if table_name in TRACKED_TABLES:
+        session.info.setdefault(_WRITTEN_TABLES_KEY, set()).add(table_name)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _track_flushed_tables(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(type(instance), "__table__", None)
+        if table is not None:
+            _mark_written(session, table.name)
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _mark_written(orm_execute_state.session, getattr(table, "name", None))
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _bump_written_tables(session):
+    # commit() only flushes after this hook; flush now so pending writes are tracked too
+    session.flush()
+    written = session.info.pop(_WRITTEN_TABLES_KEY, None)
+    if written:
+        TableVersionService.bump(session, written)
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _forget_written_tables(session):
+    session.info.pop(_WRITTEN_TABLES_KEY, None)
@@ -0,0 +1,4 @@
+"""
+Benchmarks against the configured database, run from the repository root:
+python -m benchmarks.<name> --help
+"""
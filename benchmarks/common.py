@@ -0,0 +1,130 @@
+"""
+Shared helpers for the benchmarks: fixtures, one-bill sales, percentiles
+and the argument parser scaffolding.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+# Installs every session/engine hook the API installs (table versions, query
+# stats), so the benchmarks measure the same write path as the endpoints
+import app.main  # noqa: F401
+from app import utils
+from app.database import SessionLocal
+from app.models.bill import Bill
+from app.models.category import Category
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.bill import BillCreateItem
+from app.services.billing_service import BillingService
+from app.services.stock_service import StockService
+
+
+def make_parser(doc: str) -> argparse.ArgumentParser:
+    """Argument parser described by the second line of a benchmark's docstring"""
+    return argparse.ArgumentParser(description=doc.splitlines()[1])
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def create_fixture(
+    purpose: str,
+    item_count: int,
+    stock: int,
+    user_count: int = 1,
+    alert_threshold: int = 5,
+) -> tuple[int, list[int], list[str], list[int]]:
+    """
+    Create a throwaway category with `item_count` items stocked at the
+    default location, and `user_count` users with the given alert threshold.
+    Returns the category id, item ids, model numbers and user ids.
+    """
+    db = SessionLocal()
+    try:
+        suffix = uuid.uuid4().hex[:8].upper()
+        category = Category(name=f"bench-{suffix}", description=f"{purpose} benchmark")
+        db.add(category)
+        db.flush()
+        items = []
+        for index in range(item_count):
+            item = Item(
+                name=f"Bench item {suffix}-{index}",
+                quantity=stock,
+                buying_price=Decimal("10.00"),
+                selling_price=Decimal("12.50"),
+                model_number=f"BENCH-{suffix}-{index}",
+                category_id=category.id,
+            )
+            db.add(item)
+            db.flush()
+            StockService.set_item_quantity(db, item.id, stock)
+            items.append(item)
+        users = [
+            User(
+                email=f"bench-{suffix.lower()}-{index}@example.com",
+                password=utils.hash(uuid.uuid4().hex),
+                notification_enabled=False,
+                alert_threshold=alert_threshold,
+            )
+            for index in range(user_count)
+        ]
+        db.add_all(users)
+        db.commit()
+        return category.id, [item.id for item in items], [item.model_number for item in items], [user.id for user in users]
+    finally:
+        db.close()
+
+
+def remove_fixture(category_id: int, user_ids: list[int], bill_ids: list[int]) -> None:
+    """Delete the bills, then the category (cascading to its items, stock, alerts and roll-ups) and the users"""
+    db = SessionLocal()
+    try:
+        if bill_ids:
+            db.execute(delete(Bill).where(Bill.id.in_(bill_ids)))
+        db.execute(delete(Category).where(Category.id == category_id))
+        db.execute(delete(User).where(User.id.in_(user_ids)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def sell_once(user_id: int, model_number: str, quantity: int = 1) -> tuple[float, int | None, str | None]:
+    """Create one sell bill of one line; return (seconds, bill id or None, error or None)"""
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        user = db.get(User, user_id)
+        bill = BillingService.create_bill(
+            db=db,
+            user=user,
+            bill_type="sell",
+            items=[BillCreateItem(model_number=model_number, quantity=quantity)],
+        )
+        return time.perf_counter() - started, bill.id, None
+    except HTTPException as e:
+        db.rollback()
+        return time.perf_counter() - started, None, str(e.detail)
+    finally:
+        db.close()
+
+
+def report_sales(results: list[tuple[float, int | None, str | None]], elapsed: float) -> list[int]:
+    """Print success count, throughput and latency of sell_once results; return the bill ids"""
+    latencies = [seconds * 1000 for seconds, _, _ in results]
+    bill_ids = [bill_id for _, bill_id, _ in results if bill_id is not None]
+    print(f"Succeeded     : {len(bill_ids)}  rejected: {len(results) - len(bill_ids)}")
+    print(f"Throughput    : {len(results) / elapsed:.1f} bills/s over {elapsed:.2f}s")
+    print(
+        f"Latency (ms)  : p50 {statistics.median(latencies):.1f}  "
+        f"p95 {percentile(latencies, 0.95):.1f}  max {max(latencies):.1f}"
+    )
+    return bill_ids
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Low-stock alert benchmark for BillingService.create_bill
+Runs many concurrent one-line sell bills against a few low-stock items in the
+configured database, reports throughput and latency, and checks that every
+item and user ends up with exactly one open low_stock_alerts row.
+Creates a throwaway category, items stocked at the default location and
+users whose alert threshold is above that stock, so every sale syncs an
+alert; removes them, their bills and alerts again unless --keep is given.
+
+Usage: python -m benchmarks.low_stock_alerts [--bills 200] [--concurrency 16] [--items 4] [--users 2]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.models.item import Item
+from app.models.low_stock_alert import LowStockAlert
+from benchmarks.common import create_fixture, make_parser, remove_fixture, report_sales, sell_once
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--bills", type=int, default=200, help="sell bills to create")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent tills")
+    parser.add_argument("--items", type=int, default=4, help="low-stock items the bills are spread over")
+    parser.add_argument("--users", type=int, default=2, help="users the bills are spread over")
+    parser.add_argument("--keep", action="store_true", help="keep the items, users, bills and alerts afterwards")
+    args = parser.parse_args()
+
+    # Exactly enough for every bill; the threshold sits above it, so each sale leaves the item low
+    stock = -(-args.bills // args.items)
+    category_id, _, model_numbers, user_ids = create_fixture(
+        "low stock alert", args.items, stock, user_count=args.users, alert_threshold=stock + 1
+    )
+    # Bill n sells item n % items for user (n // items) % users, so every pair sees concurrent bills
+    sales = [
+        (user_ids[(index // args.items) % args.users], model_numbers[index % args.items])
+        for index in range(args.bills)
+    ]
+    print(
+        f"{args.items} items x stock {stock}, {args.users} users, "
+        f"{args.bills} bills, concurrency {args.concurrency}"
+    )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda sale: sell_once(*sale), sales))
+    elapsed = time.perf_counter() - started
+
+    bill_ids = report_sales(results, elapsed)
+    expected_pairs = {
+        (model_number, user_id)
+        for (user_id, model_number), (_, bill_id, _) in zip(sales, results)
+        if bill_id is not None
+    }
+
+    db = SessionLocal()
+    try:
+        open_alerts = db.execute(
+            select(Item.model_number, LowStockAlert.user_id, func.count())
+            .join(Item, Item.id == LowStockAlert.item_id)
+            .where(
+                Item.category_id == category_id,
+                LowStockAlert.user_id.in_(user_ids),
+                LowStockAlert.is_resolved == False,
+            )
+            .group_by(Item.model_number, LowStockAlert.user_id)
+        ).all()
+    finally:
+        db.close()
+    open_counts = {(model_number, user_id): count for model_number, user_id, count in open_alerts}
+    duplicated = sum(1 for count in open_counts.values() if count > 1)
+    missing = len(expected_pairs - open_counts.keys())
+    print(
+        f"Open alerts   : {sum(open_counts.values())} for {len(expected_pairs)} item/user pairs, "
+        f"duplicated {duplicated}, missing {missing} "
+        f"{'OK' if not duplicated and not missing else 'MISMATCH'}"
+    )
+
+    if not args.keep:
+        remove_fixture(category_id, user_ids, bill_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Customer and supplier search benchmark for SearchService
+Times the old unranked ILIKE '%q%' filter against the trigram-indexed,
+ranked SearchService query on the customers and suppliers tables of the
+configured database and reports latencies for both.
+Seeds throwaway customers and suppliers first (--rows per table) and
+removes them again unless --keep is given.
+
+Usage: python -m benchmarks.party_search [--rows 20000] [--repeat 50] [--limit 20] [--query perera ...]
+"""
+
+import random
+import statistics
+import time
+import uuid
+
+from sqlalchemy import delete, insert, or_, select, text
+
+from app.database import SessionLocal
+from app.models.customer import Customer
+from app.models.supplier import Supplier
+from app.services.search_service import SearchService
+from benchmarks.common import make_parser, percentile
+
+FIRST_NAMES = ("Nimal", "Kamal", "Sunil", "Chamari", "Dilini", "Ruwan", "Tharindu", "Ishara", "Nuwan", "Sanduni")
+LAST_NAMES = ("Perera", "Silva", "Fernando", "Jayasinghe", "Bandara", "Wickramasinghe", "Herath", "Dissanayake")
+COMPANY_WORDS = ("Traders", "Hardware", "Enterprises", "Distributors", "Holdings", "Stores", "Electricals")
+DEFAULT_QUERIES = ("perera", "chamari silva", "hardware", "077 12", "gmail")
+
+# Searched columns per table: (model, text columns, phone column, listing order)
+TABLES = {
+    "customers": (Customer, (Customer.full_name, Customer.email), Customer.phone_number, Customer.full_name),
+    "suppliers": (
+        Supplier,
+        (Supplier.supplier_name, Supplier.company_name, Supplier.contact_person, Supplier.email),
+        Supplier.phone_number,
+        Supplier.supplier_name,
+    ),
+}
+
+
+def seed(rows: int, marker: str) -> None:
+    """Insert `rows` generated customers and suppliers tagged with marker in their notes"""
+    rng = random.Random(marker)
+    customers, suppliers = [], []
+    for index in range(rows):
+        person = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        phone = f"07{rng.randint(0, 9)}{rng.randint(0, 9999999):07d}"
+        email = f"{person.lower().replace(' ', '.')}{index}@{rng.choice(('gmail.com', 'yahoo.com', 'example.lk'))}"
+        customers.append({"full_name": person, "phone_number": phone, "email": email, "notes": marker})
+        suppliers.append({
+            "supplier_name": f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_WORDS)}",
+            "company_name": f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_WORDS)} (Pvt) Ltd",
+            "contact_person": person,
+            "phone_number": phone,
+            "email": email,
+            "notes": marker,
+        })
+
+    db = SessionLocal()
+    try:
+        db.execute(insert(Customer), customers)
+        db.execute(insert(Supplier), suppliers)
+        db.commit()
+        # Fresh statistics so the planner sees the trigram indexes as worth using
+        db.execute(text("ANALYZE customers"))
+        db.execute(text("ANALYZE suppliers"))
+        db.commit()
+    finally:
+        db.close()
+
+
+def old_query(table: str, query: str):
+    """The unranked ILIKE '%q%' filter the search endpoints used before SearchService"""
+    model, text_columns, phone_column, order_column = TABLES[table]
+    pattern = f"%{query.strip()}%"
+    return (
+        select(model.id)
+        .where(model.is_active.is_(True), or_(*(column.ilike(pattern) for column in (*text_columns, phone_column))))
+        .order_by(order_column.asc())
+    )
+
+
+def ranked_query(table: str, query: str, limit: int):
+    """The query built by CustomerService/SupplierService.list_* for a search"""
+    model, text_columns, phone_column, order_column = TABLES[table]
+    text_query, digits = SearchService.normalize_query(query)
+    search_columns = dict(text_columns=text_columns, phone_column=phone_column, text_query=text_query, digits=digits)
+    return (
+        select(model.id)
+        .where(model.is_active.is_(True), SearchService.match_filter(**search_columns))
+        .order_by(SearchService.rank(**search_columns).desc(), order_column.asc())
+        .limit(limit)
+    )
+
+
+def time_query(statement, repeat: int) -> tuple[list[float], int]:
+    """Run a statement `repeat` times after one warm-up; return latencies (ms) and the row count"""
+    db = SessionLocal()
+    try:
+        rows = len(db.execute(statement).all())
+        latencies = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            db.execute(statement).all()
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies, rows
+    finally:
+        db.close()
+
+
+def report(label: str, latencies: list[float], rows: int) -> None:
+    print(
+        f"  {label:<8}: p50 {statistics.median(latencies):.2f}  p95 {percentile(latencies, 0.95):.2f}  "
+        f"max {max(latencies):.2f} ms  ({rows} rows)"
+    )
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=20000, help="customers and suppliers to seed (0 to use existing data)")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per query")
+    parser.add_argument("--limit", type=int, default=20, help="limit of the ranked search (the endpoint default)")
+    parser.add_argument("--query", action="append", default=None, help="search text, may be repeated")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded customers and suppliers afterwards")
+    args = parser.parse_args()
+
+    marker = f"bench-{uuid.uuid4().hex[:8]}"
+    if args.rows:
+        started = time.perf_counter()
+        seed(args.rows, marker)
+        print(f"Seeded {args.rows} customers and suppliers in {time.perf_counter() - started:.1f}s")
+
+    try:
+        for table in TABLES:
+            print(f"{table} (latency ms over {args.repeat} runs)")
+            for query in args.query or DEFAULT_QUERIES:
+                print(f" '{query}'")
+                report("ilike", *time_query(old_query(table, query), args.repeat))
+                report("trigram", *time_query(ranked_query(table, query, args.limit), args.repeat))
+    finally:
+        if args.rows and not args.keep:
+            db = SessionLocal()
+            try:
+                db.execute(delete(Customer).where(Customer.notes == marker))
+                db.execute(delete(Supplier).where(Supplier.notes == marker))
+                db.commit()
+            finally:
+                db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark for the API response classes
+Compares the stock JSONResponse with DefaultJSONResponse (orjson) for every
+GET route that declares a response_model, using generated sample data.
+
+Usage: python -m benchmarks.serialization [--rows 500] [--repeat 20]
+"""
+
+import enum
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Literal, Union, get_args, get_origin
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+from app.main import app
+from app.responses import DefaultJSONResponse
+from benchmarks.common import make_parser
+
+
+def sample_value(annotation: Any, index: int) -> Any:
+    """Build a representative value for a field annotation"""
+    origin = get_origin(annotation)
+    if origin is Literal:
+        options = get_args(annotation)
+        return options[index % len(options)]
+    if origin is Union or (origin is not None and type(None) in get_args(annotation)):
+        options = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return sample_value(options[0], index) if options else None
+    if origin in (list, set, tuple):
+        (inner, *_) = get_args(annotation) or (str,)
+        return [sample_value(inner, index * 10 + offset) for offset in range(3)]
+    if origin is dict or annotation is dict:
+        return {f"key_{index}": index}
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return {
+                name: sample_value(field.annotation, index)
+                for name, field in annotation.model_fields.items()
+            }
+        if issubclass(annotation, enum.Enum):
+            return list(annotation)[index % len(annotation)]
+        if issubclass(annotation, bool):
+            return index % 2 == 0
+        if issubclass(annotation, int):
+            return index
+        if issubclass(annotation, float):
+            return index * 1.25
+        if issubclass(annotation, Decimal):
+            return Decimal(f"{index * 13 % 100000}.{index % 100:02d}")
+        if issubclass(annotation, datetime):
+            return datetime(2026, 1, 1, 9, 30, index % 60, index % 1000000)
+        if issubclass(annotation, date):
+            return date(2026, 1, 1 + index % 28)
+    if "Email" in getattr(annotation, "__name__", ""):
+        return f"user{index}@example.com"
+    return f"value {index} ünïcode"
+
+
+def sample_response(response_model: Any, rows: int) -> Any:
+    if get_origin(response_model) is list:
+        (inner,) = get_args(response_model)
+        return [sample_value(inner, index) for index in range(rows)]
+    return sample_value(response_model, 1)
+
+
+def timed(render, content, repeat: int) -> tuple[float, bytes]:
+    body = render(content)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        render(content)
+    return (time.perf_counter() - started) / repeat * 1000, body
+
+
+def main():
+    parser = make_parser(__doc__)
+    parser.add_argument("--rows", type=int, default=500, help="rows per list response")
+    parser.add_argument("--repeat", type=int, default=20, help="renders per measurement")
+    args = parser.parse_args()
+
+    stock = JSONResponse(None)
+    fast = DefaultJSONResponse(None)
+
+    print(f"{'route':<45} {'json ms':>9} {'orjson ms':>10} {'speedup':>8} {'json B':>9} {'orjson B':>9}  same")
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods or route.response_model is None:
+            continue
+        adapter = TypeAdapter(route.response_model)
+        try:
+            content = adapter.dump_python(adapter.validate_python(sample_response(route.response_model, args.rows)), mode="json")
+        except Exception as e:
+            print(f"{route.path:<45} skipped: {type(e).__name__}")
+            continue
+
+        stock_ms, stock_body = timed(stock.render, content, args.repeat)
+        fast_ms, fast_body = timed(fast.render, content, args.repeat)
+        same = stock_body == fast_body
+        print(
+            f"{route.path:<45} {stock_ms:>9.3f} {fast_ms:>10.3f} {stock_ms / max(fast_ms, 1e-9):>7.1f}x "
+            f"{len(stock_body):>9} {len(fast_body):>9}  {'yes' if same else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
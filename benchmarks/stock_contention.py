@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Stock contention benchmark for BillingService.create_bill
+Runs many concurrent one-line sell bills against a single item in the
+configured database and reports throughput, latency and the final stock.
+Creates a throwaway category, user and item stocked at the default
+location, and removes them and the bills again unless --keep is given.
+
+Usage: python -m benchmarks.stock_contention [--bills 200] [--concurrency 16] [--quantity 1]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from app.database import SessionLocal
+from app.models.item import Item
+from benchmarks.common import create_fixture, make_parser, remove_fixture, report_sales, sell_once
+
+
+def main() -> None:
+    parser = make_parser(__doc__)
+    parser.add_argument("--bills", type=int, default=200, help="sell bills to create")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent tills")
+    parser.add_argument("--quantity", type=int, default=1, help="units sold per bill")
+    parser.add_argument("--stock", type=int, default=None, help="starting stock (default: exactly enough)")
+    parser.add_argument("--keep", action="store_true", help="keep the item and bills afterwards")
+    args = parser.parse_args()
+
+    stock = args.stock if args.stock is not None else args.bills * args.quantity
+    category_id, (item_id,), (model_number,), (user_id,) = create_fixture("stock contention", 1, stock)
+    print(f"Item {model_number}: stock {stock}, {args.bills} bills x {args.quantity}, concurrency {args.concurrency}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda _: sell_once(user_id, model_number, args.quantity),
+            range(args.bills),
+        ))
+    elapsed = time.perf_counter() - started
+
+    bill_ids = report_sales(results, elapsed)
+    db = SessionLocal()
+    try:
+        final_stock = db.query(Item.quantity).filter(Item.id == item_id).scalar()
+    finally:
+        db.close()
+    expected_stock = stock - len(bill_ids) * args.quantity
+    print(f"Final stock   : {final_stock} (expected {expected_stock}) "
+          f"{'OK' if final_stock == expected_stock and final_stock >= 0 else 'MISMATCH'}")
+
+    if not args.keep:
+        remove_fixture(category_id, [user_id], bill_ids)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Shared fixtures. The tests run against a real PostgreSQL database (the
+services rely on ON CONFLICT, RETURNING, pg_trgm and transaction ids), named
+by TEST_DATABASE_NAME (default: pujana_inventory_test) on the server from
+.env. It is created and migrated to head on first use, and every table is
+emptied after each test. Without a reachable server the tests are skipped.
+"""
+import os
+
+os.environ["DATABASE_NAME"] = os.environ.get("TEST_DATABASE_NAME", "pujana_inventory_test")
+
+from decimal import Decimal
+from pathlib import Path
+import uuid
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app import oauth2
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.main import app
+from app.models.base import Base
+from app.models.category import Category
+from app.models.item import Item
+from app.models.user import User
+from app.services.stock_service import StockService
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _create_database() -> None:
+    server = create_engine(
+        f"postgresql://{settings.database_username}:{settings.database_password}"
+        f"@{settings.database_hostname}:{settings.database_port}/postgres",
+        isolation_level="AUTOCOMMIT",
+    )
+    try:
+        with server.connect() as connection:
+            exists = connection.execute(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"), {"name": settings.database_name}
+            ).scalar()
+            if not exists:
+                connection.execute(text(f'CREATE DATABASE "{settings.database_name}"'))
+    finally:
+        server.dispose()
+
+
+@pytest.fixture(scope="session")
+def database():
+    try:
+        _create_database()
+    except OperationalError as e:
+        pytest.skip(f"PostgreSQL is not reachable: {e.orig}")
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    command.upgrade(config, "head")
+    yield engine
+
+
+@pytest.fixture(autouse=True)
+def _empty_tables(request):
+    yield
+    if "database" not in request.fixturenames:
+        return
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+        connection.execute(text("INSERT INTO locations (name, is_default) VALUES ('Main store', true)"))
+
+
+@pytest.fixture
+def db(database):
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_user(db):
+    def make(alert_threshold: int = 5) -> User:
+        user = User(
+            email=f"user-{uuid.uuid4().hex[:8]}@example.com",
+            password="not-a-password-hash",
+            notification_enabled=False,
+            alert_threshold=alert_threshold,
+        )
+        db.add(user)
+        db.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def user(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def make_item(db):
+    """Create an item (in a new category) stocked at the default location"""
+    def make(quantity: int = 10, selling_price: str = "12.50", buying_price: str = "10.00") -> Item:
+        suffix = uuid.uuid4().hex[:8].upper()
+        category = Category(name=f"category-{suffix}")
+        db.add(category)
+        db.flush()
+        item = Item(
+            name=f"Item {suffix}",
+            quantity=quantity,
+            buying_price=Decimal(buying_price),
+            selling_price=Decimal(selling_price),
+            model_number=f"MDL-{suffix}",
+            category_id=category.id,
+        )
+        db.add(item)
+        db.flush()
+        StockService.set_item_quantity(db, item.id, quantity)
+        db.commit()
+        return item
+    return make
+
+
+@pytest.fixture
+def client_for(database):
+    """TestClient authenticated as the given user (startup jobs are not run)"""
+    def client(user: User) -> TestClient:
+        app.dependency_overrides[oauth2.get_current_user] = lambda: user
+        return TestClient(app)
+    yield client
+    app.dependency_overrides.pop(oauth2.get_current_user, None)
@@ -0,0 +1,15 @@
+from app.config import settings
+from app.services import scheduler
+
+
+def test_only_listed_admins_can_trigger_a_job(make_user, client_for, monkeypatch):
+    admin, clerk = make_user(), make_user()
+    monkeypatch.setattr(settings, "admin_emails", f"someone@example.com, {admin.email.upper()}")
+    triggered = []
+    monkeypatch.setitem(scheduler.TRACKED_JOBS, "expire_draft_bills", lambda **kwargs: triggered.append(kwargs))
+
+    assert client_for(clerk).post("/admin/jobs/expire_draft_bills/run").status_code == 403
+    assert triggered == []
+
+    assert client_for(admin).post("/admin/jobs/expire_draft_bills/run").status_code == 202
+    assert len(triggered) == 1
@@ -0,0 +1,44 @@
+from sqlalchemy import update
+
+from app.models.item import Item
+
+
+def sync(client, since):
+    response = client.get("/sync/items", params={"since": since})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_a_full_sync_returns_the_catalogue_and_a_version(user, make_item, client_for):
+    items = [make_item(), make_item()]
+
+    changes = sync(client_for(user), 0)
+
+    assert changes["version"] > 0
+    assert [item["id"] for item in changes["items"]] == [item.id for item in items]
+    assert changes["deleted_item_ids"] == []
+
+
+def test_an_incremental_sync_returns_only_changes_and_tombstones(db, user, make_item, client_for):
+    updated, deleted, untouched = make_item(), make_item(), make_item()
+    client = client_for(user)
+    version = sync(client, 0)["version"]
+
+    db.execute(update(Item).where(Item.id == updated.id).values(name="Renamed item"))
+    db.commit()
+    assert client.delete(f"/items/{deleted.id}").status_code == 204
+
+    changes = sync(client, version)
+    assert [(item["id"], item["name"]) for item in changes["items"]] == [(updated.id, "Renamed item")]
+    assert changes["deleted_item_ids"] == [deleted.id]
+    assert untouched.id not in [item["id"] for item in changes["items"]]
+
+    unchanged = sync(client, changes["version"])
+    assert unchanged["items"] == [] and unchanged["deleted_item_ids"] == []
+
+
+def test_a_version_ahead_of_the_server_is_rejected(user, client_for):
+    client = client_for(user)
+    version = sync(client, 0)["version"]
+
+    assert client.get("/sync/items", params={"since": version + 1000}).status_code == 400
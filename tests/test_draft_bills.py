@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select
+
+from app.database import SessionLocal
+from app.models.bill import Bill
+from app.models.draft_bill import DraftBillLine
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.draft_bill import DraftBillCreate
+from app.services.draft_bill_service import DraftBillService
+
+
+def start_draft(client, item, quantity):
+    draft = client.post("/drafts/", json={"bill_type": "sell"}).json()
+    response = client.post(f"/drafts/{draft['id']}/lines", json={"model_number": item.model_number, "quantity": quantity})
+    assert response.status_code == 200
+    return draft["id"]
+
+
+def test_finalize_creates_the_bill_and_deletes_the_draft(db, user, make_item, client_for):
+    item = make_item(quantity=10)
+    client = client_for(user)
+    draft_id = start_draft(client, item, 3)
+
+    response = client.post(f"/drafts/{draft_id}/finalize", json={})
+
+    assert response.status_code == 201
+    assert response.json()["subtotal_amount"] == "37.50"
+    assert client.get(f"/drafts/{draft_id}").status_code == 404
+    assert db.execute(select(func.count()).select_from(Bill)).scalar() == 1
+
+
+def test_drafts_are_private_to_their_creator(user, make_user, make_item, client_for):
+    draft_id = start_draft(client_for(user), make_item(), 1)
+    other = client_for(make_user())
+
+    assert other.get(f"/drafts/{draft_id}").status_code == 404
+    assert other.post(f"/drafts/{draft_id}/lines", json={"model_number": "X", "quantity": 1}).status_code == 404
+    assert other.post(f"/drafts/{draft_id}/finalize", json={}).status_code == 404
+    assert other.delete(f"/drafts/{draft_id}").status_code == 404
+
+
+def test_finalize_answers_409_when_an_item_was_deleted(db, user, make_item, client_for):
+    kept, deleted = make_item(), make_item()
+    client = client_for(user)
+    draft_id = start_draft(client, kept, 1)
+    client.post(f"/drafts/{draft_id}/lines", json={"model_number": deleted.model_number, "quantity": 1})
+    db.execute(delete(Item).where(Item.id == deleted.id))
+    db.commit()
+
+    response = client.post(f"/drafts/{draft_id}/finalize", json={})
+
+    assert response.status_code == 409
+    assert db.execute(select(func.count()).select_from(Bill)).scalar() == 0
+
+
+def test_concurrent_adds_do_not_reserve_more_than_the_stock(db, make_user, make_item):
+    item = make_item(quantity=4)
+    users = [make_user() for _ in range(8)]
+    draft_ids = [
+        DraftBillService.create_draft(db, DraftBillCreate(bill_type="sell"), user).id
+        for user in users
+    ]
+
+    def add_one(draft_id_and_user):
+        draft_id, user_id = draft_id_and_user
+        session = SessionLocal()
+        try:
+            DraftBillService.add_line(session, draft_id, session.get(User, user_id), item.model_number, 1)
+            return True
+        except HTTPException:
+            session.rollback()
+            return False
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        added = list(pool.map(add_one, [(draft_id, user.id) for draft_id, user in zip(draft_ids, users)]))
+
+    reserved = db.execute(select(func.sum(DraftBillLine.quantity))).scalar()
+    assert sum(added) == reserved == 4
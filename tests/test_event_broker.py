@@ -0,0 +1,43 @@
+import select
+import time
+
+from app.database import engine
+from app.services.event_broker import NOTIFY_CHANNEL, EventBroker
+from app.services.reference_cache import MAX_NOTIFY_PAYLOAD, WORKER_ID
+
+
+def test_events_are_packed_into_payloads_below_the_notify_limit():
+    events = [("", "x" * 3000), ("7", "y" * 3000), ("", "z" * 3000)]
+
+    payloads = EventBroker._payloads(events)
+
+    assert len(payloads) == 2
+    assert all(len(payload) <= MAX_NOTIFY_PAYLOAD for payload in payloads)
+    lines = [line for payload in payloads for line in payload.split("\n")[1:]]
+    assert lines == [f"{target}|{message}" for target, message in events]
+
+
+def test_published_events_reach_other_workers_in_one_notify(database):
+    connection = engine.raw_connection()
+    broker = EventBroker()
+    try:
+        listener = connection.driver_connection
+        listener.autocommit = True
+        listener.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+        # Queue both events before the sender runs so they share a payload
+        broker._sender = object()
+        broker.publish("stock", {"item_id": 1})
+        broker.publish("bill", {"bill_id": 2}, user_id=5)
+        broker.start_listener()
+
+        deadline = time.monotonic() + 10
+        while not listener.notifies and time.monotonic() < deadline:
+            if select.select([listener], [], [], 0.5)[0]:
+                listener.poll()
+    finally:
+        broker.stop_listener()
+        connection.invalidate()
+
+    assert [notification.payload for notification in listener.notifies] == [
+        f'{WORKER_ID}\n|{{"type":"stock","item_id":1}}\n5|{{"type":"bill","bill_id":2}}'
+    ]
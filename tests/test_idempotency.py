@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.models.bill import Bill
+from app.models.idempotency_key import IdempotencyKey
+from app.schemas.bill import BillCreate
+from app.services.idempotency import IdempotencyStore
+
+
+def sell_payload(item, quantity=1):
+    return {"bill_type": "sell", "items": [{"model_number": item.model_number, "quantity": quantity}]}
+
+
+def sell(client, item, key, quantity=1):
+    return client.post("/bills/", json=sell_payload(item, quantity), headers={"Idempotency-Key": key})
+
+
+def bill_count(db):
+    return db.execute(select(func.count()).select_from(Bill)).scalar()
+
+
+def test_a_repeated_key_replays_the_first_response(db, user, make_item, client_for):
+    item = make_item(quantity=5)
+    client = client_for(user)
+
+    first = sell(client, item, "till-1-0001")
+    retry = sell(client, item, "till-1-0001")
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert bill_count(db) == 1
+
+
+def test_a_reused_key_with_another_payload_is_rejected(db, user, make_item, client_for):
+    item = make_item(quantity=5)
+    client = client_for(user)
+
+    assert sell(client, item, "till-1-0002").status_code == 201
+    assert sell(client, item, "till-1-0002", quantity=2).status_code == 422
+    assert bill_count(db) == 1
+
+
+def test_a_key_still_in_flight_answers_409(db, user, make_item, client_for):
+    item = make_item(quantity=5)
+    # The key row of a first request that has not completed yet (no stored response)
+    db.add(IdempotencyKey(
+        user_id=user.id,
+        endpoint="POST /bills",
+        key="till-1-0003",
+        request_hash=IdempotencyStore.request_hash(BillCreate(**sell_payload(item))),
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    ))
+    db.commit()
+
+    response = sell(client_for(user), item, "till-1-0003")
+
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert bill_count(db) == 0
@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import Date, case, cast, func, select
+
+from app.database import SessionLocal
+from app.models.inventory import InventoryTransaction
+from app.models.item_movement_daily import ItemMovementDaily
+from app.models.user import User
+from app.schemas.bill import BillCreateItem
+from app.services.billing_service import BillingService
+
+
+def create_bill(user_id, bill_type, lines):
+    db = SessionLocal()
+    try:
+        BillingService.create_bill(
+            db=db,
+            user=db.get(User, user_id),
+            bill_type=bill_type,
+            items=[BillCreateItem(model_number=model_number, quantity=quantity) for model_number, quantity in lines],
+        )
+    finally:
+        db.close()
+
+
+def transaction_sums(db):
+    """item_movement_daily computed straight from inventory_transactions"""
+    is_buy = InventoryTransaction.transaction_type == "buy"
+    line_value = InventoryTransaction.price * InventoryTransaction.quantity
+    rows = db.execute(
+        select(
+            InventoryTransaction.item_id,
+            cast(InventoryTransaction.created_at, Date),
+            func.sum(case((is_buy, InventoryTransaction.quantity), else_=0)),
+            func.sum(case((is_buy, 0), else_=InventoryTransaction.quantity)),
+            func.sum(case((is_buy, line_value), else_=0)),
+            func.sum(case((is_buy, 0), else_=line_value)),
+            func.count(),
+        ).group_by(InventoryTransaction.item_id, cast(InventoryTransaction.created_at, Date))
+    ).all()
+    return {tuple(row[:2]): tuple(row[2:]) for row in rows}
+
+
+def rollup(db):
+    rows = db.execute(select(ItemMovementDaily)).scalars().all()
+    return {
+        (row.item_id, row.movement_date): (
+            row.quantity_in, row.quantity_out, row.value_in, row.value_out, row.transactions
+        )
+        for row in rows
+    }
+
+
+def test_daily_rollup_equals_the_sum_of_transactions(db, user, make_item):
+    first, second, third = make_item(quantity=100), make_item(quantity=100), make_item(quantity=100)
+    bills = [
+        ("sell", [(first.model_number, 2), (second.model_number, 1)]),
+        ("sell", [(second.model_number, 3), (first.model_number, 1)]),
+        ("buy", [(first.model_number, 10)]),
+        ("sell", [(third.model_number, 4), (third.model_number, 1)]),
+        ("buy", [(second.model_number, 5), (third.model_number, 2)]),
+    ] * 8
+
+    # Concurrent multi-item bills in both item orders also exercise the lock ordering
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda bill: create_bill(user.id, *bill), bills))
+
+    expected = transaction_sums(db)
+    assert len(expected) == 3
+    assert rollup(db) == expected
@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from app.database import SessionLocal
+from app.models.low_stock_alert import LowStockAlert
+from app.models.low_stock_alert_archive import LowStockAlertDailyCount
+from app.services.alert_service import AlertService
+
+
+def open_alerts(db, item_id, user_id):
+    return db.execute(
+        select(LowStockAlert).where(
+            LowStockAlert.item_id == item_id,
+            LowStockAlert.user_id == user_id,
+            LowStockAlert.is_resolved == False,
+        )
+    ).scalars().all()
+
+
+def test_upsert_refreshes_the_open_alert(db, user, make_item):
+    item = make_item(quantity=3)
+
+    first = AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=3)
+    second = AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=1)
+    db.commit()
+
+    assert second.id == first.id
+    alerts = open_alerts(db, item.id, user.id)
+    assert [alert.quantity_at_alert for alert in alerts] == [1]
+
+
+def test_concurrent_upserts_leave_one_open_alert(db, user, make_item):
+    item = make_item(quantity=3)
+
+    def upsert(quantity):
+        session = SessionLocal()
+        try:
+            AlertService.upsert_low_stock_alert(
+                db=session, item_id=item.id, user_id=user.id, current_quantity=quantity
+            )
+            session.commit()
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(upsert, range(32)))
+
+    assert len(open_alerts(db, item.id, user.id)) == 1
+
+
+def test_a_resolved_alert_does_not_block_a_new_one(db, user, make_item):
+    item = make_item(quantity=3)
+    AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=3)
+    assert AlertService.resolve_alerts(db=db, item_ids=[item.id], user_id=user.id) == 1
+    AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=2)
+    db.commit()
+
+    total = db.execute(select(func.count()).select_from(LowStockAlert)).scalar()
+    assert total == 2
+    assert [alert.quantity_at_alert for alert in open_alerts(db, item.id, user.id)] == [2]
+
+
+def test_sync_opens_low_items_and_resolves_restocked_ones(db, user, make_item):
+    low, restocked = make_item(quantity=2), make_item(quantity=2)
+    AlertService.upsert_low_stock_alert(db=db, item_id=restocked.id, user_id=user.id, current_quantity=2)
+
+    alerts = AlertService.sync_stock_alerts(db, user.id, 5, {low.id: 2, restocked.id: 40})
+    db.commit()
+
+    assert [alert.item_id for alert in alerts] == [low.id]
+    assert len(open_alerts(db, low.id, user.id)) == 1
+    assert open_alerts(db, restocked.id, user.id) == []
+
+
+def test_archive_moves_old_resolved_alerts_into_daily_counts(db, user, make_item):
+    item = make_item(quantity=3)
+    old = datetime.utcnow() - timedelta(days=120)
+    for quantity in (4, 2, 3):
+        AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=quantity)
+        AlertService.resolve_alerts(db=db, item_ids=[item.id], user_id=user.id)
+    # One recent resolved alert and one open alert stay where they are
+    AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=1)
+    AlertService.resolve_alerts(db=db, item_ids=[item.id], user_id=user.id)
+    AlertService.upsert_low_stock_alert(db=db, item_id=item.id, user_id=user.id, current_quantity=1)
+    oldest_ids = db.execute(select(LowStockAlert.id).order_by(LowStockAlert.id).limit(3)).scalars().all()
+    db.execute(update(LowStockAlert).where(LowStockAlert.id.in_(oldest_ids)).values(created_at=old))
+    db.commit()
+
+    cutoff = datetime.utcnow() - timedelta(days=90)
+    assert AlertService.archive_resolved_alerts(db, cutoff, batch_size=2) == 2
+    assert AlertService.archive_resolved_alerts(db, cutoff, batch_size=2) == 1
+    assert AlertService.archive_resolved_alerts(db, cutoff, batch_size=2) == 0
+    db.commit()
+
+    counts = db.execute(select(LowStockAlertDailyCount)).scalars().all()
+    assert [(row.alert_date, row.alert_count, row.min_quantity) for row in counts] == [(old.date(), 3, 2)]
+    assert db.execute(select(func.count()).select_from(LowStockAlert)).scalar() == 2
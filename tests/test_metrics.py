@@ -0,0 +1,22 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.routers import metrics
+
+
+def test_metrics_are_not_mounted_by_default():
+    assert not settings.metrics_enabled
+    assert TestClient(app).get("/metrics").status_code == 404
+
+
+def test_metrics_token_is_required_when_set(monkeypatch):
+    monkeypatch.setattr(settings, "metrics_token", "s3cret")
+    metrics_app = FastAPI()
+    metrics_app.include_router(metrics.router)
+    client = TestClient(metrics_app)
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer s3cret"}).status_code == 200
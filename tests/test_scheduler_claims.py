@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.models.scheduler_job_claim import SchedulerJobClaim
+from app.services import scheduler
+
+JOB, RUN = "daily_low_stock_check", "2026-10-20"
+
+
+def age_claim(db, minutes):
+    db.execute(update(SchedulerJobClaim).values(claimed_at=func.now() - timedelta(minutes=minutes)))
+    db.commit()
+
+
+def test_a_claim_is_taken_over_only_after_its_lease_expires(db):
+    assert scheduler.claim_partition(db, JOB, RUN, 0)
+    assert not scheduler.claim_partition(db, JOB, RUN, 0)
+
+    age_claim(db, 61)
+    assert scheduler.claim_partition(db, JOB, RUN, 0)
+
+
+def test_a_completed_claim_is_never_retried(db):
+    assert scheduler.claim_partition(db, JOB, RUN, 0)
+    scheduler.complete_partition(db, JOB, RUN, 0)
+
+    age_claim(db, 24 * 60)
+    assert not scheduler.claim_partition(db, JOB, RUN, 0)
+
+
+def test_a_released_claim_is_retried_by_the_next_run(db):
+    assert scheduler.claim_partition(db, JOB, RUN, 0)
+    scheduler.release_partition(db, JOB, RUN, 0)
+
+    assert scheduler.claim_partition(db, JOB, RUN, 0)
+
+
+def test_old_claims_are_deleted(db):
+    scheduler.claim_partition(db, JOB, "2026-10-01", 0)
+    age_claim(db, 8 * 24 * 60)
+    scheduler.claim_partition(db, JOB, RUN, 0)
+
+    assert scheduler.delete_old_claims(db, datetime.utcnow() - timedelta(days=7)) == 1
+    db.commit()
+    assert db.execute(select(SchedulerJobClaim.run_key)).scalars().all() == [RUN]
+
+
+def test_scheduled_runs_that_skip_record_no_history(db):
+    assert not scheduler.is_leader()
+    scheduler.archive_resolved_alerts()
+
+    assert db.execute(select(func.count()).select_from(ScheduledJobRun)).scalar() == 0
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+import pytest
+from sqlalchemy import func, select, update
+
+from app.database import SessionLocal
+from app.models.item import Item
+from app.models.location import Location
+from app.models.stock_level import StockLevel
+from app.models.user import User
+from app.schemas.bill import BillCreateItem
+from app.services.billing_service import BillingService
+from app.services.stock_service import StockService
+
+
+def levels(db, item_id):
+    db.expire_all()
+    return dict(db.execute(
+        select(StockLevel.location_id, StockLevel.quantity).where(StockLevel.item_id == item_id)
+    ).all())
+
+
+def total(db, item_id):
+    db.expire_all()
+    return db.execute(select(Item.quantity).where(Item.id == item_id)).scalar()
+
+
+def bill(db, user, bill_type, item, quantity, location_id=None):
+    return BillingService.create_bill(
+        db=db,
+        user=user,
+        bill_type=bill_type,
+        items=[BillCreateItem(model_number=item.model_number, quantity=quantity)],
+        location_id=location_id,
+    )
+
+
+@pytest.fixture
+def back_store(db):
+    location = Location(name="Back store")
+    db.add(location)
+    db.commit()
+    return location
+
+
+def test_bills_move_stock_at_their_location_and_refresh_the_total(db, user, make_item, back_store):
+    item = make_item(quantity=10)
+    default_id = StockService.resolve_location(db, None).id
+
+    bill(db, user, "buy", item, 6, location_id=back_store.id)
+    bill(db, user, "sell", item, 4)
+
+    assert levels(db, item.id) == {default_id: 6, back_store.id: 6}
+    assert total(db, item.id) == 12
+
+
+def test_overselling_a_location_is_rejected_even_with_stock_elsewhere(db, user, make_item, back_store):
+    item = make_item(quantity=2)
+    bill(db, user, "buy", item, 5, location_id=back_store.id)
+
+    with pytest.raises(HTTPException) as raised:
+        bill(db, user, "sell", item, 3)
+    db.rollback()
+
+    assert raised.value.status_code == 400
+    assert total(db, item.id) == 7
+
+
+def test_set_item_quantity_adjusts_only_the_default_location(db, user, make_item, back_store):
+    item = make_item(quantity=2)
+    bill(db, user, "buy", item, 5, location_id=back_store.id)
+
+    default_id, quantity = StockService.set_item_quantity(db, item.id, 9)
+    StockService.refresh_item_totals(db, [item.id])
+    db.commit()
+
+    assert quantity == 4
+    assert levels(db, item.id) == {default_id: 4, back_store.id: 5}
+    assert total(db, item.id) == 9
+    with pytest.raises(HTTPException):
+        StockService.set_item_quantity(db, item.id, 4)
+
+
+def test_reconcile_corrects_drifted_totals(db, make_item):
+    drifted, correct = make_item(quantity=5), make_item(quantity=3)
+    db.execute(update(Item).where(Item.id == drifted.id).values(quantity=50))
+    db.commit()
+
+    assert StockService.reconcile_item_totals(db) == 1
+    db.commit()
+    assert (total(db, drifted.id), total(db, correct.id)) == (5, 3)
+
+
+def test_concurrent_sales_keep_the_total_equal_to_the_stock_levels(db, user, make_item):
+    item = make_item(quantity=40)
+
+    def sell(_):
+        session = SessionLocal()
+        try:
+            bill(session, session.get(User, user.id), "sell", item, 1)
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(sell, range(40)))
+
+    stocked = db.execute(select(func.sum(StockLevel.quantity)).where(StockLevel.item_id == item.id)).scalar()
+    assert stocked == total(db, item.id) == 0
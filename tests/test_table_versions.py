@@ -0,0 +1,36 @@
+from sqlalchemy import select
+
+from app.models.location import Location
+from app.models.table_version import TableVersion
+
+
+def version(db, table_name):
+    db.expire_all()
+    return db.execute(
+        select(TableVersion.version).where(TableVersion.table_name == table_name)
+    ).scalar() or 0
+
+
+def test_commit_bumps_written_tables_and_rollback_does_not(db, make_item):
+    before = version(db, "items")
+    make_item()
+    assert version(db, "items") == before + 1
+
+    db.add(Location(name="Back store"))
+    db.flush()
+    db.rollback()
+    assert version(db, "locations") == 0
+
+
+def test_location_stock_etag_depends_on_the_users_threshold(db, make_user, make_item, client_for):
+    make_item(quantity=4)
+    location_id = db.execute(select(Location.id).where(Location.is_default == True)).scalar()
+    path = f"/locations/{location_id}/stock"
+
+    alerted = client_for(make_user(alert_threshold=5))
+    first = alerted.get(path)
+    assert first.status_code == 200
+    assert alerted.get(path, headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    relaxed = client_for(make_user(alert_threshold=2))
+    assert relaxed.get(path, headers={"If-None-Match": first.headers["ETag"]}).status_code == 200